@@ -19,13 +19,18 @@ from contextlib import asynccontextmanager
 # Import your simulation modules
 from src.data_pipeline.marsquake_generator import MarsquakeGenerator
 from src.data_pipeline.terrain_generator import TerrainGenerator
+from src.data_pipeline.catalog_index import CatalogIndex
 from src.physics.wave_propagation import WavePropagation
 from src.physics.mars_environment import MarsEnvironment
 from src.structures.habitat_model import HabitatModel
 from src.structures.rover_model import RoverModel
 from src.ai.risk_predictor import RiskPredictor
+from src.random_streams import make_rng
 import config
 
+# Noise for the synthetic seismic traces (own stream, not global np.random)
+trace_noise_rng = make_rng()
+
 # Global simulation state
 simulation_state = {
     "terrain": None,
@@ -36,6 +41,8 @@ simulation_state = {
     "environment": None,
     "current_event": None,
     "events": [],
+    "event_index": None,
+    "event_summary": None,
     "risk_map": None,
     "simulation_active": False,
     "current_time": 0.0,
@@ -146,6 +153,8 @@ async def initialize_simulation():
     quake_gen = MarsquakeGenerator(seed=42)
     events = quake_gen.generate_sequence(num_events=20, days_span=30)
     simulation_state["events"] = events
+    simulation_state["event_index"] = CatalogIndex.from_catalog(events)
+    simulation_state["event_summary"] = quake_gen.summary
     
     # Initialize logs
     simulation_state["logs"] = [
@@ -183,12 +192,20 @@ async def root():
     }
 
 @app.get("/api/events", response_model=List[EventData])
-async def get_events():
-    """Get all marsquake events"""
+async def get_events(start: Optional[str] = None, end: Optional[str] = None,
+                     lat_min: float = -90, lat_max: float = 90,
+                     lon_min: float = -180, lon_max: float = 180,
+                     min_magnitude: Optional[float] = None,
+                     max_magnitude: Optional[float] = None):
+    """Get marsquake events, optionally filtered by time window, region and magnitude"""
+    rows = simulation_state["event_index"].query(
+        start, end, lat_min, lat_max, lon_min, lon_max, min_magnitude, max_magnitude
+    )
     events = []
-    for event in simulation_state["events"]:
+    for row in rows:
+        event = simulation_state["events"][row]
         events.append({
-            "id": f"M{len(events)+1:03d}",
+            "id": f"M{row+1:03d}",
             "timestamp": event["timestamp"].isoformat(),
             "magnitude": event["magnitude"],
             "latitude": event["latitude"],
@@ -200,6 +217,20 @@ async def get_events():
         })
     return events
 
+@app.get("/api/events/magnitude-counts")
+async def get_magnitude_counts(start: Optional[str] = None, end: Optional[str] = None):
+    """Get event counts per magnitude bucket within a time window"""
+    counts = simulation_state["event_index"].magnitude_counts(start, end)
+    return {
+        "bucket_width": simulation_state["event_index"].magnitude_step,
+        "counts": [{"magnitude": edge, "count": count} for edge, count in counts.items()]
+    }
+
+@app.get("/api/events/summary")
+async def get_event_summary():
+    """Get running catalog statistics (type counts, magnitude and depth)"""
+    return simulation_state["event_summary"].to_dict()
+
 @app.get("/api/structures", response_model=List[StructureStatus])
 async def get_structures():
     """Get current structure status"""
@@ -416,9 +447,9 @@ async def get_seismic_data():
                 if t > 5:
                     amplitude += np.sin((t - 5) * 4 + i * 0.3) * np.exp(-(t - 5) * 0.2) * 8
                 # Add noise
-                amplitude += (np.random.random() - 0.5) * 0.5
+                amplitude += (trace_noise_rng.random() - 0.5) * 0.5
             else:
-                amplitude = (np.random.random() - 0.5) * 0.5
+                amplitude = (trace_noise_rng.random() - 0.5) * 0.5
             
             data_points.append({
                 "time": float(t),
@@ -468,7 +499,8 @@ async def run_simulation():
             
             if rover:
                 amp = simulation_state["wave_sim"].get_amplitude_at(*rover.location)
-                rover.evaluate_safety(abs(amp), terrain_slope=5)
+                slope = simulation_state["properties"]["slope_deg"][rover.location]
+                rover.evaluate_safety(abs(amp), terrain_slope=slope)
             
             # Add periodic log entries
             if int(simulation_state["current_time"]) % 5 == 0:
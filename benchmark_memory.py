@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Memory Benchmark
+Compares the memory held by event and structure containers: per-event
+dictionaries against slotted records and structured arrays, and
+dictionary-backed habitats against slotted standalone habitats and
+fleet-backed views
+"""
+import gc
+import tracemalloc
+import config
+from src.data_pipeline.event_records import MarsquakeEvent, event_records
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+from src.structures.habitat_model import HabitatModel
+from src.structures.structure_fleet import StructureFleet
+
+NUM_EVENTS = 200000
+NUM_STRUCTURES = 20000
+
+
+class DictHabitat:
+    """Attribute layout of the original HabitatModel (per-instance __dict__)"""
+
+    def __init__(self, location):
+        self.location = location
+        self.mass = config.HABITAT_MASS
+        self.height = config.HABITAT_HEIGHT
+        self.width = config.HABITAT_WIDTH
+        self.strength = config.HABITAT_MATERIAL_STRENGTH
+        self.natural_freq = config.HABITAT_NATURAL_FREQUENCY
+        self.damage_level = 0.0
+        self.max_displacement = 0.0
+        self.stress_history = []
+
+
+def measure(build):
+    """
+    Bytes still allocated after build() returns, with its result alive
+
+    Returns:
+        (result, bytes)
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def report(title, count, rows):
+    """Print bytes per item and the reduction against the first row"""
+    print("\n{0} ({1:,})".format(title, count))
+    baseline = rows[0][1]
+    for label, size in rows:
+        print("  {0:<32} {1:>8.1f} MB {2:>8.1f} B/item {3:>6.1f}x".format(
+            label, size / 2**20, size / count, baseline / size))
+
+
+def main():
+    print("Memory benchmark")
+
+    catalog = MarsquakeGenerator(seed=42).generate_catalog(NUM_EVENTS, days_span=3650)
+    _, dicts = measure(lambda: catalog.to_dict('records'))
+    _, records = measure(lambda: MarsquakeEvent.from_catalog(catalog))
+    _, packed = measure(lambda: event_records(catalog))
+    report("Events", NUM_EVENTS, [
+        ("dict per event", dicts),
+        ("MarsquakeEvent (slotted)", records),
+        ("EVENT_DTYPE structured array", packed)
+    ])
+
+    locations = [(i // 100, i % 100) for i in range(NUM_STRUCTURES)]
+    _, legacy = measure(lambda: [DictHabitat(location) for location in locations])
+    _, standalone = measure(lambda: [HabitatModel(location) for location in locations])
+
+    def fleet_views():
+        fleet = StructureFleet(locations)
+        return fleet, [fleet.view(i) for i in range(len(fleet))]
+
+    _, views = measure(fleet_views)
+    _, arrays = measure(lambda: StructureFleet(locations))
+    report("Structures", NUM_STRUCTURES, [
+        ("dict-backed habitat", legacy),
+        ("HabitatModel (standalone)", standalone),
+        ("HabitatModel views of one fleet", views),
+        ("StructureFleet arrays only", arrays)
+    ])
+
+
+if __name__ == "__main__":
+    main()
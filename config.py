@@ -17,12 +17,41 @@ MARSQUAKE_MAGNITUDES = {
     'major': (4.0, 5.0)
 }
 
+# Truncated Gutenberg-Richter law over the full MARSQUAKE_MAGNITUDES range.
+# b = 0.5 gives roughly 70% minor, 22% moderate and 7% major events.
+MARSQUAKE_B_VALUE = 0.5
+
 MARSQUAKE_FREQUENCY = {
     'daily_probability': 0.15,  # 15% chance per day
     'avg_per_month': 20,
     'max_magnitude_observed': 5.0
 }
 
+# ETAS aftershock model
+ETAS_BACKGROUND_RATE = MARSQUAKE_FREQUENCY['avg_per_month'] / 30  # Background events per day
+ETAS_MIN_MAGNITUDE = 2.0  # Completeness magnitude (reference for productivity)
+ETAS_MAX_MAGNITUDE = 5.5  # Truncation of the magnitude distribution
+ETAS_B_VALUE = 1.0  # Gutenberg-Richter b-value
+ETAS_PRODUCTIVITY = 0.15  # K: expected offspring of a minimum-magnitude event
+ETAS_ALPHA = 0.8  # Productivity scaling with magnitude
+ETAS_OMORI_C = 0.01  # days
+ETAS_OMORI_P = 1.1
+ETAS_SPATIAL_SCALE = 5.0  # km, offspring distance scale for a minimum-magnitude parent
+ETAS_SPATIAL_Q = 1.5  # Power-law decay of the spatial kernel
+ETAS_DEPTH_SPREAD = 5.0  # km, std of offspring depth around the parent
+
+CATALOG_CHUNK_SIZE = 1000000  # Events per generated/written chunk
+CATALOG_WRITER_QUEUE = 4  # Chunks buffered between generator and writer thread
+
+# Catalog import
+CATALOG_CACHE_DIR = 'data/cache/catalogs'  # Parsed catalogs, keyed by file hash
+CATALOG_IMPORT_CHUNK_ROWS = 500000  # Rows parsed per chunk
+
+# Catalog index
+CATALOG_INDEX_LAT_BINS = 36  # 5 degree latitude cells
+CATALOG_INDEX_LON_BINS = 72  # 5 degree longitude cells
+CATALOG_INDEX_MAGNITUDE_STEP = 0.5  # Width of magnitude count buckets
+
 # Wave velocities (m/s) - estimated from seismic studies
 P_WAVE_VELOCITY = 3000  # Primary waves
 S_WAVE_VELOCITY = 1500  # Secondary waves
@@ -32,12 +61,44 @@ TERRAIN_GRID_SIZE = 100  # 100x100 grid
 TERRAIN_RESOLUTION = 10  # meters per grid cell
 TERRAIN_NOISE_SCALE = 0.1  # Perlin noise scale
 TERRAIN_OCTAVES = 6  # Detail level
+TERRAIN_BAND_ROWS = 32  # Rows per band for (parallel) height map generation
+TERRAIN_ROUGHNESS_WINDOW = 5  # Moving window (cells) for roughness layer
+
+# Georeferenced mode: place the grid on Mars and use real epicentral distances
+GEOREFERENCED = False
+TERRAIN_ORIGIN = (4.5, 135.6)  # (lat, lon) of cell (0, 0), near the InSight lander
+
+# Impact craters
+CRATER_MIN_DIAMETER = 20  # meters
+CRATER_MAX_DIAMETER = 2000  # meters
+CRATER_SFD_SLOPE = 2.0  # Cumulative size-frequency slope, N(>D) ~ D^-slope
+CRATER_DEPTH_RATIO = 0.2  # Depth / diameter
+CRATER_RIM_RATIO = 0.04  # Rim height / diameter
+CRATER_EJECTA_EXTENT = 2.0  # Ejecta blanket reach in crater radii
+CRATER_HASH_BUCKET = 64  # Spatial hash bucket size (cells)
+CRATER_STAMP_BATCH_CELLS = 2000000  # Footprint cells evaluated per batch
+CRATER_BATCH_MAX_HALF_WIDTH = 16  # Larger footprints are stamped one by one
+
+# External DEM streaming
+DEM_WINDOW_SIZE = 512  # Tile size (cells) for window-by-window processing
+DEM_SCAN_ROWS = 1024  # Rows per band when scanning a DEM for statistics
 
 # Soil properties
 SOIL_DENSITY = 1500  # kg/m^3 (Martian regolith)
 SOIL_RIGIDITY = 1e8  # Pa (Pascals)
 SOIL_DAMPING_COEFFICIENT = 0.05  # Energy absorption
 
+# Layered regolith: (thickness m, rigidity factor, density factor) per layer,
+# factors relative to the surface soil properties of each cell
+REGOLITH_LAYERED = True
+REGOLITH_LAYERS = [
+    (6.0, 0.3, 0.85),   # Loose surface regolith (thicker in lowlands)
+    (10.0, 0.8, 1.0),   # Compacted regolith
+    (20.0, 2.0, 1.1),   # Fractured megaregolith
+]
+REGOLITH_HALFSPACE = (5.0, 1.25)  # Bedrock rigidity / density factors
+REGOLITH_AVERAGING_DEPTH = 30  # meters (Vs30-style effective velocity)
+
 # ============= STRUCTURE PARAMETERS =============
 # Habitat specifications
 HABITAT_MASS = 50000  # kg
@@ -45,6 +106,19 @@ HABITAT_HEIGHT = 10  # meters
 HABITAT_WIDTH = 20  # meters
 HABITAT_MATERIAL_STRENGTH = 5e8  # Pa
 HABITAT_NATURAL_FREQUENCY = 2.0  # Hz
+HABITAT_DAMPING_RATIO = 0.03  # Typical for Mars habitat: 2-5%
+FRAGILITY_STRENGTH_COV = 0.20  # Lognormal dispersion of material strength
+FRAGILITY_MASS_COV = 0.10  # Lognormal dispersion of mass
+FRAGILITY_FREQUENCY_COV = 0.15  # Lognormal dispersion of natural frequency
+FRAGILITY_NUM_INTENSITIES = 40  # Ground-motion levels per fragility curve
+FRAGILITY_CHUNK_SAMPLES = 100000  # Realizations per worker task
+DAMAGE_BLOCK_MB = 64  # Memory for one (events x cells) ground-motion block in lifetime damage runs
+DAMAGE_MOTION_CACHE_MB = 512  # Memory budget for ground-motion blocks reused between runs
+RESPONSE_SPECTRUM_PERIODS = (0.02, 10.0, 200)  # (min s, max s, count), log-spaced
+RESPONSE_SPECTRUM_DAMPING = 0.05  # Standard 5% damped design spectra
+RESPONSE_SPECTRUM_STEPS_PER_PERIOD = 10  # Minimum integration steps per shortest period
+RESPONSE_SPECTRUM_CACHE_SIZE = 64  # Spectra kept in memory
+STRESS_HISTORY_CAPACITY = 4096  # Recent stress samples kept in memory per habitat
 
 # Rover specifications
 ROVER_MASS = 900  # kg (Perseverance-like)
@@ -56,6 +130,16 @@ TIME_STEP = 0.01  # seconds
 SIMULATION_DURATION = 60  # seconds
 GRID_SPACING = 10  # meters
 
+# ============= HAZARD PARAMETERS =============
+HAZARD_ANNUAL_RATE = MARSQUAKE_FREQUENCY['avg_per_month'] * 12  # Events per year in the source zone
+HAZARD_THRESHOLD_STEP = 0.1  # Threshold spacing in log10 amplitude
+HAZARD_MAGNITUDE_BIN = 0.1  # Magnitude bin width, a divisor of the threshold step (0.01 = catalog rounding, exact counts)
+HAZARD_MIN_AMPLITUDE = 0.01  # mm, lowest ground-motion threshold
+HAZARD_NUM_THRESHOLDS = 40  # Log-spaced thresholds per hazard curve
+HAZARD_CHUNK_YEARS = 5000  # Simulated years per worker task
+HAZARD_EXPOSURE_YEARS = 50  # Design life for exceedance probabilities
+HAZARD_MAP_PROBABILITY = 0.10  # Exceedance probability for hazard maps
+
 # ============= AI/ML PARAMETERS =============
 RISK_THRESHOLD = 0.7  # 70% probability threshold
 TRAINING_DATA_SIZE = 1000
@@ -7,8 +7,9 @@ import numpy as np
 import config
 from src.data_pipeline.marsquake_generator import MarsquakeGenerator
 from src.data_pipeline.terrain_generator import TerrainGenerator
-from src.physics.wave_propagation import WavePropagation
+from src.physics.wave_propagation import WavePropagation, screen_catalog
 from src.physics.mars_environment import MarsEnvironment
+from src.physics.hazard import HazardEngine
 from src.structures.habitat_model import HabitatModel
 from src.structures.rover_model import RoverModel
 from src.visualization.terminal_viz import TerminalVisualizer
@@ -32,7 +33,8 @@ def main():
     
     # 2. Generate terrain
     print("\n2. Generating Martian Terrain...")
-    terrain_gen = TerrainGenerator(size=100, resolution=10, seed=42)
+    origin = config.TERRAIN_ORIGIN if config.GEOREFERENCED else None
+    terrain_gen = TerrainGenerator(size=100, resolution=10, seed=42, origin=origin)
     terrain = terrain_gen.generate_height_map()
     properties = terrain_gen.calculate_soil_properties()
     terrain_gen.print_terrain_stats()
@@ -55,19 +57,31 @@ def main():
     print("RUNNING MARSQUAKE SIMULATION".center(80))
     print("="*80 + "\n")
     
-    # Select a test event
-    test_event = events[0]  # Use first generated event
+    if config.GEOREFERENCED:
+        # Pick the catalog event that shakes the habitat site hardest
+        latitude, longitude = terrain_gen.cell_coordinates()
+        site = (latitude[habitat.location], longitude[habitat.location])
+        ranked, distances, _ = screen_catalog(quake_gen.catalog, *site)
+        test_event = events[ranked[0]]
+        epicenter = (test_event['latitude'], test_event['longitude'])
+        wave_sim = WavePropagation(terrain, properties, coordinates=(latitude, longitude))
+    else:
+        test_event = events[0]  # Use first generated event
+        epicenter = (50, 50)  # Epicenter at center
+        wave_sim = WavePropagation(terrain, properties)
+    
     print(f"Simulating Marsquake Event:")
     print(f"  Magnitude: {test_event['magnitude']}")
     print(f"  Depth: {test_event['depth_km']:.1f} km")
-    print(f"  Type: {test_event['type'].upper()}\n")
+    print(f"  Type: {test_event['type'].upper()}")
+    if config.GEOREFERENCED:
+        print(f"  Epicentral distance: {distances[0]:.1f} km")
+    print()
     
-    # Initialize wave propagation
-    wave_sim = WavePropagation(terrain, properties)
     viz = TerminalVisualizer()
     
-    # Epicenter at center
-    epicenter = (50, 50)
+    # Local terrain slope under the rover (precomputed layer)
+    rover_slope = properties['slope_deg'][rover.location]
     
     # Simulate over time
     time_steps = np.arange(0, 31, 5)
@@ -77,7 +91,8 @@ def main():
         print("-" * 80)
         
         # Update wave propagation
-        wave_sim.simulate_wave_step(epicenter, test_event['magnitude'], t)
+        wave_sim.simulate_wave_step(epicenter, test_event['magnitude'], t,
+                                    geographic=config.GEOREFERENCED)
         
         # Get wave amplitude at structure locations
         habitat_amp = wave_sim.get_amplitude_at(*habitat.location)
@@ -85,7 +100,7 @@ def main():
         
         # Evaluate structure responses
         habitat_safety = habitat.evaluate_safety(abs(habitat_amp))
-        rover_safety = rover.evaluate_safety(abs(rover_amp), terrain_slope=5)
+        rover_safety = rover.evaluate_safety(abs(rover_amp), terrain_slope=rover_slope)
         
         # Display results
         print(f"Habitat - Amplitude: {abs(habitat_amp):.3f} mm | Status: {habitat_safety['status']}")
@@ -95,6 +110,18 @@ def main():
         if t % 10 == 0:
             viz.visualize_wave_field(wave_sim.wave_field, f"Wave Field at T={t}s")
     
+    # Long-term hazard over many synthetic catalog years
+    print("\n" + "="*80)
+    print("PROBABILISTIC HAZARD".center(80))
+    print("="*80 + "\n")
+    
+    hazard = HazardEngine(terrain, properties).run(years=1000)
+    hazard_map = hazard.hazard_map()
+    print(f"Ground motion with {config.HAZARD_MAP_PROBABILITY:.0%} exceedance "
+          f"probability in {config.HAZARD_EXPOSURE_YEARS} years:")
+    print(f"  Site range: {hazard_map.min():.3f} - {hazard_map.max():.3f} mm")
+    print(f"  Habitat:    {hazard_map[habitat.location]:.3f} mm")
+    
     # Final status report
     print("\n" + "="*80)
     print("FINAL STATUS REPORT".center(80))
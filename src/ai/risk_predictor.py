@@ -10,10 +10,19 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import pickle
 import config
+from src.data_pipeline.terrain_generator import compute_derived_layers
+from src.random_streams import make_rng
 
 class RiskPredictor:
-    def __init__(self):
-        """Initialize risk predictor"""
+    def __init__(self, seed=42, rng=None):
+        """
+        Initialize risk predictor
+        
+        Args:
+            seed: Random seed for training-point sampling and suggestions
+            rng: Optional numpy Generator to draw from (overrides seed)
+        """
+        self.rng = make_rng(seed if rng is None else rng)
         self.model = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
@@ -36,45 +45,18 @@ class RiskPredictor:
         """
         print("Generating training data for AI model...")
         
-        features = []
-        labels = []
-        
-        size = terrain.shape[0]
-        
-        for _ in range(num_samples):
-            # Random location
-            x = np.random.randint(1, size - 1)
-            y = np.random.randint(1, size - 1)
-            
-            # Extract features
-            elevation = terrain[x, y]
-            rigidity = properties['rigidity'][x, y]
-            density = properties['density'][x, y]
-            
-            # Calculate slope (gradient)
-            slope_x = abs(terrain[x+1, y] - terrain[x-1, y]) / 2
-            slope_y = abs(terrain[x, y+1] - terrain[x, y-1]) / 2
-            slope = np.sqrt(slope_x**2 + slope_y**2)
-            
-            # Local terrain variance (roughness)
-            local_window = terrain[max(0, x-2):min(size, x+3), 
-                                  max(0, y-2):min(size, y+3)]
-            roughness = np.std(local_window)
-            
-            # Amplification factor (softer soil amplifies waves more)
-            amplification = config.SOIL_RIGIDITY / rigidity
-            
-            # Feature vector
-            feature = [elevation, slope, roughness, rigidity, density, amplification]
-            features.append(feature)
-            
-            # Risk label (0=safe, 1=moderate, 2=high risk)
-            risk = self._calculate_risk_label(elevation, slope, roughness, 
-                                             rigidity, amplification)
-            labels.append(risk)
-        
-        X = np.array(features)
-        y = np.array(labels)
+        features = self._feature_grid(terrain, properties)
+        rows, cols = terrain.shape
+        
+        # Random interior locations, gathered in one indexing operation
+        xs = self.rng.integers(1, rows - 1, size=num_samples)
+        ys = self.rng.integers(1, cols - 1, size=num_samples)
+        
+        X = features[xs, ys]
+        
+        # Risk label (0=safe, 1=moderate, 2=high risk)
+        y = self._calculate_risk_label(X[:, 0], X[:, 1], X[:, 2],
+                                       X[:, 3], X[:, 5])
         
         print("Generated {0} training samples".format(num_samples))
         print("Risk distribution:")
@@ -84,38 +66,65 @@ class RiskPredictor:
         
         return X, y
     
+    def _feature_grid(self, terrain, properties, region=None):
+        """
+        Build the per-cell feature stack for the terrain
+        
+        Uses the slope and roughness layers precomputed by TerrainGenerator
+        when present, otherwise computes them once with vectorized filters.
+        
+        Args:
+            terrain: 2D terrain elevation array
+            properties: Dictionary with rigidity and density
+            region: Optional (row_slice, col_slice) to restrict the stack to
+        
+        Returns:
+            Array of shape (rows, cols, 6) with features
+            [elevation, slope, roughness, rigidity, density, amplification]
+        """
+        region = region or (slice(None), slice(None))
+        
+        if 'slope' in properties and 'roughness' in properties:
+            slope = properties['slope'][region]
+            roughness = properties['roughness'][region]
+        else:
+            layers = compute_derived_layers(terrain)
+            slope = layers['slope'][region]
+            roughness = layers['roughness'][region]
+        
+        rigidity = properties['rigidity'][region]
+        density = properties['density'][region]
+        
+        # Amplification factor (softer soil amplifies waves more). Use the
+        # layered regolith's site amplification when it was precomputed.
+        if 'site_amplification' in properties:
+            amplification = properties['site_amplification'][region]
+        else:
+            amplification = config.SOIL_RIGIDITY / rigidity
+        
+        return np.stack([terrain[region], slope, roughness, rigidity, density,
+                         amplification], axis=-1)
+    
     def _calculate_risk_label(self, elevation, slope, roughness, 
                              rigidity, amplification):
-        """Calculate risk label based on multiple factors"""
-        risk_score = 0
+        """Calculate risk label based on multiple factors (scalars or arrays)"""
+        risk_score = np.zeros(np.shape(slope), dtype=int)
         
         # High slope = unstable
-        if slope > 50:
-            risk_score += 2
-        elif slope > 20:
-            risk_score += 1
+        risk_score += np.where(slope > 50, 2, np.where(slope > 20, 1, 0))
         
         # High roughness = unpredictable terrain
-        if roughness > 100:
-            risk_score += 1
+        risk_score += np.asarray(roughness > 100, dtype=int)
         
         # Low rigidity = more wave amplification
-        if rigidity < 0.9e8:
-            risk_score += 1
+        risk_score += np.asarray(rigidity < 0.9e8, dtype=int)
         
         # High amplification = dangerous
-        if amplification > 1.3:
-            risk_score += 2
-        elif amplification > 1.1:
-            risk_score += 1
-        
-        # Convert to risk category
-        if risk_score >= 4:
-            return 2  # High risk
-        elif risk_score >= 2:
-            return 1  # Moderate risk
-        else:
-            return 0  # Safe
+        risk_score += np.where(amplification > 1.3, 2,
+                               np.where(amplification > 1.1, 1, 0))
+        
+        # Convert to risk category: 2=high, 1=moderate, 0=safe
+        return np.where(risk_score >= 4, 2, np.where(risk_score >= 2, 1, 0))
     
     def train(self, X, y):
         """Train the risk prediction model"""
@@ -161,36 +170,14 @@ class RiskPredictor:
         
         print("\nGenerating risk prediction map...")
         
-        size = terrain.shape[0]
         risk_map = np.zeros_like(terrain)
         
-        for x in range(1, size - 1):
-            for y in range(1, size - 1):
-                # Extract features
-                elevation = terrain[x, y]
-                rigidity = properties['rigidity'][x, y]
-                density = properties['density'][x, y]
-                
-                # Calculate slope
-                slope_x = abs(terrain[x+1, y] - terrain[x-1, y]) / 2
-                slope_y = abs(terrain[x, y+1] - terrain[x, y-1]) / 2
-                slope = np.sqrt(slope_x**2 + slope_y**2)
-                
-                # Local roughness
-                local_window = terrain[max(0, x-2):min(size, x+3), 
-                                      max(0, y-2):min(size, y+3)]
-                roughness = np.std(local_window)
-                
-                # Amplification
-                amplification = config.SOIL_RIGIDITY / rigidity
-                
-                # Predict
-                feature = np.array([[elevation, slope, roughness, 
-                                   rigidity, density, amplification]])
-                feature_scaled = self.scaler.transform(feature)
-                risk = self.model.predict(feature_scaled)[0]
-                
-                risk_map[x, y] = risk
+        # Predict all interior cells in a single batch
+        features = self._feature_grid(terrain, properties)[1:-1, 1:-1]
+        flat = features.reshape(-1, features.shape[-1])
+        if len(flat):
+            predictions = self.model.predict(self.scaler.transform(flat))
+            risk_map[1:-1, 1:-1] = predictions.reshape(features.shape[:2])
         
         print("Risk map generated!")
         safe_pct = np.sum(risk_map == 0) / risk_map.size * 100
@@ -204,6 +191,36 @@ class RiskPredictor:
         
         return risk_map
     
+    def update_risk_map(self, risk_map, terrain, properties, regions):
+        """
+        Re-predict the risk map only inside changed regions
+        
+        Args:
+            risk_map: Risk map from predict_risk_map (updated in place)
+            terrain: 2D terrain elevation array
+            properties: Dictionary with rigidity, density and derived layers
+            regions: (row_start, row_stop, col_start, col_stop) boxes, e.g.
+                from TerrainGenerator.pop_dirty_regions()
+        
+        Returns:
+            The updated risk map
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet! Call train() first.")
+        
+        rows, cols = terrain.shape
+        for row_start, row_stop, col_start, col_stop in regions:
+            # Border cells are never predicted, same as predict_risk_map
+            region = (slice(max(row_start, 1), min(row_stop, rows - 1)),
+                      slice(max(col_start, 1), min(col_stop, cols - 1)))
+            features = self._feature_grid(terrain, properties, region)
+            flat = features.reshape(-1, features.shape[-1])
+            if len(flat):
+                predictions = self.model.predict(self.scaler.transform(flat))
+                risk_map[region] = predictions.reshape(features.shape[:2])
+        
+        return risk_map
+    
     def suggest_placement(self, risk_map, num_suggestions=5):
         """
         Suggest safest locations for habitat placement
@@ -225,7 +242,7 @@ class RiskPredictor:
         
         # Randomly sample suggestions
         if len(safe_zones) > num_suggestions:
-            indices = np.random.choice(len(safe_zones), num_suggestions, replace=False)
+            indices = self.rng.choice(len(safe_zones), num_suggestions, replace=False)
             suggestions = safe_zones[indices]
         else:
             suggestions = safe_zones
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Catalog Index
+Time, space and magnitude index over marsquake catalogs for range queries
+without scanning every event
+"""
+import numpy as np
+import pandas as pd
+import config
+
+INDEX_COLUMNS = ('timestamp', 'latitude', 'longitude', 'magnitude')
+
+
+class CatalogIndex:
+    def __init__(self, timestamp, latitude, longitude, magnitude,
+                 lat_bins=None, lon_bins=None, magnitude_step=None):
+        """
+        Build the index from catalog columns
+
+        Events are ranked by time; every other structure stores time ranks,
+        so a time window is one binary search and every spatial cell or
+        magnitude bucket is a time-sorted run that can be cut the same way.
+
+        Args:
+            timestamp: Event times (datetime64 or anything pandas can parse)
+            latitude, longitude: Epicenters in degrees
+            magnitude: Event magnitudes
+            lat_bins, lon_bins: Spatial grid size
+            magnitude_step: Width of magnitude count buckets
+        """
+        self.lat_bins = lat_bins or config.CATALOG_INDEX_LAT_BINS
+        self.lon_bins = lon_bins or config.CATALOG_INDEX_LON_BINS
+        self.magnitude_step = magnitude_step or config.CATALOG_INDEX_MAGNITUDE_STEP
+
+        times = pd.to_datetime(np.asarray(timestamp)).values.astype('datetime64[ns]')
+        self.order = np.argsort(times, kind='stable')  # time rank -> catalog row
+        self.times = times[self.order].view(np.int64)
+        self.latitude = np.asarray(latitude, dtype=np.float64)[self.order]
+        self.longitude = np.asarray(longitude, dtype=np.float64)[self.order]
+        self.magnitude = np.asarray(magnitude, dtype=np.float64)[self.order]
+
+        # Spatial grid: ranks grouped by cell, time-sorted inside each cell
+        cells = self._cell_of(self.latitude, self.longitude)
+        self.cell_ranks, self.cell_starts = self._group(cells, self.lat_bins * self.lon_bins)
+
+        # Magnitude buckets: same layout keyed by bucket
+        self.magnitude_floor = np.floor(self.magnitude.min() / self.magnitude_step) \
+            if len(self.magnitude) else 0.0
+        buckets = self._bucket_of(self.magnitude)
+        num_buckets = int(buckets.max()) + 1 if len(buckets) else 0
+        self.bucket_ranks, self.bucket_starts = self._group(buckets, num_buckets)
+
+    @classmethod
+    def from_catalog(cls, catalog, **kwargs):
+        """
+        Build an index from a catalog DataFrame, list of event records or
+        dictionaries, or CatalogStore (only the indexed columns are loaded)
+
+        Query results are row positions into that catalog.
+        """
+        if isinstance(catalog, list):
+            catalog = pd.DataFrame([dict(event) for event in catalog],
+                                   columns=list(INDEX_COLUMNS))
+        elif hasattr(catalog, 'column'):
+            return cls(*(catalog.column(name) for name in INDEX_COLUMNS), **kwargs)
+        return cls(*(catalog[name].values for name in INDEX_COLUMNS), **kwargs)
+
+    def __len__(self):
+        return len(self.order)
+
+    @staticmethod
+    def _group(keys, num_keys):
+        """Ranks sorted by key (stable, so time order is kept) plus run offsets"""
+        ranks = np.argsort(keys, kind='stable')
+        starts = np.searchsorted(keys[ranks], np.arange(num_keys + 1))
+        return ranks, starts
+
+    def _cell_of(self, lat, lon):
+        lat_bin = np.clip(np.floor((lat + 90) / 180 * self.lat_bins).astype(int), 0, self.lat_bins - 1)
+        lon_bin = np.clip(np.floor((lon + 180) / 360 * self.lon_bins).astype(int), 0, self.lon_bins - 1)
+        return lat_bin * self.lon_bins + lon_bin
+
+    def _bucket_of(self, magnitude):
+        return (np.floor(magnitude / self.magnitude_step) - self.magnitude_floor).astype(int)
+
+    def _rank_range(self, start, end):
+        """Half-open range of time ranks with start <= time < end"""
+        low = 0 if start is None else np.searchsorted(
+            self.times, pd.Timestamp(start).value, side='left')
+        high = len(self.times) if end is None else np.searchsorted(
+            self.times, pd.Timestamp(end).value, side='left')
+        return low, max(low, high)
+
+    def query(self, start=None, end=None, lat_min=-90, lat_max=90,
+              lon_min=-180, lon_max=180, min_magnitude=None, max_magnitude=None):
+        """
+        Find events inside a time window, lat/lon box and magnitude range
+
+        The time window is located by binary search. With a spatial box, only
+        the grid cells overlapping it are visited and each cell's run is cut
+        to the window by binary search, so the cost is O(cells * log n + k).
+
+        Args:
+            start, end: Time window [start, end) (None = unbounded)
+            lat_min, lat_max, lon_min, lon_max: Inclusive epicenter box
+            min_magnitude, max_magnitude: Inclusive magnitude range
+
+        Returns:
+            Array of catalog row positions, in time order
+        """
+        low, high = self._rank_range(start, end)
+
+        if (lat_min, lat_max, lon_min, lon_max) == (-90, 90, -180, 180):
+            ranks = np.arange(low, high)
+        else:
+            lat_lo, lon_lo = divmod(int(self._cell_of(lat_min, lon_min)), self.lon_bins)
+            lat_hi, lon_hi = divmod(int(self._cell_of(lat_max, lon_max)), self.lon_bins)
+            runs = []
+            for lat_bin in range(lat_lo, lat_hi + 1):
+                for cell in range(lat_bin * self.lon_bins + lon_lo,
+                                  lat_bin * self.lon_bins + lon_hi + 1):
+                    run = self.cell_ranks[self.cell_starts[cell]:self.cell_starts[cell + 1]]
+                    runs.append(run[np.searchsorted(run, low):np.searchsorted(run, high)])
+            ranks = np.sort(np.concatenate(runs)) if runs else np.array([], dtype=int)
+            keep = ((self.latitude[ranks] >= lat_min) & (self.latitude[ranks] <= lat_max) &
+                    (self.longitude[ranks] >= lon_min) & (self.longitude[ranks] <= lon_max))
+            ranks = ranks[keep]
+
+        if min_magnitude is not None:
+            ranks = ranks[self.magnitude[ranks] >= min_magnitude]
+        if max_magnitude is not None:
+            ranks = ranks[self.magnitude[ranks] <= max_magnitude]
+
+        return self.order[ranks]
+
+    def magnitude_counts(self, start=None, end=None):
+        """
+        Count events per magnitude bucket inside a time window
+
+        Two binary searches per bucket, independent of the window size.
+
+        Returns:
+            Dictionary mapping bucket lower edge to event count
+        """
+        low, high = self._rank_range(start, end)
+        counts = {}
+        for bucket in range(len(self.bucket_starts) - 1):
+            run = self.bucket_ranks[self.bucket_starts[bucket]:self.bucket_starts[bucket + 1]]
+            count = int(np.searchsorted(run, high) - np.searchsorted(run, low))
+            if count:
+                edge = round(float(bucket + self.magnitude_floor) * self.magnitude_step, 6)
+                counts[edge] = count
+        return counts
+
+
+if __name__ == "__main__":
+    import time
+    from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+    print("Testing Catalog Index...\n")
+
+    catalog = MarsquakeGenerator(seed=42).generate_catalog(num_events=1000000, days_span=3650)
+    index = CatalogIndex.from_catalog(catalog)
+
+    window_start = catalog['timestamp'].min() + pd.Timedelta(days=100)
+    window_end = window_start + pd.Timedelta(days=30)
+
+    start = time.time()
+    rows = index.query(window_start, window_end, lat_min=0, lat_max=20,
+                       lon_min=100, lon_max=140, min_magnitude=3.0)
+    print("Window query: {0} events in {1:.2f} ms".format(
+        len(rows), (time.time() - start) * 1000))
+    print("Magnitude counts: {0}".format(index.magnitude_counts(window_start, window_end)))
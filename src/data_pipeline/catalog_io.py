@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Catalog Storage
+Incremental writers and lazy, column-selective readers for marsquake
+catalogs (CSV and binary columnar)
+"""
+import json
+import os
+import queue
+import threading
+import numpy as np
+import pandas as pd
+import config
+from src.data_pipeline.magnitude_model import MAGNITUDE_TYPES
+
+# On-disk dtype of every catalog column in the binary columnar format
+CATALOG_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'magnitude': 'float32',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'depth_km': 'float32',
+    'p_wave_velocity': 'float32',
+    's_wave_velocity': 'float32',
+    'type': 'uint8'
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class CatalogWriter:
+    def __init__(self, path, file_format=None, queue_size=None):
+        """
+        Open a catalog for incremental writing
+
+        Chunks passed to write() are queued and written by a background
+        thread, so the producer keeps generating while I/O happens. The
+        queue is bounded, which keeps memory flat for any catalog size.
+
+        Args:
+            path: .csv file, or directory for the binary columnar format
+            file_format: 'csv' or 'columnar' (default: from the extension)
+            queue_size: Chunks buffered ahead of the writer thread
+        """
+        self.path = str(path)
+        if file_format is None:
+            file_format = 'csv' if self.path.endswith('.csv') else 'columnar'
+        if file_format not in ('csv', 'columnar'):
+            raise ValueError("Unknown catalog format: {0}".format(file_format))
+
+        self.file_format = file_format
+        self.rows_written = 0
+        self.categories = {}
+        self._queue = queue.Queue(maxsize=queue_size or config.CATALOG_WRITER_QUEUE)
+        self._error = None
+
+        if file_format == 'columnar':
+            os.makedirs(self.path, exist_ok=True)
+            self._files = {name: open(os.path.join(self.path, name + '.bin'), 'wb')
+                           for name in CATALOG_SCHEMA}
+        else:
+            self._files = {}
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, chunk):
+        """Queue a DataFrame chunk (blocks while the queue is full)"""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self):
+        """Flush pending chunks, finish the files and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+        for handle in self._files.values():
+            handle.close()
+
+        if self._error is not None:
+            raise self._error
+        if self.file_format == 'columnar':
+            self._write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _run(self):
+        """Writer thread: drain the queue until the sentinel arrives"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                if self.file_format == 'csv':
+                    self._write_csv(chunk)
+                else:
+                    self._write_columnar(chunk)
+                self.rows_written += len(chunk)
+            except Exception as error:  # surfaced to the producer
+                self._error = error
+
+    def _write_csv(self, chunk):
+        """Append a chunk to the CSV file (header on the first chunk)"""
+        first = self.rows_written == 0
+        chunk.to_csv(self.path, mode='w' if first else 'a', header=first,
+                     index=False)
+
+    def _write_columnar(self, chunk):
+        """Append each column of a chunk to its raw binary file"""
+        for name, dtype in CATALOG_SCHEMA.items():
+            values = chunk[name]
+            if name == 'type':
+                values = self._encode_categories(name, values)
+            else:
+                values = np.asarray(values, dtype=dtype)
+            self._files[name].write(values.tobytes())
+
+    def _encode_categories(self, name, values):
+        """Map string labels to stable uint8 codes"""
+        labels = self.categories.setdefault(name, list(MAGNITUDE_TYPES))
+        codes, uniques = pd.factorize(values)
+        for label in uniques:
+            if label not in labels:
+                labels.append(label)
+        lookup = np.array([labels.index(label) for label in uniques], dtype=np.uint8)
+        return lookup[codes]
+
+    def _write_manifest(self):
+        """Record row count, dtypes and category labels"""
+        manifest = {
+            'format': 'marsquake-columnar',
+            'version': 1,
+            'rows': self.rows_written,
+            'columns': {name: {'dtype': dtype, 'file': name + '.bin'}
+                        for name, dtype in CATALOG_SCHEMA.items()},
+            'categories': self.categories
+        }
+        with open(os.path.join(self.path, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+class CatalogStore:
+    def __init__(self, path):
+        """
+        Open a binary columnar catalog for lazy reading
+
+        Nothing is read up front: columns are memory-mapped on first access
+        and only the requested row ranges are paged in.
+
+        Args:
+            path: Catalog directory written by CatalogWriter
+        """
+        self.path = str(path)
+        with open(os.path.join(self.path, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+
+        self.num_rows = self.manifest['rows']
+        self.columns = list(self.manifest['columns'])
+        self._maps = {}
+
+    def __len__(self):
+        return self.num_rows
+
+    def column(self, name, start=0, stop=None):
+        """
+        Memory-mapped view of one column
+
+        Args:
+            name: Column name
+            start, stop: Row range (default: all rows)
+
+        Returns:
+            Read-only numpy memmap slice (raw codes for categorical columns)
+        """
+        if name not in self.manifest['columns']:
+            raise KeyError("Catalog has no column '{0}'".format(name))
+
+        if name not in self._maps:
+            spec = self.manifest['columns'][name]
+            filename = os.path.join(self.path, spec['file'])
+            if self.num_rows == 0:
+                self._maps[name] = np.empty(0, dtype=spec['dtype'])
+            else:
+                self._maps[name] = np.memmap(filename, dtype=spec['dtype'], mode='r',
+                                             shape=(self.num_rows,))
+        return self._maps[name][start:stop]
+
+    def load(self, columns=None, start=0, stop=None):
+        """
+        Load selected columns and rows into a DataFrame
+
+        Args:
+            columns: Column names (default: all)
+            start, stop: Row range (default: all rows)
+
+        Returns:
+            DataFrame in the generator's event layout
+        """
+        columns = columns or self.columns
+        data = {}
+        for name in columns:
+            values = np.asarray(self.column(name, start, stop))
+            if name in self.manifest['categories']:
+                values = pd.Categorical.from_codes(values.astype(np.int16),
+                                                   self.manifest['categories'][name])
+            data[name] = values
+        return pd.DataFrame(data)
+
+
+def save_catalog(catalog, path, chunk_size=None):
+    """
+    Write a catalog DataFrame in the binary columnar format
+
+    Args:
+        catalog: DataFrame with the CATALOG_SCHEMA columns
+        path: Output directory
+        chunk_size: Rows per write (default: config.CATALOG_CHUNK_SIZE)
+
+    Returns:
+        Number of rows written
+    """
+    chunk_size = chunk_size or config.CATALOG_CHUNK_SIZE
+    with CatalogWriter(path, file_format='columnar') as writer:
+        for start in range(0, len(catalog), chunk_size):
+            writer.write(catalog.iloc[start:start + chunk_size])
+    return writer.rows_written
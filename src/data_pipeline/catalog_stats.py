@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Catalog Statistics
+Running summaries of marsquake catalogs that update as events are added,
+so reading a summary never rescans the catalog
+"""
+import numpy as np
+from src.data_pipeline.magnitude_model import MAGNITUDE_TYPES
+
+
+class RunningStats:
+    __slots__ = ('count', 'missing', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        """
+        Count, mean, variance (Welford) and extrema of a growing sample
+
+        NaN values are missing data: they are counted in `missing` and left
+        out of every statistic.
+        """
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """
+        Add a batch of values
+
+        The batch is reduced on its own and merged with Chan's pairwise
+        update, so a single value and a million-value chunk cost one pass
+        over the new data only.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        present = ~np.isnan(values)
+        if not present.all():
+            self.missing += int(values.size - present.sum())
+            values = values[present]
+        if values.size == 0:
+            return
+        batch_mean = values.mean()
+        self._merge(values.size, batch_mean, ((values - batch_mean) ** 2).sum(),
+                    values.min(), values.max())
+
+    def merge(self, other):
+        """Fold another RunningStats into this one"""
+        self.missing += other.missing
+        if other.count:
+            self._merge(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _merge(self, count, mean, m2, low, high):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(low))
+        self.max = max(self.max, float(high))
+
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two values)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self):
+        if not self.count:
+            return {'count': 0, 'missing': self.missing, 'min': None, 'max': None,
+                    'mean': None, 'std': None}
+        return {'count': self.count, 'missing': self.missing, 'min': self.min,
+                'max': self.max, 'mean': float(self.mean), 'std': self.std}
+
+
+class CatalogSummary:
+    def __init__(self):
+        """Per-type counts plus running magnitude and depth statistics"""
+        self.type_counts = np.zeros(len(MAGNITUDE_TYPES), dtype=np.int64)
+        self.magnitude = RunningStats()
+        self.depth = RunningStats()
+
+    @property
+    def count(self):
+        return self.magnitude.count
+
+    def reset(self):
+        self.type_counts[:] = 0
+        self.magnitude.reset()
+        self.depth.reset()
+
+    def add_event(self, event):
+        """Add one event (MarsquakeEvent record or dictionary)"""
+        self.type_counts[MAGNITUDE_TYPES.index(event['type'])] += 1
+        self.magnitude.update([event['magnitude']])
+        self.depth.update([event['depth_km']])
+
+    def add_catalog(self, catalog):
+        """
+        Add a catalog or chunk (DataFrame in the generator's event layout)
+        """
+        types = catalog['type']
+        if hasattr(types, 'cat'):
+            codes = types.cat.codes.values
+        else:
+            codes = np.array([MAGNITUDE_TYPES.index(t) for t in types], dtype=int)
+        self.type_counts += np.bincount(codes, minlength=len(MAGNITUDE_TYPES))
+        self.magnitude.update(catalog['magnitude'].values)
+        self.depth.update(catalog['depth_km'].values)
+
+    def merge(self, other):
+        """Fold another summary into this one (e.g. from a parallel worker)"""
+        self.type_counts += other.type_counts
+        self.magnitude.merge(other.magnitude)
+        self.depth.merge(other.depth)
+
+    def to_dict(self):
+        return {
+            'total_events': self.count,
+            'type_counts': {name: int(n) for name, n in zip(MAGNITUDE_TYPES, self.type_counts)},
+            'magnitude': self.magnitude.to_dict(),
+            'depth_km': self.depth.to_dict()
+        }
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Impact Crater Field Generator
+Samples craters from a power-law size-frequency distribution and stamps
+their profiles into a height map in vectorized batches
+"""
+import numpy as np
+import config
+from src.random_streams import make_rng
+
+
+class CraterGenerator:
+    def __init__(self, size=100, resolution=10, seed=42):
+        """
+        Initialize crater generator
+
+        Args:
+            size: Grid size (size x size) or (rows, cols)
+            resolution: Meters per grid cell
+            seed: Random seed or numpy Generator
+        """
+        self.shape = (size, size) if np.isscalar(size) else tuple(size)
+        self.resolution = resolution
+        self.rng = make_rng(seed)
+        self.craters = None
+        self._hash = None
+
+    def sample_craters(self, num_craters, min_diameter=None, max_diameter=None,
+                       sfd_slope=None):
+        """
+        Sample crater positions and diameters
+
+        Diameters follow a truncated power law, N(>D) ~ D^-slope, drawn in
+        bulk by inverse CDF. Positions are uniform over the grid.
+
+        Args:
+            num_craters: Number of craters
+            min_diameter, max_diameter: Diameter range in meters
+            sfd_slope: Cumulative size-frequency slope
+
+        Returns:
+            Dictionary of arrays: x, y (cells), diameter (m)
+        """
+        d_min = min_diameter or config.CRATER_MIN_DIAMETER
+        d_max = max_diameter or config.CRATER_MAX_DIAMETER
+        slope = sfd_slope or config.CRATER_SFD_SLOPE
+
+        u = self.rng.random(num_craters)
+        low, high = d_min ** -slope, d_max ** -slope
+        diameter = (low - u * (low - high)) ** (-1.0 / slope)
+
+        self.craters = {
+            'x': self.rng.uniform(0, self.shape[0], num_craters),
+            'y': self.rng.uniform(0, self.shape[1], num_craters),
+            'diameter': diameter
+        }
+        self._hash = None
+        return self.craters
+
+    def _bucket_keys(self, x, y):
+        """Spatial hash key of the bucket holding each point"""
+        bucket = config.CRATER_HASH_BUCKET
+        buckets_per_row = -(-self.shape[1] // bucket)
+        bx = np.clip(x // bucket, 0, -(-self.shape[0] // bucket) - 1).astype(np.int64)
+        by = np.clip(y // bucket, 0, buckets_per_row - 1).astype(np.int64)
+        return bx * buckets_per_row + by
+
+    def build_spatial_hash(self):
+        """
+        Bucket craters on a coarse grid (compressed sparse layout)
+
+        Returns:
+            (order, starts): crater indices sorted by bucket, and the offset
+            of each bucket's run in that order
+        """
+        keys = self._bucket_keys(self.craters['x'], self.craters['y'])
+        order = np.argsort(keys, kind='stable')
+        bucket = config.CRATER_HASH_BUCKET
+        num_buckets = (-(-self.shape[0] // bucket)) * (-(-self.shape[1] // bucket))
+        starts = np.searchsorted(keys[order], np.arange(num_buckets + 1))
+        self._hash = (order, starts)
+        return self._hash
+
+    def craters_near(self, x, y, radius):
+        """
+        Find craters whose centers lie within radius cells of (x, y)
+
+        Returns:
+            Array of crater indices
+        """
+        if self.craters is None:
+            raise ValueError("No craters sampled yet. Call sample_craters() first.")
+        if self._hash is None:
+            self.build_spatial_hash()
+        order, starts = self._hash
+
+        bucket = config.CRATER_HASH_BUCKET
+        buckets_per_row = -(-self.shape[1] // bucket)
+        bx0, bx1 = self._bucket_range(x, radius, self.shape[0])
+        by0, by1 = self._bucket_range(y, radius, self.shape[1])
+
+        runs = [order[starts[bx * buckets_per_row + by0]:
+                      starts[bx * buckets_per_row + by1 + 1]]
+                for bx in range(bx0, bx1 + 1)]
+        candidates = np.concatenate(runs) if runs else np.array([], dtype=int)
+
+        dx = self.craters['x'][candidates] - x
+        dy = self.craters['y'][candidates] - y
+        return candidates[dx**2 + dy**2 <= radius**2]
+
+    def _bucket_range(self, center, radius, extent):
+        """Inclusive range of bucket indices overlapping [center - radius, center + radius]"""
+        bucket = config.CRATER_HASH_BUCKET
+        last = -(-extent // bucket) - 1
+        low = int(np.clip((center - radius) // bucket, 0, last))
+        high = int(np.clip((center + radius) // bucket, 0, last))
+        return low, high
+
+    def crater_profile(self, r, diameter):
+        """
+        Relative elevation of a crater at normalized distance r = dist / radius
+
+        Parabolic bowl inside the rim, raised rim, and an ejecta blanket that
+        decays as r^-3 and reaches zero at the ejecta extent.
+        """
+        depth = config.CRATER_DEPTH_RATIO * diameter
+        rim = config.CRATER_RIM_RATIO * diameter
+        extent = config.CRATER_EJECTA_EXTENT
+
+        bowl = -depth + (depth + rim) * r**2
+        with np.errstate(divide='ignore'):
+            ejecta = rim * (1 / (r * r * r) - extent**-3.0) / (1 - extent**-3.0)
+        return np.where(r <= 1, bowl, np.where(r < extent, ejecta, 0.0))
+
+    def stamp(self, height_map):
+        """
+        Add all sampled craters to a height map in place
+
+        Small craters are grouped by footprint size, ordered by spatial hash
+        bucket inside each group, and stamped in batches: every batch gathers
+        the cells of its footprints, evaluates the profiles as one array
+        operation and scatters them into the row band it covers. Large
+        craters are rare and are added through a slice of their footprint.
+
+        Args:
+            height_map: 2D elevation array in meters (modified in place)
+
+        Returns:
+            The height map
+        """
+        if self.craters is None:
+            raise ValueError("No craters sampled yet. Call sample_craters() first.")
+
+        rows, cols = height_map.shape
+        x, y = self.craters['x'], self.craters['y']
+        diameter = self.craters['diameter']
+
+        radius = diameter / 2 / self.resolution  # cells
+
+        # Footprint half-widths. Small craters dominate the count and are
+        # stamped in batches; the few large ones each get a direct slice update.
+        half_width = np.maximum(np.ceil(radius * config.CRATER_EJECTA_EXTENT), 1).astype(int)
+        reach_sq = config.CRATER_EJECTA_EXTENT**2
+
+        for i in np.flatnonzero(half_width > config.CRATER_BATCH_MAX_HALF_WIDTH):
+            self._stamp_single(height_map, x[i], y[i], radius[i], diameter[i], half_width[i])
+
+        small = half_width <= config.CRATER_BATCH_MAX_HALF_WIDTH
+        x, y = x[small], y[small]
+        diameter, radius, half_width = diameter[small], radius[small], half_width[small]
+
+        order = np.lexsort((self._bucket_keys(x, y), half_width))
+        group_bounds = np.flatnonzero(np.diff(half_width[order])) + 1
+        for group in np.split(order, group_bounds):
+            if len(group) == 0:
+                continue
+            di, dj = self._footprint_offsets(half_width[group[0]])
+            batch = max(1, config.CRATER_STAMP_BATCH_CELLS // len(di))
+
+            for start in range(0, len(group), batch):
+                idx = group[start:start + batch]
+                ii = np.floor(x[idx]).astype(int)[:, None] + di
+                jj = np.floor(y[idx]).astype(int)[:, None] + dj
+
+                r_sq = ((ii - x[idx, None])**2 +
+                        (jj - y[idx, None])**2) / radius[idx, None]**2
+                valid = ((r_sq < reach_sq) &
+                         (ii >= 0) & (ii < rows) & (jj >= 0) & (jj < cols))
+                if not valid.any():
+                    continue
+
+                # Evaluate profiles only on the cells each footprint touches
+                ii, jj = ii[valid], jj[valid]
+                hit = np.broadcast_to(idx[:, None], valid.shape)[valid]
+                dh = self.crater_profile(np.sqrt(r_sq[valid]), diameter[hit])
+
+                row_start, row_stop = ii.min(), ii.max() + 1
+                band = np.bincount((ii - row_start) * cols + jj, weights=dh,
+                                   minlength=(row_stop - row_start) * cols)
+                height_map[row_start:row_stop] += band.reshape(-1, cols)
+
+        return height_map
+
+    def _footprint_offsets(self, half_width):
+        """
+        Cell offsets (from the floor of a crater center) that a footprint of
+        the given half-width can reach, i.e. the disk inside the square
+        """
+        di, dj = np.mgrid[-half_width:half_width + 1, -half_width:half_width + 1]
+        # Closest approach of each cell to a center anywhere in [0, 1)^2
+        near_i = np.where(di >= 1, di - 1, -di)
+        near_j = np.where(dj >= 1, dj - 1, -dj)
+        keep = near_i**2 + near_j**2 < half_width**2
+        return di[keep], dj[keep]
+
+    def _stamp_single(self, height_map, x, y, radius, diameter, half_width):
+        """Add one crater through a slice covering its footprint"""
+        rows, cols = height_map.shape
+        row_start = max(int(np.floor(x)) - half_width, 0)
+        row_stop = min(int(np.floor(x)) + half_width + 1, rows)
+        col_start = max(int(np.floor(y)) - half_width, 0)
+        col_stop = min(int(np.floor(y)) + half_width + 1, cols)
+        if row_start >= row_stop or col_start >= col_stop:
+            return
+
+        ii, jj = np.ogrid[row_start:row_stop, col_start:col_stop]
+        r = np.sqrt((ii - x)**2 + (jj - y)**2) / radius
+        height_map[row_start:row_stop, col_start:col_stop] += self.crater_profile(r, diameter)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("Testing Crater Generator...\n")
+
+    size = 1024
+    craters = CraterGenerator(size=size, resolution=10, seed=42)
+    craters.sample_craters(100000)
+
+    start = time.time()
+    height_map = craters.stamp(np.zeros((size, size)))
+    print("Stamped {0} craters on a {1}x{1} grid in {2:.2f} s".format(
+        len(craters.craters['diameter']), size, time.time() - start))
+    print("Relief: {0:.1f} - {1:.1f} m".format(height_map.min(), height_map.max()))
+    print("Craters within 20 cells of center: {0}".format(
+        len(craters.craters_near(size / 2, size / 2, 20))))
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming loader for large external DEM rasters
+Wraps a raw or NumPy elevation file as a memory map and serves windows
+through the TerrainGenerator interface
+"""
+import numpy as np
+import config
+from src.data_pipeline.terrain_generator import DERIVED_LAYER_HALO, TerrainGenerator
+
+
+class DEMTerrain:
+    def __init__(self, path, shape=None, dtype='float32', offset=0,
+                 resolution=config.TERRAIN_RESOLUTION, nodata=None):
+        """
+        Open a DEM file as a read-only memory map
+
+        Args:
+            path: .npy file, or raw binary file (requires shape and dtype)
+            shape: (rows, cols) of a raw raster
+            dtype: Sample type of a raw raster
+            offset: Header bytes to skip in a raw raster
+            resolution: Meters per grid cell
+            nodata: Sentinel value for missing samples (NaN is always missing)
+        """
+        self.path = str(path)
+        self.resolution = resolution
+        self.nodata = nodata
+
+        if self.path.endswith('.npy'):
+            self.data = np.load(self.path, mmap_mode='r')
+        else:
+            if shape is None:
+                raise ValueError("shape is required for raw DEM files")
+            self.data = np.memmap(self.path, dtype=dtype, mode='r',
+                                  offset=offset, shape=tuple(shape))
+
+        if self.data.ndim != 2:
+            raise ValueError("DEM must be a 2D raster, got shape {0}".format(self.data.shape))
+
+        self.shape = self.data.shape
+        self._elevation_range = None
+
+    def _valid_mask(self, block):
+        """Mask of samples that hold real elevations"""
+        mask = np.isfinite(block)
+        if self.nodata is not None:
+            mask &= block != self.nodata
+        return mask
+
+    def elevation_range(self):
+        """
+        Global (min, max) elevation, scanned once in row bands and cached
+
+        Returns:
+            Tuple of (min, max) elevation in meters
+        """
+        if self._elevation_range is None:
+            low, high = np.inf, -np.inf
+            for start in range(0, self.shape[0], config.DEM_SCAN_ROWS):
+                block = np.asarray(self.data[start:start + config.DEM_SCAN_ROWS],
+                                   dtype=np.float64)
+                valid = block[self._valid_mask(block)]
+                if valid.size:
+                    low = min(low, valid.min())
+                    high = max(high, valid.max())
+            if not np.isfinite(low):
+                raise ValueError("DEM contains no valid elevation samples")
+            self._elevation_range = (float(low), float(high))
+        return self._elevation_range
+
+    def read_window(self, row, col, height, width):
+        """
+        Read a window of elevations into memory
+
+        The window is clipped to the raster bounds and missing samples are
+        filled with the global minimum elevation.
+
+        Returns:
+            2D float64 array
+        """
+        row_stop = min(row + height, self.shape[0])
+        col_stop = min(col + width, self.shape[1])
+        row, col = max(row, 0), max(col, 0)
+
+        block = np.array(self.data[row:row_stop, col:col_stop], dtype=np.float64)
+        missing = ~self._valid_mask(block)
+        if missing.any():
+            block[missing] = self.elevation_range()[0]
+        return block
+
+    def window(self, row, col, height, width=None, properties=True):
+        """
+        Load a window as a TerrainGenerator
+
+        Soil properties and derived layers are computed for this window only,
+        normalized against the global elevation range so every window
+        agrees with the full raster.
+
+        Args:
+            row, col: Top-left corner of the window
+            height, width: Window size in cells (width defaults to height)
+            properties: Compute soil properties and derived layers
+
+        Returns:
+            TerrainGenerator holding the window
+        """
+        width = width or height
+        terrain = self.read_window(row, col, height, width)
+        terrain_gen = TerrainGenerator.from_array(terrain, self.resolution,
+                                                  elevation_range=self.elevation_range())
+        if properties:
+            terrain_gen._compute_properties()
+        return terrain_gen
+
+    def iter_windows(self, size=config.DEM_WINDOW_SIZE, halo=DERIVED_LAYER_HALO,
+                     properties=True):
+        """
+        Iterate over the raster in tiles
+
+        Each tile is read with `halo` extra cells on every side (clipped at
+        the raster edge) so moving-window filters are exact inside the tile;
+        the default covers the derived layers (slope, roughness, ...).
+
+        Yields:
+            (target, inner, terrain_gen): target is a (row_slice, col_slice)
+            into the full raster, inner the matching slices of the window
+        """
+        for row in range(0, self.shape[0], size):
+            for col in range(0, self.shape[1], size):
+                row_stop = min(row + size, self.shape[0])
+                col_stop = min(col + size, self.shape[1])
+                read_row = max(row - halo, 0)
+                read_col = max(col - halo, 0)
+
+                terrain_gen = self.window(
+                    read_row, read_col,
+                    row_stop + halo - read_row, col_stop + halo - read_col,
+                    properties=properties
+                )
+
+                target = (slice(row, row_stop), slice(col, col_stop))
+                inner = (slice(row - read_row, row_stop - read_row),
+                         slice(col - read_col, col_stop - read_col))
+                yield target, inner, terrain_gen
+
+    def map_windows(self, func, size=config.DEM_WINDOW_SIZE, halo=DERIVED_LAYER_HALO,
+                    out=None, dtype=np.float64):
+        """
+        Apply a per-window function across the raster
+
+        Args:
+            func: Callable taking a TerrainGenerator and returning a 2D array
+                with the window's shape (e.g. a risk map)
+            size: Tile size in cells
+            halo: Extra context cells read around each tile (default: enough
+                for the derived layers to match the full raster)
+            out: Output array, or path of a .npy file to create as a
+                memory map, so results never need to fit in RAM
+            dtype: Output dtype when out is created here
+
+        Returns:
+            Output array (or memory map)
+        """
+        if out is None:
+            out = np.zeros(self.shape, dtype=dtype)
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode='w+', dtype=dtype,
+                                            shape=self.shape)
+
+        for target, inner, terrain_gen in self.iter_windows(size, halo):
+            out[target] = func(terrain_gen)[inner]
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from src.random_streams import make_rng
+
+    print("Testing DEM loader...\n")
+
+    # Write a synthetic raw DEM and stream it back window by window
+    rows, cols = 300, 200
+    dem = np.cumsum(make_rng(42).random((rows, cols)), axis=1).astype(np.float32)
+    path = os.path.join(tempfile.mkdtemp(), 'dem.raw')
+    dem.tofile(path)
+
+    raster = DEMTerrain(path, shape=(rows, cols), dtype='float32')
+    print("Raster shape: {0}".format(raster.shape))
+    print("Elevation range: {0:.1f} - {1:.1f} m".format(*raster.elevation_range()))
+
+    slope = raster.map_windows(lambda tg: tg.properties['slope'], size=128)
+    print("Max slope: {0:.2f} m/cell".format(slope.max()))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Event Records
+Compact marsquake event containers: a slotted per-event record for small
+sequences and a NumPy structured dtype for bulk storage
+"""
+import numpy as np
+import pandas as pd
+from src.data_pipeline.catalog_io import CATALOG_SCHEMA
+from src.data_pipeline.magnitude_model import MAGNITUDE_TYPES
+
+# Field order of every event record
+EVENT_FIELDS = tuple(CATALOG_SCHEMA)
+
+# One packed row per event (type stored as a uint8 code into MAGNITUDE_TYPES)
+EVENT_DTYPE = np.dtype([(name, dtype) for name, dtype in CATALOG_SCHEMA.items()])
+
+
+class MarsquakeEvent:
+    """
+    One marsquake event without a per-instance __dict__
+
+    Supports read access by key (event['magnitude']) and dict(event), so it
+    stands in for an event dictionary.
+    """
+    __slots__ = EVENT_FIELDS
+
+    def __init__(self, timestamp, magnitude, latitude, longitude, depth_km,
+                 p_wave_velocity, s_wave_velocity, type):
+        self.timestamp = timestamp
+        self.magnitude = magnitude
+        self.latitude = latitude
+        self.longitude = longitude
+        self.depth_km = depth_km
+        self.p_wave_velocity = p_wave_velocity
+        self.s_wave_velocity = s_wave_velocity
+        self.type = type
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """
+        Records for every row of a catalog DataFrame
+
+        Values are native Python objects (floats, str, Timestamp), read
+        column by column rather than through per-row dictionaries.
+        """
+        return [cls(*values) for values in zip(*(catalog[name].tolist()
+                                                 for name in EVENT_FIELDS))]
+
+    def __getitem__(self, key):
+        if key not in EVENT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return EVENT_FIELDS
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in EVENT_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, MarsquakeEvent):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "MarsquakeEvent(M{0} {1}, {2:.2f}, {3:.2f}, {4:.1f} km)".format(
+            self.magnitude, self.type, self.latitude, self.longitude, self.depth_km)
+
+
+def event_records(catalog):
+    """
+    Pack a catalog into a structured array of EVENT_DTYPE rows
+
+    Args:
+        catalog: DataFrame in the generator's event layout, or a list of
+            MarsquakeEvent records / event dictionaries
+
+    Returns:
+        numpy structured array, one row per event
+    """
+    if isinstance(catalog, list):
+        catalog = pd.DataFrame([dict(event) for event in catalog],
+                               columns=list(EVENT_FIELDS))
+
+    records = np.empty(len(catalog), dtype=EVENT_DTYPE)
+    for name in EVENT_FIELDS:
+        values = catalog[name]
+        if name == 'type':
+            if hasattr(values, 'cat'):
+                values = pd.Categorical(values, categories=MAGNITUDE_TYPES).codes
+            else:
+                values = [MAGNITUDE_TYPES.index(label) for label in values]
+        records[name] = np.asarray(values).astype(EVENT_DTYPE[name], copy=False)
+    return records
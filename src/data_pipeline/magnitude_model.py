@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Magnitude Model
+Truncated Gutenberg-Richter magnitude sampling and magnitude-derived
+event types
+"""
+import numpy as np
+import config
+
+# Event type names, ordered by magnitude range (type codes index this list)
+MAGNITUDE_TYPES = list(config.MARSQUAKE_MAGNITUDES)
+
+
+def magnitude_range():
+    """Full (min, max) magnitude range covered by the event types"""
+    bounds = np.array(list(config.MARSQUAKE_MAGNITUDES.values()))
+    return float(bounds[:, 0].min()), float(bounds[:, 1].max())
+
+
+def sample_gr_magnitudes(rng, size=None, min_magnitude=None, max_magnitude=None,
+                         b_value=None):
+    """
+    Draw magnitudes from a truncated Gutenberg-Richter law by inverse CDF
+
+    N(>=m) ~ 10^(-b m) between min_magnitude and max_magnitude; all draws
+    come from one uniform array.
+
+    Args:
+        rng: numpy Generator
+        size: Number of draws (None for a single float)
+        min_magnitude, max_magnitude: Truncation range (default: all types)
+        b_value: Gutenberg-Richter b-value (default: config.MARSQUAKE_B_VALUE)
+
+    Returns:
+        Magnitudes in [min_magnitude, max_magnitude]
+    """
+    default_min, default_max = magnitude_range()
+    min_magnitude = default_min if min_magnitude is None else min_magnitude
+    max_magnitude = default_max if max_magnitude is None else max_magnitude
+    b_value = config.MARSQUAKE_B_VALUE if b_value is None else b_value
+
+    u = rng.random(size)
+    span = 1 - 10.0 ** (-b_value * (max_magnitude - min_magnitude))
+    return min_magnitude - np.log10(1 - u * span) / b_value
+
+
+def magnitude_type_codes(magnitude):
+    """
+    Type code of each magnitude from the config type ranges
+
+    Returns:
+        Integer codes indexing MAGNITUDE_TYPES; -1 (unknown type, as in
+        pandas categorical codes) where the magnitude is NaN
+    """
+    lower_bounds = [config.MARSQUAKE_MAGNITUDES[name][0] for name in MAGNITUDE_TYPES]
+    magnitude = np.asarray(magnitude, dtype=np.float64)
+    return np.where(np.isnan(magnitude), -1, np.digitize(magnitude, lower_bounds[1:]))
@@ -4,111 +4,403 @@ Based on InSight mission statistical patterns
 """
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import config
+from src.data_pipeline.catalog_import import import_catalog
+from src.data_pipeline.catalog_io import CatalogWriter, save_catalog
+from src.data_pipeline.catalog_stats import CatalogSummary
+from src.data_pipeline.etas import ETASModel
+from src.data_pipeline.event_records import MarsquakeEvent, event_records
+from src.data_pipeline.magnitude_model import (MAGNITUDE_TYPES, magnitude_type_codes,
+                                               sample_gr_magnitudes)
+from src.random_streams import make_rng, spawn_rngs
 
 class MarsquakeGenerator:
-    def __init__(self, seed=42):
-        """Initialize marsquake generator with random seed"""
-        np.random.seed(seed)
+    def __init__(self, seed=42, rng=None):
+        """
+        Initialize marsquake generator
+        
+        Args:
+            seed: Random seed for reproducibility
+            rng: Optional numpy Generator to draw from (overrides seed)
+        """
+        self.rng = make_rng(seed if rng is None else rng)
         self.events = []
+        self.catalog = None
+        self.summary = CatalogSummary()
+    
+    @property
+    def catalog(self):
+        """
+        Columnar catalog of the current events (None if they are records only)
+        
+        Rows added by generate_event() are buffered and joined in a single
+        concat when the catalog is read, so a live session of appends does
+        not copy the whole catalog once per event.
+        """
+        if self._pending_rows:
+            self._catalog = self._append_rows(self._catalog, self._pending_rows)
+            self._pending_rows = []
+        return self._catalog
+    
+    @catalog.setter
+    def catalog(self, catalog):
+        self._catalog = catalog
+        self._pending_rows = []
+    
+    @staticmethod
+    def _append_rows(catalog, events):
+        """Catalog with event records added as its last rows"""
+        rows = pd.DataFrame([event.to_dict() for event in events])
+        types = catalog['type']
+        categories = types.cat.categories if hasattr(types, 'cat') else MAGNITUDE_TYPES
+        rows['type'] = pd.Categorical(rows['type'], categories=categories)
+        if 'parent' in catalog:
+            rows['parent'] = -1  # ETAS catalogs: untriggered background events
+        return pd.concat([catalog, rows], ignore_index=True)
+    
+    def spawn(self, n):
+        """
+        Create n generators with independent random streams
+        
+        Used to split catalog generation across workers: results depend on
+        the parent seed and stream index, never on call order or worker count.
+        """
+        return [MarsquakeGenerator(rng=rng) for rng in spawn_rngs(self.rng, n)]
     
     def generate_magnitude(self, quake_type='minor'):
-        """Generate magnitude based on quake type"""
+        """Generate magnitude based on quake type (Gutenberg-Richter within its range)"""
         min_mag, max_mag = config.MARSQUAKE_MAGNITUDES[quake_type]
-        # Use exponential distribution for more realistic magnitude
-        magnitude = np.random.uniform(min_mag, max_mag)
-        return round(magnitude, 2)
+        magnitude = sample_gr_magnitudes(self.rng, None, min_mag, max_mag)
+        return round(float(magnitude), 2)
     
     def generate_epicenter(self):
         """Generate random epicenter location on Mars surface"""
         # Latitude: -90 to 90
         # Longitude: -180 to 180
-        lat = np.random.uniform(-90, 90)
-        lon = np.random.uniform(-180, 180)
-        depth = np.random.uniform(10, 50)  # km below surface
+        lat = self.rng.uniform(-90, 90)
+        lon = self.rng.uniform(-180, 180)
+        depth = self.rng.uniform(10, 50)  # km below surface
         return lat, lon, depth
     
     def generate_event(self, magnitude=None, quake_type='minor'):
-        """Generate a single marsquake event"""
+        """
+        Generate a single marsquake event
+        
+        The event is appended to the current events: as a new row when a
+        columnar catalog is held (buffered, see catalog), otherwise as a
+        record in self.events.
+        """
         if magnitude is None:
             magnitude = self.generate_magnitude(quake_type)
         
         lat, lon, depth = self.generate_epicenter()
         
-        event = {
-            'timestamp': datetime.now(),
-            'magnitude': magnitude,
-            'latitude': lat,
-            'longitude': lon,
-            'depth_km': depth,
-            'p_wave_velocity': config.P_WAVE_VELOCITY,
-            's_wave_velocity': config.S_WAVE_VELOCITY,
-            'type': quake_type
-        }
+        event = MarsquakeEvent(
+            timestamp=datetime.now(),
+            magnitude=magnitude,
+            latitude=lat,
+            longitude=lon,
+            depth_km=depth,
+            p_wave_velocity=config.P_WAVE_VELOCITY,
+            s_wave_velocity=config.S_WAVE_VELOCITY,
+            type=quake_type
+        )
         
-        self.events.append(event)
+        if self._catalog is not None:
+            # Keep the columnar catalog: the new event becomes its last row
+            # when the catalog is next read
+            self._pending_rows.append(event)
+            # Records mirror the catalog only when generate_sequence built them
+            if self.events:
+                self.events.append(event)
+        else:
+            self.events.append(event)
+        self.summary.add_event(event)
         return event
     
     def generate_sequence(self, num_events=10, days_span=30):
-        """Generate a sequence of marsquake events over time"""
-        events = []
-        start_date = datetime.now()
-        
-        for i in range(num_events):
-            # Random time offset
-            day_offset = np.random.uniform(0, days_span)
-            event_time = start_date + timedelta(days=day_offset)
+        """Generate a sequence of marsquake events over time (MarsquakeEvent records)"""
+        catalog = self.generate_catalog(num_events, days_span)
+        events = MarsquakeEvent.from_catalog(catalog)
+        self.events = events
+        self.catalog = catalog
+        return events
+    
+    def generate_catalog(self, num_events=10, days_span=30, start_date=None):
+        """
+        Generate a time-sorted catalog of events as columns
+        
+        Types, magnitudes, epicenters, depths and times for all events are
+        drawn with single vectorized calls, so million-event catalogs never
+        build per-event Python objects.
+        
+        Args:
+            num_events: Number of events
+            days_span: Time span in days
+            start_date: Catalog start (default: now)
+        
+        Returns:
+            DataFrame with the same fields as generate_event() records
+        """
+        if start_date is None:
+            start_date = datetime.now()
+        
+        day_offset = self.rng.uniform(0, days_span, num_events)
+        columns = self._draw_event_columns(num_events)
+        
+        # Sort by timestamp
+        order = np.argsort(day_offset, kind='stable')
+        columns = {name: values[order] for name, values in columns.items()}
+        catalog = self._build_catalog_frame(day_offset[order], columns, start_date)
+        
+        self._set_catalog(catalog)
+        return catalog
+    
+    def generate_etas_catalog(self, days_span=36525, start_date=None, **etas_params):
+        """
+        Generate a clustered catalog from the ETAS aftershock model
+        
+        Background events trigger aftershocks that trigger their own, one
+        vectorized generation at a time (see ETASModel.simulate).
+        
+        Args:
+            days_span: Time span in days (default: 100 Earth years)
+            start_date: Catalog start (default: now)
+            **etas_params: Overrides for ETASModel parameters
+        
+        Returns:
+            DataFrame with the generate_catalog() columns plus 'parent', the
+            row of the triggering event (-1 for background events)
+        """
+        if start_date is None:
+            start_date = datetime.now()
+        
+        model = ETASModel(**etas_params)
+        columns = model.simulate(self.rng, days_span)
+        columns['magnitude'] = np.round(columns['magnitude'], 2)
+        columns['type_code'] = magnitude_type_codes(columns['magnitude'])
+        
+        catalog = self._build_catalog_frame(columns['day_offset'], columns, start_date)
+        catalog['parent'] = columns['parent']
+        
+        self._set_catalog(catalog)
+        return catalog
+    
+    def iter_catalog(self, num_events, days_span=30, chunk_size=None,
+                     start_date=None):
+        """
+        Generate a time-sorted catalog as a stream of chunks
+        
+        Event times are the ascending order statistics of num_events
+        uniform draws, generated chunk by chunk with the sequential
+        order-statistics recursion, so the concatenated chunks are sorted
+        without ever holding the whole catalog in memory.
+        
+        Args:
+            num_events: Total number of events
+            days_span: Time span in days
+            chunk_size: Events per chunk (default: config.CATALOG_CHUNK_SIZE)
+            start_date: Catalog start (default: now)
+        
+        Yields:
+            DataFrame chunks with the generate_catalog() columns
+        
+        The streamed catalog replaces the current events: the held catalog
+        and records are dropped (the chunks are never held), and the
+        running summary covers the chunks as they are produced.
+        """
+        if start_date is None:
+            start_date = datetime.now()
+        chunk_size = chunk_size or config.CATALOG_CHUNK_SIZE
+        
+        self.catalog = None
+        self.events = []
+        self.summary.reset()
+        log_survival = 0.0
+        for start in range(0, num_events, chunk_size):
+            count = min(chunk_size, num_events - start)
             
-            # Determine quake type based on probability
-            rand = np.random.random()
-            if rand < 0.7:
-                quake_type = 'minor'
-            elif rand < 0.95:
-                quake_type = 'moderate'
-            else:
-                quake_type = 'major'
+            # log(1 - U_(j)) accumulates log(V) / (n - j + 1) over j
+            remaining = num_events - np.arange(start, start + count)
+            steps = np.log1p(-self.rng.random(count)) / remaining
+            cumulative = log_survival + np.cumsum(steps)
+            log_survival = cumulative[-1]
+            day_offset = -np.expm1(cumulative) * days_span
             
-            event = self.generate_event(quake_type=quake_type)
-            event['timestamp'] = event_time
-            events.append(event)
+            columns = self._draw_event_columns(count)
+            chunk = self._build_catalog_frame(day_offset, columns, start_date)
+            self.summary.add_catalog(chunk)
+            yield chunk
+    
+    def iter_event_columns(self, num_events, chunk_size=None):
+        """
+        Stream event attributes in chunks, without timestamps
         
-        # Sort by timestamp
-        events.sort(key=lambda x: x['timestamp'])
-        self.events = events
-        return events
+        For time-independent (Poisson) analyses such as hazard estimation,
+        whose spans of many thousand years exceed the datetime64 range.
+        
+        Yields:
+            Dictionaries of arrays: type_code, magnitude, latitude,
+            longitude, depth_km
+        """
+        chunk_size = chunk_size or config.CATALOG_CHUNK_SIZE
+        for start in range(0, num_events, chunk_size):
+            yield self._draw_event_columns(min(chunk_size, num_events - start))
+    
+    def stream_to_file(self, filename, num_events, days_span=30,
+                       chunk_size=None, start_date=None):
+        """
+        Generate a catalog chunk by chunk straight to disk
+        
+        Memory stays flat in the catalog size: chunks are handed to a
+        background writer thread through a bounded queue, so generation
+        and I/O overlap.
+        
+        Args:
+            filename: .csv file, or directory for the binary columnar format
+            num_events: Total number of events
+            days_span: Time span in days
+            chunk_size: Events per chunk
+            start_date: Catalog start (default: now)
+        
+        Returns:
+            Number of events written
+        """
+        with CatalogWriter(filename) as writer:
+            for chunk in self.iter_catalog(num_events, days_span, chunk_size,
+                                           start_date):
+                writer.write(chunk)
+        
+        print(f"✓ Streamed {writer.rows_written} marsquake events to {filename}")
+        return writer.rows_written
+    
+    def _draw_event_columns(self, num_events):
+        """Draw type, magnitude, epicenter and depth columns for num_events events"""
+        # Gutenberg-Richter magnitudes in one draw; types follow from magnitude
+        magnitude = np.round(sample_gr_magnitudes(self.rng, num_events), 2)
+        type_codes = magnitude_type_codes(magnitude)
+        
+        return {
+            'type_code': type_codes,
+            'magnitude': magnitude,
+            'latitude': self.rng.uniform(-90, 90, num_events),
+            'longitude': self.rng.uniform(-180, 180, num_events),
+            'depth_km': self.rng.uniform(10, 50, num_events)  # km below surface
+        }
+    
+    def _build_catalog_frame(self, day_offset, columns, start_date):
+        """Assemble catalog columns into the event DataFrame layout"""
+        num_events = len(day_offset)
+        return pd.DataFrame({
+            'timestamp': pd.Timestamp(start_date) + pd.to_timedelta(day_offset, unit='D'),
+            'magnitude': columns['magnitude'],
+            'latitude': columns['latitude'],
+            'longitude': columns['longitude'],
+            'depth_km': columns['depth_km'],
+            'p_wave_velocity': np.full(num_events, config.P_WAVE_VELOCITY),
+            's_wave_velocity': np.full(num_events, config.S_WAVE_VELOCITY),
+            'type': pd.Categorical.from_codes(columns['type_code'],
+                                              MAGNITUDE_TYPES)
+        })
+    
+    def _set_catalog(self, catalog):
+        """Replace the current events with a columnar catalog"""
+        self.catalog = catalog
+        self.events = []
+        self.summary.reset()
+        self.summary.add_catalog(catalog)
+    
+    def _catalog_frame(self):
+        """Current events as a DataFrame (columnar catalog if available)"""
+        if self.catalog is not None:
+            return self.catalog
+        return pd.DataFrame([event.to_dict() for event in self.events])
+    
+    def event_records(self):
+        """
+        Current events packed as a NumPy structured array
+        
+        One EVENT_DTYPE row per event (41 bytes), the compact form for
+        holding millions of events in memory.
+        """
+        return event_records(self._catalog_frame())
+    
+    def load_catalog(self, path, **import_options):
+        """
+        Load an external catalog file as the current events
+        
+        Args:
+            path: CSV/text catalog (see catalog_import.import_catalog)
+            **import_options: Passed to import_catalog (cache_dir, sep, ...)
+        
+        Returns:
+            Catalog DataFrame in the generate_catalog() layout
+        """
+        catalog = import_catalog(path, **import_options).load()
+        self._set_catalog(catalog)
+        return catalog
     
     def save_to_csv(self, filename='data/synthetic/marsquakes.csv'):
         """Save generated events to CSV"""
-        if not self.events:
+        df = self._catalog_frame()
+        if df.empty:
             print("No events to save. Generate events first.")
             return
         
-        df = pd.DataFrame(self.events)
         df.to_csv(filename, index=False)
-        print(f"✓ Saved {len(self.events)} marsquake events to {filename}")
+        print(f"✓ Saved {len(df)} marsquake events to {filename}")
         return df
     
+    def save_columnar(self, path='data/synthetic/marsquakes_catalog'):
+        """
+        Save generated events in the binary columnar format
+        
+        Reload with CatalogStore(path), which memory-maps only the columns
+        and rows that are asked for.
+        """
+        df = self._catalog_frame()
+        if df.empty:
+            print("No events to save. Generate events first.")
+            return
+        
+        rows = save_catalog(df, path)
+        print(f"✓ Saved {rows} marsquake events to {path}")
+        return rows
+    
     def get_summary(self):
-        """Get statistical summary of generated events"""
-        if not self.events:
+        """
+        Get statistical summary of the current events (read from running
+        statistics)
+        
+        The current events are the last generated, loaded or streamed
+        catalog plus any events added since by generate_event().
+        """
+        stats = self.summary
+        if not stats.count:
             return "No events generated yet."
         
-        df = pd.DataFrame(self.events)
+        type_counts = stats.to_dict()['type_counts']
+        if stats.depth.count:
+            depth_range = f"{stats.depth.min:.1f} - {stats.depth.max:.1f} km"
+        else:
+            depth_range = "n/a"
+        if stats.depth.missing:
+            depth_range += f" ({stats.depth.missing} missing)"
         summary = f"""
         ==========================================
         MARSQUAKE GENERATION SUMMARY
         ==========================================
-        Total Events: {len(self.events)}
-        Magnitude Range: {df['magnitude'].min():.2f} - {df['magnitude'].max():.2f}
-        Average Magnitude: {df['magnitude'].mean():.2f}
+        Total Events: {stats.count}
+        Magnitude Range: {stats.magnitude.min:.2f} - {stats.magnitude.max:.2f}
+        Average Magnitude: {stats.magnitude.mean:.2f}
         
         Event Types:
-        - Minor: {len(df[df['type'] == 'minor'])}
-        - Moderate: {len(df[df['type'] == 'moderate'])}
-        - Major: {len(df[df['type'] == 'major'])}
+        - Minor: {type_counts.get('minor', 0)}
+        - Moderate: {type_counts.get('moderate', 0)}
+        - Major: {type_counts.get('major', 0)}
         
-        Depth Range: {df['depth_km'].min():.1f} - {df['depth_km'].max():.1f} km
+        Depth Range: {depth_range}
         ==========================================
         """
         return summary
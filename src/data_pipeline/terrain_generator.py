@@ -3,84 +3,479 @@
 Martian Terrain Generator using Perlin Noise
 Creates realistic height maps and terrain properties
 """
+from multiprocessing import Pool, shared_memory
 import numpy as np
 from perlin_noise import PerlinNoise
+from scipy.ndimage import laplace, uniform_filter
 import config
+from src.data_pipeline.crater_generator import CraterGenerator
+from src.physics.geodesy import grid_coordinates
+from src.physics.regolith_layers import EFFECTIVE_FIELDS, LayeredRegolith, elevation_factor
+from src.random_streams import make_rng
+
+def compute_soil_properties(terrain, elevation_range=None):
+    """
+    Compute soil rigidity and density from elevation
+    
+    Args:
+        terrain: 2D terrain elevation array
+        elevation_range: (min, max) reference elevations for normalization
+            (default: the terrain's own range). Windows of a larger raster
+            pass the global range so their properties match the full grid.
+    
+    Returns:
+        Dictionary with rigidity, density and elevation arrays
+    """
+    # Higher elevation = more compacted soil (higher rigidity)
+    # This is a simplified model
+    factor = elevation_factor(terrain, elevation_range)
+    
+    return {
+        'rigidity': config.SOIL_RIGIDITY * (0.8 + 0.4 * factor),
+        'density': config.SOIL_DENSITY * (0.9 + 0.2 * factor),
+        'elevation': terrain
+    }
+
+
+DERIVED_LAYERS = ('slope', 'slope_deg', 'roughness', 'curvature', 'aspect')
+
+# Cells beyond an edit whose derived layers can change (roughness window)
+DERIVED_LAYER_HALO = config.TERRAIN_ROUGHNESS_WINDOW // 2
+
+
+def compute_derived_layers(terrain, resolution=config.TERRAIN_RESOLUTION,
+                           window=config.TERRAIN_ROUGHNESS_WINDOW):
+    """
+    Compute derived terrain layers with vectorized filters
+    
+    Args:
+        terrain: 2D terrain elevation array
+        resolution: Meters per grid cell
+        window: Side of the moving window used for roughness
+    
+    Returns:
+        Dictionary with slope (elevation change per cell), slope_deg,
+        roughness (local std dev), curvature (1/m) and aspect (degrees)
+    """
+    # Central differences in the interior, one-sided at the edges
+    grad_x, grad_y = np.gradient(terrain)
+    slope = np.sqrt(grad_x**2 + grad_y**2)
+    slope_deg = np.degrees(np.arctan(slope / resolution))
+    
+    # Moving-window std dev. Windows are truncated at the grid edges, so
+    # border cells average only over cells that exist.
+    centered = terrain - terrain.mean()
+    count = uniform_filter(np.ones_like(centered), size=window, mode='constant')
+    mean = uniform_filter(centered, size=window, mode='constant') / count
+    mean_sq = uniform_filter(centered**2, size=window, mode='constant') / count
+    roughness = np.sqrt(np.maximum(mean_sq - mean**2, 0.0))
+    
+    curvature = laplace(terrain, mode='nearest') / resolution**2
+    aspect = np.degrees(np.arctan2(grad_y, grad_x)) % 360
+    
+    return {
+        'slope': slope,
+        'slope_deg': slope_deg,
+        'roughness': roughness,
+        'curvature': curvature,
+        'aspect': aspect
+    }
+
+
+def _fill_noise_rows(out, seed, row_start, row_stop):
+    """Evaluate Perlin noise for rows [row_start, row_stop) into out"""
+    noise = PerlinNoise(octaves=config.TERRAIN_OCTAVES, seed=seed)
+    cols = out.shape[1]
+    for i in range(row_start, row_stop):
+        for j in range(cols):
+            out[i, j] = noise([i * config.TERRAIN_NOISE_SCALE,
+                               j * config.TERRAIN_NOISE_SCALE])
+
+
+def _noise_band_worker(args):
+    """Pool worker: fill one row band of the shared-memory height map"""
+    shm_name, shape, seed, row_start, row_stop = args
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _fill_noise_rows(out, seed, row_start, row_stop)
+    finally:
+        shm.close()
+    return row_start, row_stop
+
 
 class TerrainGenerator:
-    def __init__(self, size=100, resolution=10, seed=42):
+    def __init__(self, size=100, resolution=10, seed=42, origin=None):
         """
         Initialize terrain generator
         
         Args:
-            size: Grid size (size x size)
+            size: Grid size (size x size) or (rows, cols)
             resolution: Meters per grid cell
             seed: Random seed for reproducibility
+            origin: Optional (latitude, longitude) of cell (0, 0) on Mars,
+                which georeferences the grid
         """
         self.size = size
+        self.shape = (size, size) if np.isscalar(size) else tuple(size)
         self.resolution = resolution
         self.seed = seed
+        self.origin = origin
+        self._coordinates = None
         self.terrain = None
         self.properties = None
+        self.derived = None
+        self.elevation_range = None
+        self.regolith = None
+        self.crater_rng = None  # Shared by every crater field on this terrain
+        self.dirty_regions = []
     
-    def generate_height_map(self):
-        """Generate terrain height map using Perlin noise"""
-        print("Generating {0}x{0} terrain grid...".format(self.size))
+    @classmethod
+    def from_array(cls, terrain, resolution=10, elevation_range=None, origin=None):
+        """
+        Wrap an existing elevation array (e.g. a DEM window)
+        
+        Args:
+            terrain: 2D terrain elevation array in meters
+            resolution: Meters per grid cell
+            elevation_range: (min, max) reference elevations for soil
+                properties (default: the array's own range)
+            origin: Optional (latitude, longitude) of cell (0, 0)
+        """
+        terrain_gen = cls(size=terrain.shape, resolution=resolution, seed=None,
+                          origin=origin)
+        terrain_gen.terrain = terrain
+        terrain_gen.elevation_range = elevation_range
+        return terrain_gen
+    
+    def generate_height_map(self, workers=1, band_rows=None):
+        """
+        Generate terrain height map using Perlin noise
         
-        terrain = np.zeros((self.size, self.size))
+        The grid is split into row bands. With workers > 1 the bands are
+        evaluated in a process pool writing into a shared-memory array;
+        min/max normalization is applied afterwards as a second pass, so the
+        result is bit-identical for any worker count.
         
-        # Create Perlin noise generator
-        noise = PerlinNoise(octaves=config.TERRAIN_OCTAVES, seed=self.seed)
+        Args:
+            workers: Number of worker processes (1 = evaluate in-process)
+            band_rows: Rows per band (default: config.TERRAIN_BAND_ROWS)
+        """
+        print("Generating {0}x{1} terrain grid...".format(*self.shape))
         
-        for i in range(self.size):
-            for j in range(self.size):
-                # Generate noise value
-                terrain[i][j] = noise([i * config.TERRAIN_NOISE_SCALE, 
-                                      j * config.TERRAIN_NOISE_SCALE])
+        shape = self.shape
+        band_rows = band_rows or config.TERRAIN_BAND_ROWS
+        bands = [(start, min(start + band_rows, shape[0]))
+                 for start in range(0, shape[0], band_rows)]
+        
+        if workers <= 1 or len(bands) == 1:
+            terrain = np.zeros(shape)
+            for row_start, row_stop in bands:
+                _fill_noise_rows(terrain, self.seed, row_start, row_stop)
+        else:
+            nbytes = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            try:
+                tasks = [(shm.name, shape, self.seed, row_start, row_stop)
+                         for row_start, row_stop in bands]
+                with Pool(processes=min(workers, len(bands))) as pool:
+                    for _ in pool.imap_unordered(_noise_band_worker, tasks):
+                        pass
+                terrain = np.ndarray(shape, dtype=np.float64,
+                                     buffer=shm.buf).copy()
+            finally:
+                shm.close()
+                shm.unlink()
         
         # Normalize to 0-1 range, then scale to realistic heights
         terrain = (terrain - terrain.min()) / (terrain.max() - terrain.min())
         terrain = terrain * 1000  # Scale to 0-1000 meters elevation
         
         self.terrain = terrain
+        self.derived = None
+        self.dirty_regions = []
         print("Terrain height map generated")
         return terrain
     
-    def calculate_soil_properties(self):
-        """Calculate soil rigidity and density variations based on terrain"""
+    def calculate_derived_layers(self):
+        """Compute and cache slope, roughness, curvature and aspect layers"""
         if self.terrain is None:
             self.generate_height_map()
         
-        # Higher elevation = more compacted soil (higher rigidity)
-        # This is a simplified model
-        elevation_factor = self.terrain / self.terrain.max()
+        self.derived = compute_derived_layers(self.terrain, self.resolution)
+        return self.derived
+    
+    def calculate_soil_properties(self):
+        """
+        Calculate soil rigidity and density variations based on terrain
         
-        rigidity = config.SOIL_RIGIDITY * (0.8 + 0.4 * elevation_factor)
-        density = config.SOIL_DENSITY * (0.9 + 0.2 * elevation_factor)
+        The cached derived layers (slope, roughness, ...) and, when
+        config.REGOLITH_LAYERED is set, the effective fields of the layered
+        regolith model (vs_eff, site_amplification) are included in the
+        returned properties dictionary.
+        """
+        if self.terrain is None:
+            self.generate_height_map()
         
-        self.properties = {
-            'rigidity': rigidity,
-            'density': density,
-            'elevation': self.terrain
-        }
+        self._compute_properties()
         
         print("Soil properties calculated")
         return self.properties
     
+    def _compute_properties(self):
+        """Compute soil properties, derived layers and regolith fields"""
+        self.properties = compute_soil_properties(self.terrain, self.elevation_range)
+        
+        if self.derived is None:
+            self.calculate_derived_layers()
+        self.properties.update(self.derived)
+        
+        if config.REGOLITH_LAYERED:
+            self.regolith = LayeredRegolith.from_terrain(
+                self.terrain, self.properties, self.elevation_range
+            )
+            self.properties.update(self.regolith.effective_fields())
+        return self.properties
+    
+    def cell_coordinates(self):
+        """
+        Latitude and longitude of every cell (georeferenced grids only)
+        
+        Returns:
+            (latitude, longitude) arrays in degrees, cached
+        """
+        if self.origin is None:
+            raise ValueError("Terrain has no origin. Pass origin=(lat, lon) to georeference it.")
+        if self.terrain is None:
+            raise ValueError("Terrain not generated yet. Call generate_height_map() first.")
+        
+        if self._coordinates is None or self._coordinates[0].shape != self.terrain.shape:
+            self._coordinates = grid_coordinates(self.origin, self.terrain.shape,
+                                                 self.resolution)
+        return self._coordinates
+    
     def get_terrain_at(self, x, y):
         """Get terrain properties at specific coordinates"""
         if self.terrain is None:
             raise ValueError("Terrain not generated yet. Call generate_height_map() first.")
         
         # Ensure coordinates are within bounds
-        x = np.clip(int(x), 0, self.size - 1)
-        y = np.clip(int(y), 0, self.size - 1)
+        rows, cols = self.terrain.shape
+        x = np.clip(int(x), 0, rows - 1)
+        y = np.clip(int(y), 0, cols - 1)
         
-        return {
+        result = {
             'elevation': self.terrain[x, y],
             'rigidity': self.properties['rigidity'][x, y],
             'density': self.properties['density'][x, y]
         }
+        for name in DERIVED_LAYERS + EFFECTIVE_FIELDS:
+            if name in self.properties:
+                result[name] = self.properties[name][x, y]
+        return result
+    
+    def get_terrain_at_many(self, xs, ys, interpolate=False):
+        """
+        Get terrain properties at many coordinates in one gather
+        
+        Args:
+            xs, ys: Arrays (or scalars) of grid coordinates
+            interpolate: Use bilinear interpolation for fractional
+                coordinates instead of truncating to the cell index
+                (aspect is interpolated as a direction)
+        
+        Returns:
+            Dictionary of arrays (one entry per layer, same shape as xs)
+        """
+        if self.terrain is None:
+            raise ValueError("Terrain not generated yet. Call generate_height_map() first.")
+        
+        layers = {'elevation': self.terrain}
+        if self.properties is not None:
+            for name, layer in self.properties.items():
+                if name != 'elevation':
+                    layers[name] = layer
+        
+        xs, ys = np.broadcast_arrays(np.asarray(xs), np.asarray(ys))
+        rows, cols = self.terrain.shape
+        
+        if not interpolate:
+            # Same truncate-then-clip semantics as get_terrain_at
+            ix = np.clip(xs.astype(int), 0, rows - 1)
+            iy = np.clip(ys.astype(int), 0, cols - 1)
+            return {name: layer[ix, iy] for name, layer in layers.items()}
+        
+        fx = np.clip(xs.astype(float), 0, rows - 1)
+        fy = np.clip(ys.astype(float), 0, cols - 1)
+        x0 = np.floor(fx).astype(int)
+        y0 = np.floor(fy).astype(int)
+        x1 = np.minimum(x0 + 1, rows - 1)
+        y1 = np.minimum(y0 + 1, cols - 1)
+        wx = fx - x0
+        wy = fy - y0
+        
+        w00 = (1 - wx) * (1 - wy)
+        w01 = (1 - wx) * wy
+        w10 = wx * (1 - wy)
+        w11 = wx * wy
+        
+        def blend(layer):
+            return (layer[x0, y0] * w00 + layer[x0, y1] * w01 +
+                    layer[x1, y0] * w10 + layer[x1, y1] * w11)
+        
+        result = {name: blend(layer) for name, layer in layers.items()
+                  if name != 'aspect'}
+        if 'aspect' in layers:
+            # Aspect is an angle: blend its unit vector so 359° and 1°
+            # average to 0°, not 180°
+            radians = np.radians(layers['aspect'])
+            result['aspect'] = np.degrees(np.arctan2(blend(np.sin(radians)),
+                                                     blend(np.cos(radians)))) % 360
+        return result
+    
+    def edit(self, row_start, row_stop, col_start, col_stop, func):
+        """
+        Apply a local modification to the terrain
+        
+        Soil properties and derived layers are recomputed only for the
+        edited box plus the filter halo, and that region is recorded in
+        dirty_regions for downstream consumers (e.g. the risk map).
+        The soil-property normalization reference is pinned to the
+        pre-edit elevation range so edits never invalidate the whole grid.
+        
+        Args:
+            row_start, row_stop, col_start, col_stop: Edited box (clipped)
+            func: Callable taking a copy of the box's elevations and
+                returning the new elevations
+        
+        Returns:
+            Dirty region (row_start, row_stop, col_start, col_stop)
+        """
+        if self.terrain is None:
+            raise ValueError("Terrain not generated yet. Call generate_height_map() first.")
+        
+        rows, cols = self.terrain.shape
+        row_start, row_stop = max(row_start, 0), min(row_stop, rows)
+        col_start, col_stop = max(col_start, 0), min(col_stop, cols)
+        if row_start >= row_stop or col_start >= col_stop:
+            return None
+        
+        if self.properties is not None and self.elevation_range is None:
+            self.elevation_range = (float(self.terrain.min()), float(self.terrain.max()))
+        
+        box = (slice(row_start, row_stop), slice(col_start, col_stop))
+        self.terrain[box] = func(self.terrain[box].copy())
+        
+        # Derived layers change within the halo around the edited box; they
+        # are recomputed from a block padded by a second halo so the filter
+        # values inside the dirty region are exact.
+        halo = DERIVED_LAYER_HALO
+        dirty = (max(row_start - halo, 0), min(row_stop + halo, rows),
+                 max(col_start - halo, 0), min(col_stop + halo, cols))
+        
+        if self.derived is not None:
+            read = (max(dirty[0] - halo, 0), min(dirty[1] + halo, rows),
+                    max(dirty[2] - halo, 0), min(dirty[3] + halo, cols))
+            layers = compute_derived_layers(
+                self.terrain[read[0]:read[1], read[2]:read[3]], self.resolution
+            )
+            inner = (slice(dirty[0] - read[0], dirty[1] - read[0]),
+                     slice(dirty[2] - read[2], dirty[3] - read[2]))
+            target = (slice(dirty[0], dirty[1]), slice(dirty[2], dirty[3]))
+            for name, layer in layers.items():
+                self.derived[name][target] = layer[inner]
+        
+        if self.properties is not None:
+            soil = compute_soil_properties(self.terrain[box], self.elevation_range)
+            self.properties['rigidity'][box] = soil['rigidity']
+            self.properties['density'][box] = soil['density']
+            self.properties['elevation'] = self.terrain
+            
+            if self.regolith is not None:
+                fields = self.regolith.update_region(box, self.terrain,
+                                                     self.properties, self.elevation_range)
+                for name, field in fields.items():
+                    self.properties[name][box] = field
+        
+        self.dirty_regions.append(dirty)
+        return dirty
+    
+    def add_crater(self, x, y, radius, depth):
+        """
+        Excavate a bowl-shaped crater
+        
+        Args:
+            x, y: Crater center (grid cells)
+            radius: Crater radius in cells
+            depth: Depth at the center in meters
+        """
+        def carve(block, row_start, col_start):
+            ii, jj = np.ogrid[row_start:row_start + block.shape[0],
+                              col_start:col_start + block.shape[1]]
+            r2 = ((ii - x)**2 + (jj - y)**2) / float(radius)**2
+            return block - depth * np.clip(1 - r2, 0, None)
+        
+        return self._edit_disc(x, y, radius, carve)
+    
+    def level_pad(self, x, y, radius, elevation=None):
+        """
+        Flatten a circular habitat pad
+        
+        Args:
+            x, y: Pad center (grid cells)
+            radius: Pad radius in cells
+            elevation: Pad elevation in meters (default: mean inside the pad)
+        """
+        def level(block, row_start, col_start):
+            ii, jj = np.ogrid[row_start:row_start + block.shape[0],
+                              col_start:col_start + block.shape[1]]
+            inside = (ii - x)**2 + (jj - y)**2 <= radius**2
+            target = block[inside].mean() if elevation is None else elevation
+            return np.where(inside, target, block)
+        
+        return self._edit_disc(x, y, radius, level)
+    
+    def _edit_disc(self, x, y, radius, shape_func):
+        """Run edit() on the bounding box of a disc"""
+        rows, cols = self.terrain.shape
+        row_start = max(int(np.floor(x - radius)), 0)
+        col_start = max(int(np.floor(y - radius)), 0)
+        return self.edit(row_start, int(np.ceil(x + radius)) + 1,
+                         col_start, int(np.ceil(y + radius)) + 1,
+                         lambda block: shape_func(block, row_start, col_start))
+    
+    def add_crater_field(self, num_craters, **sfd_params):
+        """
+        Add a field of impact craters to the terrain
+        
+        Craters are drawn from one random stream per terrain, seeded by the
+        terrain seed: the first field reproduces the seed and every later
+        call adds a new population.
+        
+        Args:
+            num_craters: Number of craters to place
+            **sfd_params: min_diameter, max_diameter, sfd_slope overrides
+        
+        Returns:
+            Dictionary of crater arrays (x, y, diameter)
+        """
+        if self.terrain is None:
+            self.generate_height_map()
+        
+        if self.crater_rng is None:
+            self.crater_rng = make_rng(self.seed)
+        craters = CraterGenerator(self.terrain.shape, self.resolution, seed=self.crater_rng)
+        field = craters.sample_craters(num_craters, **sfd_params)
+        
+        rows, cols = self.terrain.shape
+        self.edit(0, rows, 0, cols, craters.stamp)
+        print("Added {0} impact craters".format(num_craters))
+        return field
+    
+    def pop_dirty_regions(self):
+        """Return and clear the regions changed since the last call"""
+        regions, self.dirty_regions = self.dirty_regions, []
+        return regions
     
     def print_terrain_stats(self):
         """Print terrain statistics"""
@@ -88,28 +483,30 @@ class TerrainGenerator:
             print("No terrain generated yet.")
             return
         
+        rows, cols = self.terrain.shape
         stats = """
         ==========================================
         TERRAIN GENERATION SUMMARY
         ==========================================
-        Grid Size: {0} x {0}
-        Resolution: {1} m/cell
-        Total Area: {2:.2f} km²
+        Grid Size: {0} x {1}
+        Resolution: {2} m/cell
+        Total Area: {3:.2f} km²
         
         Elevation Stats:
-        - Min: {3:.2f} m
-        - Max: {4:.2f} m
-        - Mean: {5:.2f} m
-        - Std Dev: {6:.2f} m
+        - Min: {4:.2f} m
+        - Max: {5:.2f} m
+        - Mean: {6:.2f} m
+        - Std Dev: {7:.2f} m
         
         Soil Properties:
-        - Rigidity Range: {7:.2e} - {8:.2e} Pa
-        - Density Range: {9:.1f} - {10:.1f} kg/m³
+        - Rigidity Range: {8:.2e} - {9:.2e} Pa
+        - Density Range: {10:.1f} - {11:.1f} kg/m³
         ==========================================
         """.format(
-            self.size,
+            rows,
+            cols,
             self.resolution,
-            (self.size * self.resolution / 1000)**2,
+            rows * cols * (self.resolution / 1000)**2,
             self.terrain.min(),
             self.terrain.max(),
             self.terrain.mean(),
@@ -132,8 +529,10 @@ class TerrainGenerator:
             'properties': self.properties,
             'metadata': {
                 'size': self.size,
+                'shape': self.terrain.shape,
                 'resolution': self.resolution,
-                'seed': self.seed
+                'seed': self.seed,
+                'origin': self.origin
             }
         })
         print("Terrain saved to {0}".format(filename))
@@ -154,5 +553,6 @@ if __name__ == "__main__":
     print("Elevation: {0:.2f} m".format(props['elevation']))
     print("Rigidity: {0:.2e} Pa".format(props['rigidity']))
     print("Density: {0:.1f} kg/m³".format(props['density']))
+    print("Slope: {0:.2f}°".format(props['slope_deg']))
     
     terrain_gen.save_terrain()
\ No newline at end of file
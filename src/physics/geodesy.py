@@ -0,0 +1,53 @@
+"""
+Mars Geodesy
+Vectorized great-circle distances and grid georeferencing on the Mars sphere
+"""
+import numpy as np
+import config
+
+
+def haversine_distance(lat1, lon1, lat2, lon2, radius=config.MARS_RADIUS):
+    """
+    Great-circle distance between points on Mars
+
+    All arguments broadcast, so one call covers a whole catalog against a
+    site, or one epicenter against every grid cell.
+
+    Args:
+        lat1, lon1, lat2, lon2: Coordinates in degrees
+        radius: Sphere radius in km
+
+    Returns:
+        Distance in km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64))
+                              for v in (lat1, lon1, lat2, lon2))
+    h = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def grid_coordinates(origin, shape, resolution, radius=config.MARS_RADIUS):
+    """
+    Latitude and longitude of every grid cell
+
+    The origin is the center of cell (0, 0); rows run south and columns run
+    east, with cell spacing converted to degrees at the local latitude
+    (the grid is small next to the planet).
+
+    Args:
+        origin: (latitude, longitude) of cell (0, 0) in degrees
+        shape: (rows, cols)
+        resolution: Meters per grid cell
+        radius: Sphere radius in km
+
+    Returns:
+        (latitude, longitude) arrays of the given shape
+    """
+    lat0, lon0 = origin
+    step = np.degrees(resolution / (radius * 1000.0))
+
+    latitude = lat0 - step * np.arange(shape[0])
+    longitude = lon0 + step * np.arange(shape[1])[None, :] / np.cos(np.radians(latitude))[:, None]
+    longitude = (longitude + 180) % 360 - 180
+    return np.broadcast_to(latitude[:, None], shape).copy(), longitude
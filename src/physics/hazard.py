@@ -0,0 +1,305 @@
+"""
+Probabilistic Seismic Hazard
+Monte Carlo hazard curves and maps from long synthetic marsquake catalogs
+"""
+from functools import lru_cache
+from multiprocessing import Pool
+import numpy as np
+from scipy import fft
+import config
+from src.data_pipeline.magnitude_model import magnitude_range
+from src.random_streams import spawn_rngs
+
+
+@lru_cache(maxsize=8)
+def attenuation_kernel(rows, cols, spacing=config.GRID_SPACING,
+                       damping=config.SOIL_DAMPING_COEFFICIENT):
+    """
+    Distance attenuation for every source-to-target grid offset
+
+    Same relation as WavePropagation: amplitude = 10^(M - 3) * kernel, with
+    geometric spreading 1/distance and exponential material damping. The
+    epicentral cell uses one grid spacing as its distance.
+
+    The kernel is laid out for circular FFT convolution: offset (di, dj) is
+    stored at index (di mod N, dj mod M) of an (N, M) array with
+    N >= 2 * rows - 1 and M >= 2 * cols - 1, so no wrap-around aliases.
+
+    Returns:
+        Read-only float64 array of shape (N, M)
+    """
+    n = fft.next_fast_len(2 * rows - 1)
+    m = fft.next_fast_len(2 * cols - 1)
+
+    def offsets(length, extent):
+        index = np.arange(length)
+        offset = np.where(index < extent, index, index - length).astype(float)
+        offset[(index >= extent) & (index <= length - extent)] = np.nan  # never reached
+        return offset
+
+    di = offsets(n, rows)[:, None] * spacing
+    dj = offsets(m, cols)[None, :] * spacing
+    distance = np.maximum(np.sqrt(di**2 + dj**2), spacing)
+
+    kernel = np.exp(-damping * distance / 1000) / distance
+    kernel = np.nan_to_num(kernel, nan=0.0)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _hazard_chunk_worker(args):
+    """
+    Pool worker: simulate one chunk of years and histogram its events
+
+    Returns:
+        int64 counts of shape (n_bins, rows * cols) indexed by
+        (magnitude bin, source cell)
+    """
+    from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+    rng, years, shape, annual_rate, mag_min, bin_width, n_bins = args
+    generator = MarsquakeGenerator(rng=rng)
+    num_cells = shape[0] * shape[1]
+
+    num_events = int(generator.rng.poisson(annual_rate * years))
+    counts = np.zeros(n_bins * num_cells, dtype=np.int64)
+    for columns in generator.iter_event_columns(num_events):
+        magnitude = columns['magnitude']
+        bins = np.clip(np.rint((magnitude - mag_min) / bin_width).astype(int), 0, n_bins - 1)
+        # Regional source zone: epicenters uniform over the grid
+        cells = generator.rng.integers(0, num_cells, len(magnitude))
+        counts += np.bincount(bins * num_cells + cells, minlength=n_bins * num_cells)
+    return counts.reshape(n_bins, num_cells)
+
+
+class HazardCurves:
+    def __init__(self, thresholds, counts, years):
+        """
+        Hazard curves at every grid cell
+
+        Args:
+            thresholds: Ground-motion thresholds in mm, ascending
+            counts: Exceedance counts, shape (n_thresholds, rows, cols)
+            years: Number of simulated years behind the counts
+        """
+        self.thresholds = thresholds
+        self.counts = counts
+        self.years = years
+
+    def exceedance_rate(self):
+        """Annual rate of exceeding each threshold, shape (n_thresholds, rows, cols)"""
+        return self.counts / self.years
+
+    def exceedance_probability(self, exposure_years=config.HAZARD_EXPOSURE_YEARS):
+        """Poisson probability of at least one exceedance within exposure_years"""
+        return -np.expm1(-self.exceedance_rate() * exposure_years)
+
+    def hazard_curve(self, x, y, exposure_years=config.HAZARD_EXPOSURE_YEARS):
+        """
+        Hazard curve at one grid cell
+
+        Returns:
+            (thresholds, exceedance probabilities)
+        """
+        rate = self.counts[:, int(x), int(y)] / self.years
+        return self.thresholds, -np.expm1(-rate * exposure_years)
+
+    def hazard_map(self, probability=config.HAZARD_MAP_PROBABILITY,
+                   exposure_years=config.HAZARD_EXPOSURE_YEARS):
+        """
+        Ground motion with the given exceedance probability at every cell
+
+        Interpolated in log amplitude between thresholds; cells whose lowest
+        threshold is already less likely than `probability` get 0.
+
+        Returns:
+            2D array of amplitudes in mm
+        """
+        target_rate = -np.log1p(-probability) / exposure_years
+        rate = self.exceedance_rate()
+        log_thresholds = np.log10(self.thresholds)
+
+        # Rates fall with threshold: find the last threshold still above target
+        above = (rate >= target_rate).sum(axis=0)
+        upper = np.clip(above, 1, len(self.thresholds) - 1)
+        rate_low = np.take_along_axis(rate, (upper - 1)[None], axis=0)[0]
+        rate_high = np.take_along_axis(rate, upper[None], axis=0)[0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.clip((rate_low - target_rate) / (rate_low - rate_high), 0, 1)
+        fraction = np.nan_to_num(fraction)
+        log_amplitude = log_thresholds[upper - 1] + fraction * (
+            log_thresholds[upper] - log_thresholds[upper - 1])
+
+        amplitude = 10.0 ** log_amplitude
+        amplitude[above == 0] = 0.0
+        amplitude[above == len(self.thresholds)] = self.thresholds[-1]
+        return amplitude
+
+
+class HazardEngine:
+    def __init__(self, terrain_grid, terrain_properties):
+        """
+        Initialize hazard engine
+
+        Args:
+            terrain_grid: 2D array of terrain elevations
+            terrain_properties: Dictionary of soil properties (uses
+                'site_amplification' when present)
+        """
+        self.rows, self.cols = terrain_grid.shape
+        self.site_amplification = np.asarray(terrain_properties.get(
+            'site_amplification', np.ones(terrain_grid.shape)), dtype=np.float64)
+
+        # Magnitude bins are centered on mag_min + k * bin_width, and an
+        # integer number of them spans one threshold step
+        self.threshold_step = config.HAZARD_THRESHOLD_STEP
+        self.bin_width = config.HAZARD_MAGNITUDE_BIN
+        self.bins_per_step = int(round(self.threshold_step / self.bin_width))
+        if not np.isclose(self.bins_per_step * self.bin_width, self.threshold_step):
+            raise ValueError("HAZARD_MAGNITUDE_BIN must divide HAZARD_THRESHOLD_STEP")
+
+        self.mag_min, mag_max = magnitude_range()
+        self.n_bins = int(round((mag_max - self.mag_min) / self.bin_width)) + 1
+        self.thresholds = config.HAZARD_MIN_AMPLITUDE * 10.0 ** (
+            self.threshold_step * np.arange(config.HAZARD_NUM_THRESHOLDS))
+
+    def simulate_sources(self, years, workers=1, chunk_years=None, seed=42):
+        """
+        Histogram synthetic catalog events by magnitude bin and source cell
+
+        The years are split into fixed chunks, each with its own spawned
+        random stream, so results do not depend on the worker count. Each
+        chunk streams its events from MarsquakeGenerator.iter_event_columns.
+
+        Returns:
+            int64 counts of shape (n_bins, rows, cols)
+        """
+        chunk_years = chunk_years or config.HAZARD_CHUNK_YEARS
+        spans = [min(chunk_years, years - start) for start in range(0, years, chunk_years)]
+        tasks = [(rng, span, (self.rows, self.cols), config.HAZARD_ANNUAL_RATE,
+                  self.mag_min, self.bin_width, self.n_bins)
+                 for rng, span in zip(spawn_rngs(seed, len(spans)), spans)]
+
+        counts = np.zeros((self.n_bins, self.rows * self.cols), dtype=np.int64)
+        if workers <= 1 or len(tasks) == 1:
+            for task in tasks:
+                counts += _hazard_chunk_worker(task)
+        else:
+            with Pool(processes=min(workers, len(tasks))) as pool:
+                for chunk_counts in pool.imap_unordered(_hazard_chunk_worker, tasks):
+                    counts += chunk_counts
+        return counts.reshape(self.n_bins, self.rows, self.cols)
+
+    def rock_exceedance_counts(self, sources):
+        """
+        Count events exceeding each threshold at each cell, before site effects
+
+        An event of magnitude m exceeds threshold a wherever the kernel is
+        above a / 10^(m - 3), i.e. inside a disk around its source, so the
+        count map for (bin, threshold) is the bin's source histogram
+        convolved with that disk (done by FFT). Thresholds are spaced by a
+        whole number of magnitude bins, so the disk depends only on
+        bins_per_step * threshold index minus bin index and is transformed
+        once per difference.
+
+        Every event is evaluated at its bin's center magnitude, so counts are
+        approximate by up to half a bin (+-0.05 magnitude, about 12% in
+        amplitude, at the default 0.1 bins). With HAZARD_MAGNITUDE_BIN = 0.01,
+        the rounding of catalog magnitudes, each bin holds one magnitude and
+        the counts equal a per-event evaluation exactly, at roughly ten
+        times the cost.
+
+        Args:
+            sources: Counts of shape (n_bins, rows, cols)
+
+        Returns:
+            float64 counts of shape (n_thresholds, rows, cols)
+        """
+        kernel = attenuation_kernel(self.rows, self.cols)
+        shape = kernel.shape
+        n_thresholds = len(self.thresholds)
+
+        source_spectra = {k: fft.rfft2(sources[k].astype(np.float64), s=shape)
+                          for k in range(self.n_bins) if sources[k].any()}
+
+        bin_magnitude = self.mag_min + np.arange(self.n_bins) * self.bin_width
+        disk_spectra = {}
+
+        counts = np.zeros((n_thresholds, self.rows, self.cols))
+        for j in range(n_thresholds):
+            total = None
+            for k, spectrum in source_spectra.items():
+                key = j * self.bins_per_step - k
+                if key not in disk_spectra:
+                    level = self.thresholds[j] / 10.0 ** (bin_magnitude[k] - 3)
+                    disk_spectra[key] = fft.rfft2((kernel > level).astype(np.float64))
+                product = spectrum * disk_spectra[key]
+                total = product if total is None else total + product
+            if total is not None:
+                counts[j] = fft.irfft2(total, s=shape)[:self.rows, :self.cols]
+
+        # Counts are integers; remove FFT round-off
+        return np.rint(np.maximum(counts, 0))
+
+    def apply_site_amplification(self, rock_counts):
+        """
+        Shift rock hazard curves by each cell's site amplification
+
+        Exceeding a at a site with amplification s is exceeding a / s on
+        rock; with log-spaced thresholds that is a fractional shift of the
+        curve index, interpolated linearly between thresholds.
+        """
+        n_thresholds = len(self.thresholds)
+        shift = np.log10(self.site_amplification) / self.threshold_step
+        position = np.arange(n_thresholds)[:, None, None] - shift[None]
+        position = np.clip(position, 0, n_thresholds - 1)
+
+        low = np.floor(position).astype(int)
+        high = np.minimum(low + 1, n_thresholds - 1)
+        weight = position - low
+        return ((1 - weight) * np.take_along_axis(rock_counts, low, axis=0) +
+                weight * np.take_along_axis(rock_counts, high, axis=0))
+
+    def run(self, years, workers=1, chunk_years=None, seed=42):
+        """
+        Run a full Monte Carlo hazard analysis
+
+        Args:
+            years: Number of synthetic years to simulate
+            workers: Number of worker processes for catalog simulation
+            chunk_years: Years per worker task
+            seed: Random seed
+
+        Returns:
+            HazardCurves
+        """
+        print("Simulating {0} years of marsquakes...".format(years))
+        sources = self.simulate_sources(years, workers, chunk_years, seed)
+        print("Evaluating ground motion for {0} events...".format(int(sources.sum())))
+        rock_counts = self.rock_exceedance_counts(sources)
+        counts = self.apply_site_amplification(rock_counts)
+        return HazardCurves(self.thresholds, counts.astype(np.float32), years)
+
+
+if __name__ == "__main__":
+    import time
+    from src.data_pipeline.terrain_generator import TerrainGenerator
+
+    print("Testing Hazard Engine...\n")
+
+    terrain_gen = TerrainGenerator(size=100)
+    terrain = terrain_gen.generate_height_map()
+    properties = terrain_gen.calculate_soil_properties()
+
+    engine = HazardEngine(terrain, properties)
+    start = time.time()
+    curves = engine.run(years=2000, workers=2, chunk_years=500)
+    print("Hazard analysis took {0:.1f} s".format(time.time() - start))
+
+    hazard_map = curves.hazard_map()
+    print("10% in 50 years ground motion: {0:.3f} - {1:.3f} mm".format(
+        hazard_map.min(), hazard_map.max()))
+    thresholds, probability = curves.hazard_curve(50, 50)
+    for a, p in list(zip(thresholds, probability))[::8]:
+        print("  P(A > {0:8.3f} mm) = {1:.4f}".format(a, p))
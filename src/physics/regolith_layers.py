@@ -0,0 +1,179 @@
+"""
+Layered Subsurface Regolith Model
+Depth-layered soil columns with effective velocity and site amplification
+"""
+import numpy as np
+import config
+
+# Per-cell fields the model exposes through terrain properties
+EFFECTIVE_FIELDS = ('vs_eff', 'site_amplification')
+
+
+def elevation_factor(terrain, elevation_range=None):
+    """
+    Elevation rescaled to 0 (lowest) .. 1 (highest)
+
+    Works for rasters below datum (most of Mars) as well as above it.
+
+    Args:
+        terrain: 2D terrain elevation array
+        elevation_range: (min, max) reference elevations (default: the
+            terrain's own). Windows of a larger raster pass the global
+            range so their values match the full grid.
+    """
+    if elevation_range is None:
+        elevation_range = (terrain.min(), terrain.max())
+    low, high = elevation_range
+    span = high - low
+    if span <= 0:
+        return np.ones_like(terrain, dtype=np.float64)
+    return (terrain - low) / span
+
+
+def _build_layers(terrain, rigidity, density, elevation_range):
+    """
+    Build the per-cell layer stack from surface soil properties
+
+    The loose surface layer is thicker in low-lying cells (sediment
+    accumulates there), by a factor clamped to 0.5 - 1.5 so elevations
+    outside the reference range never give negative thickness; layer
+    stiffness and density scale the surface values by the factors in
+    config.REGOLITH_LAYERS.
+
+    Returns:
+        (thickness, rigidity, density, halfspace_rigidity, halfspace_density)
+        layer arrays have shape (n_layers, rows, cols), float32
+    """
+    factor = elevation_factor(terrain, elevation_range)
+    layers = config.REGOLITH_LAYERS
+    shape = (len(layers),) + terrain.shape
+
+    thickness = np.empty(shape, dtype=np.float32)
+    layer_rigidity = np.empty(shape, dtype=np.float32)
+    layer_density = np.empty(shape, dtype=np.float32)
+
+    for k, (layer_thickness, rigidity_factor, density_factor) in enumerate(layers):
+        thickness[k] = layer_thickness
+        layer_rigidity[k] = rigidity * rigidity_factor
+        layer_density[k] = density * density_factor
+    thickness[0] *= np.clip(1.5 - factor, 0.5, 1.5).astype(np.float32)
+
+    rigidity_factor, density_factor = config.REGOLITH_HALFSPACE
+    halfspace_rigidity = (rigidity * rigidity_factor).astype(np.float32)
+    halfspace_density = (density * density_factor).astype(np.float32)
+
+    return thickness, layer_rigidity, layer_density, halfspace_rigidity, halfspace_density
+
+
+class LayeredRegolith:
+    def __init__(self, thickness, rigidity, density, halfspace_rigidity,
+                 halfspace_density):
+        """
+        Initialize layered regolith model
+
+        Args:
+            thickness: Layer thickness in m, shape (n_layers, rows, cols)
+            rigidity: Layer rigidity in Pa, same shape
+            density: Layer density in kg/m^3, same shape
+            halfspace_rigidity, halfspace_density: Properties below the
+                deepest layer, shape (rows, cols)
+        """
+        self.thickness = thickness
+        self.rigidity = rigidity
+        self.density = density
+        self.halfspace_rigidity = halfspace_rigidity
+        self.halfspace_density = halfspace_density
+
+    @classmethod
+    def from_terrain(cls, terrain, properties, elevation_range=None):
+        """
+        Build the layer stack from terrain and surface soil properties
+
+        Args:
+            terrain: 2D terrain elevation array
+            properties: Dictionary with rigidity and density
+            elevation_range: (min, max) normalization reference
+                (default: the terrain's own range)
+        """
+        if elevation_range is None:
+            elevation_range = (terrain.min(), terrain.max())
+        return cls(*_build_layers(terrain, properties['rigidity'],
+                                  properties['density'], elevation_range))
+
+    def update_region(self, region, terrain, properties, elevation_range):
+        """
+        Rebuild the layer stack inside a (row_slice, col_slice) region
+
+        Returns:
+            Effective fields for the region (see effective_fields)
+        """
+        layers = _build_layers(terrain[region], properties['rigidity'][region],
+                               properties['density'][region], elevation_range)
+        self.thickness[(slice(None),) + region] = layers[0]
+        self.rigidity[(slice(None),) + region] = layers[1]
+        self.density[(slice(None),) + region] = layers[2]
+        self.halfspace_rigidity[region] = layers[3]
+        self.halfspace_density[region] = layers[4]
+        return self.effective_fields(region)
+
+    def effective_fields(self, region=None, depth=config.REGOLITH_AVERAGING_DEPTH):
+        """
+        Compute effective shear velocity and site amplification
+
+        The effective velocity is the travel-time average over the top
+        `depth` meters (Vs30-style). Site amplification is the impedance
+        ratio of the reference soil (config SOIL_RIGIDITY / SOIL_DENSITY)
+        to the averaged column, so a homogeneous reference column gives 1.
+
+        Args:
+            region: Optional (row_slice, col_slice) to evaluate
+            depth: Averaging depth in meters
+
+        Returns:
+            Dictionary with float32 'vs_eff' (m/s) and 'site_amplification'
+        """
+        region = region or (slice(None), slice(None))
+        layer_region = (slice(None),) + region
+
+        thickness = self.thickness[layer_region]
+        density = self.density[layer_region]
+        velocity = np.sqrt(self.rigidity[layer_region] / density)
+
+        # Portion of each layer that lies above the averaging depth
+        top = np.cumsum(thickness, axis=0) - thickness
+        portion = np.clip(depth - top, 0, thickness)
+        below = np.maximum(depth - thickness.sum(axis=0), 0)
+
+        halfspace_density = self.halfspace_density[region]
+        halfspace_velocity = np.sqrt(self.halfspace_rigidity[region] / halfspace_density)
+
+        travel_time = (portion / velocity).sum(axis=0) + below / halfspace_velocity
+        vs_eff = depth / travel_time
+        density_eff = ((portion * density).sum(axis=0) + below * halfspace_density) / depth
+
+        reference_impedance = np.sqrt(config.SOIL_RIGIDITY * config.SOIL_DENSITY)
+        amplification = np.sqrt(reference_impedance / (density_eff * vs_eff))
+
+        return {
+            'vs_eff': vs_eff.astype(np.float32),
+            'site_amplification': amplification.astype(np.float32)
+        }
+
+
+if __name__ == "__main__":
+    from src.data_pipeline.terrain_generator import TerrainGenerator
+
+    print("Testing Layered Regolith...\n")
+
+    terrain_gen = TerrainGenerator(size=50)
+    terrain = terrain_gen.generate_height_map()
+    properties = terrain_gen.calculate_soil_properties()
+
+    regolith = LayeredRegolith.from_terrain(terrain, properties)
+    fields = regolith.effective_fields()
+
+    print("Layers: {0}".format(regolith.thickness.shape[0]))
+    print("Effective Vs: {0:.0f} - {1:.0f} m/s".format(
+        fields['vs_eff'].min(), fields['vs_eff'].max()))
+    print("Site amplification: {0:.2f} - {1:.2f}".format(
+        fields['site_amplification'].min(), fields['site_amplification'].max()))
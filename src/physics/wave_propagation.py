@@ -5,24 +5,95 @@ Models how P-waves and S-waves travel through Martian terrain
 import numpy as np
 import config
 from scipy.ndimage import gaussian_filter
+from src.physics.geodesy import haversine_distance
+
+
+def peak_amplitude(magnitude, distance):
+    """
+    Peak ground motion in mm at an epicentral distance in meters
+
+    Magnitude scaling, geometric spreading (1/distance) and material damping;
+    broadcasts over arrays of magnitudes and distances.
+    """
+    distance = np.maximum(distance, 1.0)
+    return (10.0 ** (np.asarray(magnitude, dtype=np.float64) - 3) / distance *
+            np.exp(-config.SOIL_DAMPING_COEFFICIENT * distance / 1000))
+
+
+def screen_catalog(catalog, site_lat, site_lon, min_amplitude=0.0):
+    """
+    Screen a global catalog against one site in a single array operation
+    
+    Args:
+        catalog: DataFrame (or dict of arrays) with latitude, longitude, magnitude
+        site_lat, site_lon: Site coordinates in degrees
+        min_amplitude: Keep events whose peak motion at the site reaches this (mm)
+    
+    Returns:
+        (indices, distance_km, amplitude_mm) of the retained events, strongest first
+    """
+    distance_km = haversine_distance(catalog['latitude'], catalog['longitude'],
+                                     site_lat, site_lon)
+    amplitude = peak_amplitude(catalog['magnitude'], distance_km * 1000)
+    
+    keep = np.flatnonzero(amplitude >= min_amplitude)
+    keep = keep[np.argsort(-amplitude[keep], kind='stable')]
+    return keep, distance_km[keep], amplitude[keep]
+
 
 class WavePropagation:
-    def __init__(self, terrain_grid, terrain_properties):
+    def __init__(self, terrain_grid, terrain_properties, coordinates=None):
         """
         Initialize wave propagation simulator
         
         Args:
             terrain_grid: 2D array of terrain elevations
             terrain_properties: Dictionary with rigidity and density
+            coordinates: Optional (latitude, longitude) arrays of every cell
+                (TerrainGenerator.cell_coordinates()) for geographic epicenters
         """
         self.terrain = terrain_grid
         self.properties = terrain_properties
         self.size = terrain_grid.shape[0]
+        self.rows, self.cols = terrain_grid.shape
+        
+        # Precomputed site amplification from the layered regolith model
+        # (uniform when the terrain has no layered soil)
+        self.site_amplification = terrain_properties.get(
+            'site_amplification', np.ones(terrain_grid.shape)
+        )
+        
+        self.coordinates = coordinates
+        self._distance_cache = {}
         
         # Wave field (amplitude at each grid point)
         self.wave_field = np.zeros_like(terrain_grid)
         self.time = 0
     
+    def epicentral_distance(self, epicenter, geographic=False):
+        """
+        Distance from the epicenter to every grid cell in meters (cached)
+        
+        Args:
+            epicenter: (x, y) grid coordinates, or (latitude, longitude) in
+                degrees when geographic is True
+            geographic: Use great-circle distance on the Mars sphere
+        """
+        key = (tuple(float(v) for v in epicenter), geographic)
+        if key not in self._distance_cache:
+            if geographic:
+                if self.coordinates is None:
+                    raise ValueError("Geographic epicenters need cell coordinates")
+                latitude, longitude = self.coordinates
+                distance = haversine_distance(epicenter[0], epicenter[1],
+                                              latitude, longitude) * 1000
+            else:
+                dx = (np.arange(self.rows)[:, None] - epicenter[0]) * config.GRID_SPACING
+                dy = (np.arange(self.cols)[None, :] - epicenter[1]) * config.GRID_SPACING
+                distance = np.sqrt(dx**2 + dy**2)
+            self._distance_cache = {key: distance}  # keep only the current event
+        return self._distance_cache[key]
+    
     def calculate_arrival_time(self, epicenter, target, wave_type='p'):
         """
         Calculate wave arrival time from epicenter to target
@@ -48,50 +119,37 @@ class WavePropagation:
         
         return arrival_time
     
-    def simulate_wave_step(self, epicenter, magnitude, current_time):
+    def simulate_wave_step(self, epicenter, magnitude, current_time, geographic=False):
         """
         Simulate one time step of wave propagation
         
         Args:
-            epicenter: (x, y) epicenter coordinates
+            epicenter: (x, y) epicenter coordinates, or (latitude, longitude)
+                when geographic is True
             magnitude: Quake magnitude
             current_time: Current simulation time
+            geographic: Epicenter is on the Mars sphere (georeferenced grid)
         """
-        # Calculate wave amplitude based on magnitude (Richter scale)
-        # Amplitude increases exponentially with magnitude
-        base_amplitude = 10 ** (magnitude - 3)  # Ground motion in mm
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                # Calculate distance from epicenter
-                dx = (i - epicenter[0]) * config.GRID_SPACING
-                dy = (j - epicenter[1]) * config.GRID_SPACING
-                distance = np.sqrt(dx**2 + dy**2)
-                
-                # Skip epicenter itself
-                if distance < config.GRID_SPACING:
-                    continue
-                
-                # Calculate arrival time for P-wave
-                arrival_time = distance / config.P_WAVE_VELOCITY
-                
-                # Check if wave has arrived
-                if current_time >= arrival_time:
-                    # Calculate amplitude with distance decay
-                    # Geometric spreading: amplitude ~ 1/distance
-                    amplitude = base_amplitude / max(distance, 1.0)
-                    
-                    # Apply material damping
-                    damping = np.exp(-config.SOIL_DAMPING_COEFFICIENT * distance / 1000)
-                    amplitude *= damping
-                    
-                    # Time-dependent wave shape (simplified Ricker wavelet)
-                    time_since_arrival = current_time - arrival_time
-                    freq = 1.0  # 1 Hz dominant frequency
-                    wave_shape = (1 - 2 * (np.pi * freq * time_since_arrival)**2) * \
-                                 np.exp(-(np.pi * freq * time_since_arrival)**2)
-                    
-                    self.wave_field[i, j] = amplitude * wave_shape
+        distance = self.epicentral_distance(epicenter, geographic)
+        
+        # Calculate arrival time for P-wave
+        arrival_time = distance / config.P_WAVE_VELOCITY
+        
+        # Cells the wave has reached (the epicenter cell itself is skipped)
+        arrived = (distance >= config.GRID_SPACING) & (current_time >= arrival_time)
+        
+        # Amplitude with magnitude scaling, geometric spreading and damping,
+        # times the local soil column response
+        amplitude = peak_amplitude(magnitude, distance[arrived])
+        amplitude *= self.site_amplification[arrived]
+        
+        # Time-dependent wave shape (simplified Ricker wavelet)
+        time_since_arrival = current_time - arrival_time[arrived]
+        freq = 1.0  # 1 Hz dominant frequency
+        wave_shape = (1 - 2 * (np.pi * freq * time_since_arrival)**2) * \
+                     np.exp(-(np.pi * freq * time_since_arrival)**2)
+        
+        self.wave_field[arrived] = amplitude * wave_shape
         
         # Apply smoothing to simulate wave diffusion
         self.wave_field = gaussian_filter(self.wave_field, sigma=0.5)
@@ -99,8 +157,8 @@ class WavePropagation:
     
     def get_amplitude_at(self, x, y):
         """Get wave amplitude at specific location"""
-        x = np.clip(int(x), 0, self.size - 1)
-        y = np.clip(int(y), 0, self.size - 1)
+        x = np.clip(int(x), 0, self.rows - 1)
+        y = np.clip(int(y), 0, self.cols - 1)
         return self.wave_field[x, y]
     
     def get_max_amplitude(self):
@@ -0,0 +1,57 @@
+"""
+Random Stream Helpers
+Independent numpy Generators derived from SeedSequence, so stochastic
+components never share global np.random state
+"""
+import numpy as np
+
+
+def seed_sequence(seed=None):
+    """
+    Coerce a seed into a SeedSequence
+
+    Args:
+        seed: None, int, SeedSequence or Generator
+
+    Returns:
+        numpy.random.SeedSequence
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        bit_generator = seed.bit_generator
+        # Public attribute since numpy 1.25, private before
+        return getattr(bit_generator, 'seed_seq', None) or bit_generator._seed_seq
+    return np.random.SeedSequence(seed)
+
+
+def make_rng(seed=None):
+    """
+    Build a Generator (Generators are passed through unchanged)
+
+    Args:
+        seed: None, int, SeedSequence or Generator
+
+    Returns:
+        numpy.random.Generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed_sequence(seed))
+
+
+def spawn_rngs(seed, n):
+    """
+    Spawn n statistically independent Generators
+
+    Children depend only on the parent seed and their index, so work split
+    across any number of workers reproduces the same streams.
+
+    Args:
+        seed: Parent seed (None, int, SeedSequence or Generator)
+        n: Number of child streams
+
+    Returns:
+        List of numpy.random.Generator
+    """
+    return [np.random.default_rng(child) for child in seed_sequence(seed).spawn(n)]
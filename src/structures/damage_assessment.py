@@ -0,0 +1,238 @@
+"""
+Lifetime Damage Assessment
+Runs a whole marsquake catalog against a habitat placed on every grid cell
+and accumulates damage into a map for site selection
+"""
+import hashlib
+import numpy as np
+import config
+from src.physics.geodesy import haversine_distance
+from src.physics.wave_propagation import peak_amplitude
+from src.structures.structure_fleet import (SAFETY_STATUS, SAFETY_THRESHOLDS,
+                                            StructureFleet, ground_acceleration)
+
+
+def _catalog_block(catalog, names, start, stop):
+    """Columns of a catalog row range (DataFrame, dict of arrays or CatalogStore)"""
+    if hasattr(catalog, 'column'):
+        return [np.asarray(catalog.column(name, start, stop), dtype=np.float64)
+                for name in names]
+    return [np.asarray(catalog[name], dtype=np.float64)[start:stop] for name in names]
+
+
+def _has_columns(catalog, names):
+    """Whether a DataFrame, dict of arrays or CatalogStore has all columns"""
+    available = catalog.columns if hasattr(catalog, 'column') else catalog
+    return all(name in available for name in names)
+
+
+class DamageAssessment:
+    def __init__(self, terrain_grid, terrain_properties, coordinates=None):
+        """
+        Initialize lifetime damage assessment
+
+        Args:
+            terrain_grid: 2D array of terrain elevations
+            terrain_properties: Dictionary of soil properties (uses
+                'site_amplification' when present)
+            coordinates: Optional (latitude, longitude) arrays of every cell
+                (TerrainGenerator.cell_coordinates()). With coordinates,
+                epicenters are catalog latitude/longitude; without, they are
+                grid positions in the catalog's x/y columns, or drawn
+                uniformly over the grid (as in HazardEngine) when the catalog
+                has none.
+        """
+        self.shape = terrain_grid.shape
+        self.site_amplification = np.asarray(terrain_properties.get(
+            'site_amplification', np.ones(self.shape)), dtype=np.float64).ravel()
+        self.coordinates = coordinates
+
+        rows, cols = np.indices(self.shape)
+        self.cells = np.column_stack([rows.ravel(), cols.ravel()])
+        self._motion_cache = {}
+        self._cache_bytes = 0
+
+    def _epicenter_columns(self):
+        return ('latitude', 'longitude') if self.coordinates is not None else ('x', 'y')
+
+    def block_events(self):
+        """
+        Events per ground-motion block
+
+        One block holds a float32 amplitude per event and cell, so the
+        block size follows from config.DAMAGE_BLOCK_MB and the grid size.
+        """
+        return max(1, config.DAMAGE_BLOCK_MB * 2**20 // (4 * self.cells.shape[0]))
+
+    def _row_bands(self, num_events):
+        """
+        Flat cell slices covering whole grid rows
+
+        Bands are sized so a float64 (num_events, band) temporary stays
+        within an eighth of config.DAMAGE_BLOCK_MB.
+        """
+        rows, cols = self.shape
+        band_rows = max(1, config.DAMAGE_BLOCK_MB * 2**20 // (64 * num_events * cols))
+        for row in range(0, rows, band_rows):
+            yield slice(row * cols, min(row + band_rows, rows) * cols)
+
+    def _block_key(self, first, second, magnitude):
+        """Digest of a block of events (epicenters and magnitudes)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for values in (first, second, magnitude):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
+    def ground_motion(self, first, second, magnitude):
+        """
+        Peak ground motion of a block of events at every cell (cached)
+
+        Same attenuation as WavePropagation and HazardEngine, times the
+        local site amplification; the epicentral cell uses one grid spacing
+        as its distance. Blocks are cached by content (up to
+        config.DAMAGE_MOTION_CACHE_MB), so repeated runs of the same catalog,
+        e.g. for other structure designs, skip this step.
+
+        Args:
+            first, second: Epicenter latitude/longitude in degrees, or grid
+                x/y without coordinates
+            magnitude: Event magnitudes
+
+        Returns:
+            Read-only float32 array of amplitudes in mm, shape
+            (n_events, rows * cols)
+        """
+        key = self._block_key(first, second, magnitude)
+        if key in self._motion_cache:
+            return self._motion_cache[key]
+
+        # Distances and amplitudes are computed one band of grid rows at a
+        # time; only the float32 result spans the whole grid
+        motion = np.empty((len(magnitude), self.cells.shape[0]), dtype=np.float32)
+        for band in self._row_bands(len(magnitude)):
+            if self.coordinates is not None:
+                latitude, longitude = (values.ravel()[band] for values in self.coordinates)
+                distance = haversine_distance(first[:, None], second[:, None],
+                                              latitude[None, :], longitude[None, :]) * 1000
+            else:
+                cells = self.cells[band]
+                dx = (cells[None, :, 0] - first[:, None]) * config.GRID_SPACING
+                dy = (cells[None, :, 1] - second[:, None]) * config.GRID_SPACING
+                distance = np.sqrt(dx**2 + dy**2)
+            distance = np.maximum(distance, config.GRID_SPACING)
+            motion[:, band] = peak_amplitude(magnitude[:, None], distance) * \
+                self.site_amplification[band]
+        motion.setflags(write=False)
+
+        # A full cache keeps what it has rather than evicting: a catalog
+        # larger than the budget is scanned in order on every run, and LRU
+        # eviction would drop each block just before it is needed again.
+        if self._cache_bytes + motion.nbytes <= config.DAMAGE_MOTION_CACHE_MB * 2**20:
+            self._motion_cache[key] = motion
+            self._cache_bytes += motion.nbytes
+        return motion
+
+    def run(self, catalog, chunk_events=None, seed=42, **structure_params):
+        """
+        Accumulate the damage of a catalog at every candidate cell
+
+        Events are processed in time order, one block of chunk_events at a
+        time: the block's ground-motion map is computed (or taken from the
+        cache) and applied to a StructureFleet holding one habitat per cell,
+        one band of grid rows at a time.
+
+        Args:
+            catalog: DataFrame, dict of arrays or CatalogStore with magnitude
+                and, with coordinates, latitude/longitude. Without
+                coordinates, optional x/y grid positions; catalogs without
+                them (every generator and importer output) get epicenter
+                cells drawn uniformly over the grid.
+            chunk_events: Events per block (default: block_events())
+            seed: Seed of the epicenter cells drawn for catalogs without x/y
+            **structure_params: StructureFleet parameters (mass, strength, ...)
+
+        Returns:
+            Dictionary of (rows, cols) maps: damage, status, risk (0 safe,
+            1 monitor, 2 warning or worse, as used by
+            RiskPredictor.suggest_placement), max_displacement (mm) and
+            peak_stress (Pa), plus the number of events
+        """
+        if not _has_columns(catalog, ('magnitude',)):
+            raise ValueError("Catalog needs a magnitude column")
+        chunk_events = chunk_events or self.block_events()
+        num_events = len(catalog['magnitude']) if isinstance(catalog, dict) else len(catalog)
+
+        names = self._epicenter_columns()
+        source_cells = None
+        if not _has_columns(catalog, names):
+            if self.coordinates is not None:
+                raise ValueError("Catalog needs latitude and longitude columns "
+                                 "when the assessment has coordinates")
+            # Regional source zone: epicenters uniform over the grid
+            rng = np.random.default_rng(seed)
+            source_cells = self.cells[rng.integers(0, len(self.cells), num_events)]
+
+        fleet = StructureFleet(self.cells, **structure_params)
+        for start in range(0, num_events, chunk_events):
+            stop = start + chunk_events
+            if source_cells is None:
+                first, second, magnitude = _catalog_block(catalog, names + ('magnitude',),
+                                                          start, stop)
+            else:
+                first, second = source_cells[start:stop].T.astype(np.float64)
+                magnitude, = _catalog_block(catalog, ('magnitude',), start, stop)
+            motion = self.ground_motion(first, second, magnitude)
+            for band in self._row_bands(len(magnitude)):
+                fleet.accumulate_events(ground_acceleration(motion[:, band]), band)
+
+        level = np.digitize(fleet.damage_level, SAFETY_THRESHOLDS)
+        return {
+            'damage': fleet.damage_level.reshape(self.shape),
+            'status': SAFETY_STATUS[level].reshape(self.shape),
+            'risk': np.minimum(level, 2).reshape(self.shape),
+            'max_displacement': (fleet.max_displacement * 1000).reshape(self.shape),
+            'peak_stress': fleet.peak_stress.reshape(self.shape),
+            'events': num_events
+        }
+
+    def clear_cache(self):
+        """Drop all cached ground-motion blocks"""
+        self._motion_cache.clear()
+        self._cache_bytes = 0
+
+
+if __name__ == "__main__":
+    import time
+    from src.data_pipeline.magnitude_model import sample_gr_magnitudes
+    from src.data_pipeline.terrain_generator import TerrainGenerator
+
+    print("Testing Lifetime Damage Assessment...\n")
+
+    terrain_gen = TerrainGenerator(size=100, resolution=10, seed=42,
+                                   origin=config.TERRAIN_ORIGIN)
+    terrain = terrain_gen.generate_height_map()
+    properties = terrain_gen.calculate_soil_properties()
+
+    # Regional catalog: epicenters scattered around the grid
+    rng = np.random.default_rng(42)
+    num_events = 5000
+    lat0, lon0 = config.TERRAIN_ORIGIN
+    catalog = {
+        'latitude': lat0 + rng.normal(0, 0.05, num_events),
+        'longitude': lon0 + rng.normal(0, 0.05, num_events),
+        'magnitude': sample_gr_magnitudes(rng, num_events)
+    }
+
+    assessment = DamageAssessment(terrain, properties,
+                                  coordinates=terrain_gen.cell_coordinates())
+    for label in ("first run", "cached run"):
+        start = time.time()
+        result = assessment.run(catalog)
+        print("{0} events x {1} cells ({2}): {3:.2f} s".format(
+            result['events'], terrain.size, label, time.time() - start))
+
+    print("Max displacement: {0:.3f} - {1:.3f} mm".format(
+        result['max_displacement'].min(), result['max_displacement'].max()))
+    print("Peak stress: {0:.3g} - {1:.3g} Pa".format(
+        result['peak_stress'].min(), result['peak_stress'].max()))
+    print("Max lifetime damage: {0:.3f}".format(result['damage'].max()))
@@ -3,35 +3,128 @@ Habitat Structure Model
 Analyzes structural response to seismic forces
 """
 import numpy as np
-import config
+from src.structures.stress_history import StressHistory
+from src.structures.structure_fleet import (DEFAULT_PARAMETERS, PARAMETER_FIELDS, SAFETY_STATUS,
+                                            SAFETY_THRESHOLDS, STATE_FIELDS, StructureFleet,
+                                            validate_parameters)
+
+
+class _FleetField:
+    """
+    Attribute stored in one row of the backing StructureFleet array, or in
+    a scalar slot of a standalone habitat
+    """
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = '_' + name
+    
+    def __get__(self, habitat, owner=None):
+        if habitat is None:
+            return self
+        if habitat.fleet is None:
+            return getattr(habitat, self.slot)
+        return getattr(habitat.fleet, self.name)[habitat.index].item()
+    
+    def __set__(self, habitat, value):
+        if habitat.fleet is None:
+            setattr(habitat, self.slot, float(value))
+        else:
+            getattr(habitat.fleet, self.name)[habitat.index] = value
+
 
 class HabitatModel:
-    def __init__(self, location, custom_params=None):
+    # No per-instance __dict__: parameters and state live in the fleet arrays,
+    # or in plain scalar slots for a standalone habitat
+    __slots__ = (('fleet', 'index', '_stress_history', '_location') +
+                 tuple('_' + name for name in PARAMETER_FIELDS + STATE_FIELDS))
+    
+    mass = _FleetField()
+    height = _FleetField()
+    width = _FleetField()
+    strength = _FleetField()
+    natural_freq = _FleetField()
+    damage_level = _FleetField()  # 0 = intact, 1 = total failure
+    max_displacement = _FleetField()
+    peak_stress = _FleetField()
+    
+    def __init__(self, location, custom_params=None, stress_spill_path=None):
         """
         Initialize habitat model
         
+        A standalone habitat keeps its parameters and state as scalars;
+        HabitatModel.from_fleet views one row of a StructureFleet instead.
+        
         Args:
             location: (x, y) grid coordinates
-            custom_params: Optional dictionary to override default parameters
+            custom_params: Optional dictionary overriding any of mass, height,
+                width, strength, natural_freq (validated, see
+                structure_fleet.validate_parameters)
+            stress_spill_path: Optional file receiving the full stress history
         """
-        self.location = location
+        self.fleet = None
+        self.index = 0
+        self._location = tuple(location)
         
         # Default parameters from config
-        self.mass = config.HABITAT_MASS
-        self.height = config.HABITAT_HEIGHT
-        self.width = config.HABITAT_WIDTH
-        self.strength = config.HABITAT_MATERIAL_STRENGTH
-        self.natural_freq = config.HABITAT_NATURAL_FREQUENCY
+        for name, value in DEFAULT_PARAMETERS.items():
+            setattr(self, name, value)
+        for name in STATE_FIELDS:
+            setattr(self, name, 0.0)
         
         # Override with custom parameters if provided
         if custom_params:
-            for key, value in custom_params.items():
+            for key, value in validate_parameters(custom_params).items():
                 setattr(self, key, value)
         
-        # Structural health
-        self.damage_level = 0.0  # 0 = intact, 1 = total failure
-        self.max_displacement = 0.0
-        self.stress_history = []
+        # Recent stress samples plus running peak/mean/count (created on
+        # first use unless the full history is spilled to disk)
+        self._stress_history = None
+        if stress_spill_path is not None:
+            self._stress_history = StressHistory(spill_path=stress_spill_path)
+    
+    @classmethod
+    def from_fleet(cls, fleet, index):
+        """View one row of an existing fleet as a HabitatModel"""
+        habitat = cls.__new__(cls)
+        habitat.fleet = fleet
+        habitat.index = index
+        habitat._stress_history = None
+        return habitat
+    
+    @property
+    def stress_history(self):
+        if self._stress_history is None:
+            self._stress_history = StressHistory()
+        return self._stress_history
+    
+    def _stress_stats(self):
+        """Peak, mean and count of recorded stress (zeros before any response)"""
+        if self._stress_history is None or not len(self._stress_history):
+            return 0.0, 0.0, 0
+        history = self._stress_history
+        return history.peak, history.mean, len(history)
+    
+    @property
+    def location(self):
+        if self.fleet is None:
+            return self._location
+        return tuple(int(v) for v in self.fleet.locations[self.index])
+    
+    @location.setter
+    def location(self, location):
+        if self.fleet is None:
+            self._location = tuple(location)
+        else:
+            self.fleet.locations[self.index] = location
+    
+    def _as_fleet(self):
+        """One-row fleet holding a standalone habitat's parameters and state"""
+        fleet = StructureFleet([self._location],
+                               **{name: getattr(self, name) for name in PARAMETER_FIELDS})
+        for name in STATE_FIELDS:
+            getattr(fleet, name)[0] = getattr(self, name)
+        return fleet
     
     def calculate_response(self, ground_acceleration):
         """
@@ -43,53 +136,17 @@ class HabitatModel:
         Returns:
             Dictionary with response parameters
         """
-        # Single-degree-of-freedom (SDOF) approximation
-        # Natural frequency
-        omega_n = 2 * np.pi * self.natural_freq
-        
-        # Damping ratio (typical for Mars habitat: 2-5%)
-        damping_ratio = 0.03
-        
-        # Dynamic amplification factor
-        # For simplicity, using peak response
-        beta = 1.0 / self.natural_freq  # Frequency ratio approximation
-        
-        # Amplification factor
-        amp_factor = 1.0 / np.sqrt((1 - beta**2)**2 + (2 * damping_ratio * beta)**2)
-        amp_factor = min(amp_factor, 5.0)  # Cap at 5 for stability
-        
-        # Structural displacement
-        displacement = (ground_acceleration / omega_n**2) * amp_factor
-        
-        # Update max displacement
-        self.max_displacement = max(self.max_displacement, abs(displacement))
-        
-        # Calculate stress (simplified)
-        # Stress = Force / Area
-        # Force = mass * acceleration
-        force = self.mass * abs(ground_acceleration) * amp_factor
-        
-        # Approximate cross-sectional area
-        area = self.width * self.width  # Assuming square base
-        
-        stress = force / area
-        self.stress_history.append(stress)
-        
-        # Calculate damage
-        # Damage occurs when stress exceeds material strength
-        stress_ratio = stress / self.strength
-        
-        if stress_ratio > 0.5:  # Damage threshold at 50% of strength
-            damage_increment = (stress_ratio - 0.5) * 0.1
-            self.damage_level = min(1.0, self.damage_level + damage_increment)
-        
-        return {
-            'displacement': displacement,
-            'stress': stress,
-            'stress_ratio': stress_ratio,
-            'amplification_factor': amp_factor,
-            'damage_level': self.damage_level
-        }
+        # Single-degree-of-freedom (SDOF) approximation, evaluated by the
+        # fleet (a temporary one-row fleet for a standalone habitat)
+        fleet = self.fleet if self.fleet is not None else self._as_fleet()
+        index = self.index if self.fleet is not None else 0
+        response = fleet.calculate_response(ground_acceleration, index)
+        response = {name: float(value) for name, value in response.items()}
+        if self.fleet is None:
+            for name in STATE_FIELDS:
+                setattr(self, name, getattr(fleet, name)[0])
+        self.stress_history.append(response['stress'])
+        return response
     
     def evaluate_safety(self, wave_amplitude):
         """
@@ -106,27 +163,17 @@ class HabitatModel:
         frequency = 1.0  # 1 Hz typical marsquake frequency
         acceleration = (2 * np.pi * frequency)**2 * (wave_amplitude / 1000)  # Convert mm to m
         
-        response = self.calculate_response(acceleration)
+        self.calculate_response(acceleration)
         
-        # Safety thresholds
-        if self.damage_level < 0.1:
-            status = "SAFE"
-            color = "green"
-        elif self.damage_level < 0.3:
-            status = "MONITOR"
-            color = "yellow"
-        elif self.damage_level < 0.7:
-            status = "WARNING"
-            color = "orange"
-        else:
-            status = "CRITICAL"
-            color = "red"
+        # Safety thresholds (shared with StructureFleet)
+        status = str(SAFETY_STATUS[np.digitize(self.damage_level, SAFETY_THRESHOLDS)])
+        peak_stress, _, _ = self._stress_stats()
         
         return {
             'status': status,
             'safety_rating': 1.0 - self.damage_level,
             'max_displacement': self.max_displacement * 1000,  # Convert to mm
-            'peak_stress': max(self.stress_history) if self.stress_history else 0,
+            'peak_stress': peak_stress,
             'recommendation': self._get_recommendation(status)
         }
     
@@ -142,26 +189,32 @@ class HabitatModel:
     
     def reset(self):
         """Reset structural health for new simulation"""
-        self.damage_level = 0.0
-        self.max_displacement = 0.0
-        self.stress_history = []
+        if self.fleet is None:
+            for name in STATE_FIELDS:
+                setattr(self, name, 0.0)
+        else:
+            self.fleet.reset(self.index)
+        if self._stress_history is not None:
+            self._stress_history.reset()
     
     def get_summary(self):
-        """Get habitat summary"""
+        """Get habitat summary (stress read from the running statistics)"""
+        peak_stress, mean_stress, samples = self._stress_stats()
         summary = f"""
         ==========================================
         HABITAT STRUCTURAL SUMMARY
         ==========================================
         Location: {self.location}
-        Mass: {self.mass} kg
-        Dimensions: {self.width}m x {self.width}m x {self.height}m
+        Mass: {self.mass:g} kg
+        Dimensions: {self.width:g}m x {self.width:g}m x {self.height:g}m
         Natural Frequency: {self.natural_freq} Hz
         Material Strength: {self.strength:.2e} Pa
         
         Current Status:
         - Damage Level: {self.damage_level*100:.1f}%
         - Max Displacement: {self.max_displacement*1000:.2f} mm
-        - Peak Stress: {max(self.stress_history) if self.stress_history else 0:.2e} Pa
+        - Peak Stress: {peak_stress:.2e} Pa
+        - Mean Stress: {mean_stress:.2e} Pa ({samples} responses)
         ==========================================
         """
         return summary
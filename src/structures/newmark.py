@@ -0,0 +1,147 @@
+"""
+Newmark-beta SDOF Integrator
+Time-history response of many single-degree-of-freedom oscillators to
+ground acceleration, integrated together as array operations
+"""
+import numpy as np
+import config
+
+
+class NewmarkIntegrator:
+    def __init__(self, natural_freq, damping_ratio=config.HABITAT_DAMPING_RATIO,
+                 dt=config.TIME_STEP, gamma=0.5, beta=0.25):
+        """
+        Initialize integrator for N oscillators
+
+        Solves u'' + 2 zeta omega u' + omega^2 u = -a_g(t) for the relative
+        displacement u of each oscillator. The default gamma = 1/2,
+        beta = 1/4 (constant average acceleration) is unconditionally stable.
+
+        Args:
+            natural_freq: Natural frequencies in Hz, scalar or (N,)
+            damping_ratio: Damping ratios, scalar or (N,)
+            dt: Time step in seconds
+            gamma, beta: Newmark parameters
+        """
+        natural_freq, damping_ratio = np.broadcast_arrays(
+            np.asarray(natural_freq, dtype=np.float64),
+            np.asarray(damping_ratio, dtype=np.float64))
+        self.natural_freq = natural_freq.ravel().copy()
+        self.damping_ratio = damping_ratio.ravel().copy()
+        self.dt = dt
+        self.gamma = gamma
+        self.beta = beta
+
+        omega = 2 * np.pi * self.natural_freq
+        self.stiffness = omega**2  # per unit mass
+        self.damping = 2 * self.damping_ratio * omega
+
+        # Step constants (unit mass), computed once
+        self._c_u = 1 / (beta * dt**2)
+        self._c_v = 1 / (beta * dt)
+        self._c_a = 1 / (2 * beta) - 1
+        self._d_u = gamma / (beta * dt)
+        self._d_v = gamma / beta - 1
+        self._d_a = dt * (gamma / (2 * beta) - 1)
+        self._k_hat = self.stiffness + self._c_u + self._d_u * self.damping
+
+        self.reset()
+
+    def __len__(self):
+        return len(self.natural_freq)
+
+    def reset(self):
+        """Return every oscillator to rest and clear the peaks"""
+        n = len(self)
+        self.displacement = np.zeros(n)
+        self.velocity = np.zeros(n)
+        self.acceleration = np.zeros(n)  # Relative acceleration
+        self.peak_displacement = np.zeros(n)
+        self.peak_total_acceleration = np.zeros(n)
+        self._started = False
+
+    def step(self, ground_acceleration):
+        """
+        Advance all oscillators by one time step
+
+        Cost is a fixed number of array operations, linear in N.
+
+        Args:
+            ground_acceleration: Ground acceleration at the new time in
+                m/s², scalar or one value per oscillator (station records)
+
+        Returns:
+            Relative displacement of every oscillator in m
+        """
+        ground = np.asarray(ground_acceleration, dtype=np.float64)
+        if not self._started:
+            # Consistent initial acceleration at rest
+            self.acceleration = np.broadcast_to(-ground, self.displacement.shape).copy()
+            self._started = True
+            return self.displacement
+
+        u, v, a = self.displacement, self.velocity, self.acceleration
+        load = (-ground
+                + self._c_u * u + self._c_v * v + self._c_a * a
+                + self.damping * (self._d_u * u + self._d_v * v + self._d_a * a))
+        u_new = load / self._k_hat
+
+        du = u_new - u
+        v_new = (self.gamma / (self.beta * self.dt)) * du + (1 - self.gamma / self.beta) * v \
+            + self.dt * (1 - self.gamma / (2 * self.beta)) * a
+        a_new = self._c_u * du - self._c_v * v - self._c_a * a
+
+        self.displacement, self.velocity, self.acceleration = u_new, v_new, a_new
+        np.maximum(self.peak_displacement, np.abs(u_new), out=self.peak_displacement)
+        np.maximum(self.peak_total_acceleration, np.abs(a_new + ground),
+                   out=self.peak_total_acceleration)
+        return u_new
+
+    def integrate(self, record, keep_history=False):
+        """
+        Integrate a whole ground-acceleration record
+
+        Args:
+            record: Acceleration samples in m/s² at spacing dt, shape (T,)
+                for one shared record or (T, N) for one record per oscillator
+            keep_history: Also return the displacement history
+
+        Returns:
+            Dictionary with peak_displacement, peak_total_acceleration and,
+            if requested, displacement of shape (T, N)
+        """
+        record = np.asarray(record, dtype=np.float64)
+        history = np.empty((len(record), len(self))) if keep_history else None
+
+        for t, ground in enumerate(record):
+            u = self.step(ground)
+            if keep_history:
+                history[t] = u
+
+        result = {
+            'peak_displacement': self.peak_displacement.copy(),
+            'peak_total_acceleration': self.peak_total_acceleration.copy()
+        }
+        if keep_history:
+            result['displacement'] = history
+        return result
+
+
+if __name__ == "__main__":
+    import time
+
+    print("Testing Newmark-beta Integrator...\n")
+
+    dt = 0.01
+    t = np.arange(0, 20, dt)
+    record = 0.5 * np.sin(2 * np.pi * 1.5 * t) * np.exp(-0.2 * t)  # m/s²
+
+    integrator = NewmarkIntegrator(np.linspace(0.5, 10, 10000), dt=dt)
+    start = time.time()
+    result = integrator.integrate(record)
+    print("Integrated {0} oscillators over {1} steps in {2:.2f} s".format(
+        len(integrator), len(record), time.time() - start))
+
+    peak = np.argmax(result['peak_displacement'])
+    print("Largest response at {0:.2f} Hz: {1:.2f} mm".format(
+        integrator.natural_freq[peak], result['peak_displacement'][peak] * 1000))
@@ -0,0 +1,119 @@
+"""
+Response Spectrum Engine
+Pseudo-spectral acceleration of ground-motion records over a dense period
+grid, with every oscillator integrated together and spectra cached by
+record hash
+"""
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import config
+from src.structures.newmark import NewmarkIntegrator
+
+_spectrum_cache = OrderedDict()
+
+
+def default_periods():
+    """Log-spaced period grid from config.RESPONSE_SPECTRUM_PERIODS"""
+    low, high, count = config.RESPONSE_SPECTRUM_PERIODS
+    return np.logspace(np.log10(low), np.log10(high), count)
+
+
+def record_hash(record, dt, periods, damping_ratio):
+    """Digest identifying a spectrum request (record content and settings)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(record, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(periods, dtype=np.float64).tobytes())
+    digest.update(np.array([dt, damping_ratio], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def response_spectrum(record, dt, periods=None, damping_ratio=None):
+    """
+    Compute the response spectrum of a ground-acceleration record
+
+    One NewmarkIntegrator holds an oscillator per period, so the whole
+    spectrum is a single pass over the record. Records too coarse for the
+    shortest period are linearly resampled to keep the integration
+    accurate. Results are cached by record hash; cached arrays are
+    read-only.
+
+    Args:
+        record: Ground acceleration samples in m/s²
+        dt: Sample spacing in seconds
+        periods: Oscillator periods in seconds (default: config grid)
+        damping_ratio: Oscillator damping (default: 5%)
+
+    Returns:
+        Dictionary with periods, sd (spectral displacement, m), psa
+        (pseudo-spectral acceleration, m/s²) and pga (m/s²)
+    """
+    periods = default_periods() if periods is None else np.asarray(periods, dtype=np.float64)
+    if damping_ratio is None:
+        damping_ratio = config.RESPONSE_SPECTRUM_DAMPING
+    record = np.asarray(record, dtype=np.float64)
+
+    key = record_hash(record, dt, periods, damping_ratio)
+    if key in _spectrum_cache:
+        _spectrum_cache.move_to_end(key)
+        return _spectrum_cache[key]
+
+    # Substeps so the shortest period gets enough integration steps
+    substeps = max(1, int(np.ceil(
+        config.RESPONSE_SPECTRUM_STEPS_PER_PERIOD * dt / periods.min())))
+    if substeps > 1:
+        fine_time = np.arange((len(record) - 1) * substeps + 1) * (dt / substeps)
+        record_fine = np.interp(fine_time, np.arange(len(record)) * dt, record)
+    else:
+        record_fine = record
+
+    integrator = NewmarkIntegrator(1.0 / periods, damping_ratio, dt / substeps)
+    result = integrator.integrate(record_fine)
+
+    omega = 2 * np.pi / periods
+    spectrum = {
+        'periods': periods,
+        'sd': result['peak_displacement'],
+        'psa': omega**2 * result['peak_displacement'],
+        'pga': float(np.abs(record).max()) if len(record) else 0.0
+    }
+    for values in spectrum.values():
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+
+    _spectrum_cache[key] = spectrum
+    if len(_spectrum_cache) > config.RESPONSE_SPECTRUM_CACHE_SIZE:
+        _spectrum_cache.popitem(last=False)
+    return spectrum
+
+
+def clear_spectrum_cache():
+    """Drop all cached spectra"""
+    _spectrum_cache.clear()
+
+
+if __name__ == "__main__":
+    import time
+
+    print("Testing Response Spectrum Engine...\n")
+
+    dt = 0.01
+    t = np.arange(0, 30, dt)
+    rng = np.random.default_rng(42)
+    record = rng.normal(0, 0.2, len(t)) * np.exp(-((t - 8) / 5) ** 2)  # m/s²
+
+    start = time.time()
+    spectrum = response_spectrum(record, dt)
+    first = time.time() - start
+    start = time.time()
+    response_spectrum(record, dt)
+    print("Spectrum over {0} periods: {1:.2f} s (cached: {2:.4f} s)".format(
+        len(spectrum['periods']), first, time.time() - start))
+
+    peak = np.argmax(spectrum['psa'])
+    print("PGA: {0:.3f} m/s²".format(spectrum['pga']))
+    print("Peak PSA: {0:.3f} m/s² at T = {1:.2f} s".format(
+        spectrum['psa'][peak], spectrum['periods'][peak]))
+    habitat_period = 1 / config.HABITAT_NATURAL_FREQUENCY
+    print("PSA at habitat period ({0:.2f} s): {1:.3f} m/s²".format(
+        habitat_period, np.interp(habitat_period, spectrum['periods'], spectrum['psa'])))
@@ -6,6 +6,9 @@ import numpy as np
 import config
 
 class RoverModel:
+    __slots__ = ('location', 'mass', 'wheelbase', 'strength',
+                 'tipping_risk', 'damage_level', 'max_tilt_angle')
+    
     def __init__(self, location):
         """Initialize rover model"""
         self.location = location
@@ -0,0 +1,96 @@
+"""
+Stress History
+Fixed-capacity ring buffer of recent stress samples with O(1) running
+statistics and optional spill of the full history to disk
+"""
+import numpy as np
+import config
+from src.data_pipeline.catalog_stats import RunningStats
+
+
+class StressHistory:
+    __slots__ = ('capacity', 'spill_path', 'buffer', 'stats', '_position', '_unspilled')
+
+    def __init__(self, capacity=None, spill_path=None):
+        """
+        Initialize stress history
+
+        Args:
+            capacity: Number of recent samples kept in memory
+            spill_path: Optional raw float64 file receiving every sample,
+                so the full history survives the ring buffer
+
+        The buffer grows with the samples recorded (doubling, up to
+        capacity), so structures with a short history hold a short buffer.
+        """
+        self.capacity = capacity or config.STRESS_HISTORY_CAPACITY
+        self.spill_path = spill_path
+        self.buffer = np.zeros(0)
+        self.stats = RunningStats()
+        self._position = 0  # Next write slot
+        self._unspilled = 0  # Samples in the buffer not yet on disk
+
+        if spill_path is not None:
+            open(spill_path, 'wb').close()
+
+    def append(self, value):
+        """Record one stress sample (amortized O(1))"""
+        if self._position == len(self.buffer) < self.capacity:
+            grown = np.zeros(min(self.capacity, max(16, 2 * len(self.buffer))))
+            grown[:len(self.buffer)] = self.buffer
+            self.buffer = grown
+        self.buffer[self._position] = value
+        self._position = (self._position + 1) % self.capacity
+        self.stats.update([value])
+
+        if self.spill_path is not None:
+            self._unspilled += 1
+            if self._unspilled == self.capacity:
+                self.flush()
+
+    def flush(self):
+        """Write samples not yet on disk to the spill file"""
+        if self.spill_path is None or not self._unspilled:
+            return
+        start = (self._position - self._unspilled) % self.capacity
+        pending = np.roll(self.buffer, -start)[:self._unspilled]
+        with open(self.spill_path, 'ab') as f:
+            f.write(pending.tobytes())
+        self._unspilled = 0
+
+    def recent(self):
+        """Samples still in the ring buffer, oldest first"""
+        if len(self) < self.capacity:
+            return self.buffer[:len(self)].copy()
+        return np.roll(self.buffer, -self._position)
+
+    def full_history(self):
+        """Every sample recorded (requires a spill file)"""
+        if self.spill_path is None:
+            raise ValueError("Full history needs a spill_path")
+        self.flush()
+        return np.fromfile(self.spill_path, dtype=np.float64)
+
+    @property
+    def peak(self):
+        return self.stats.max if self.stats.count else 0.0
+
+    @property
+    def mean(self):
+        return self.stats.mean
+
+    def __len__(self):
+        # NaN samples are buffered too, but kept out of peak and mean
+        return self.stats.count + self.stats.missing
+
+    def __iter__(self):
+        return iter(self.recent())
+
+    def reset(self):
+        """Forget all samples (truncates the spill file)"""
+        self.buffer = np.zeros(0)
+        self.stats.reset()
+        self._position = 0
+        self._unspilled = 0
+        if self.spill_path is not None:
+            open(self.spill_path, 'wb').close()
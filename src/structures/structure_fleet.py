@@ -0,0 +1,309 @@
+"""
+Structure Fleet
+Struct-of-arrays container that evaluates the seismic response of many
+habitats in one vectorized call
+"""
+import numpy as np
+import config
+from src.structures.newmark import NewmarkIntegrator
+
+# Damping ratio (typical for Mars habitat: 2-5%)
+DAMPING_RATIO = config.HABITAT_DAMPING_RATIO
+
+# Safety status by damage level: below 0.1, 0.3, 0.7 and above
+SAFETY_STATUS = np.array(['SAFE', 'MONITOR', 'WARNING', 'CRITICAL'])
+SAFETY_THRESHOLDS = [0.1, 0.3, 0.7]
+
+# Per-structure parameters and state held as arrays
+PARAMETER_FIELDS = ('mass', 'height', 'width', 'strength', 'natural_freq')
+STATE_FIELDS = ('damage_level', 'max_displacement', 'peak_stress')
+
+# Default parameters from the config HABITAT_* values
+DEFAULT_PARAMETERS = {
+    'mass': float(config.HABITAT_MASS),
+    'height': float(config.HABITAT_HEIGHT),
+    'width': float(config.HABITAT_WIDTH),
+    'strength': float(config.HABITAT_MATERIAL_STRENGTH),
+    'natural_freq': float(config.HABITAT_NATURAL_FREQUENCY)
+}
+
+
+def validate_parameters(params):
+    """
+    Check structure parameter overrides
+
+    Args:
+        params: Dictionary of PARAMETER_FIELDS names to values
+
+    Returns:
+        Dictionary of the same names to positive finite floats
+
+    Raises:
+        ValueError: Unknown name or a value that is not positive and finite
+        TypeError: Value that is not a number
+    """
+    unknown = sorted(set(params) - set(PARAMETER_FIELDS))
+    if unknown:
+        raise ValueError("Unknown structure parameter(s) {0}; expected {1}".format(
+            ', '.join(unknown), ', '.join(PARAMETER_FIELDS)))
+
+    validated = {}
+    for name, value in params.items():
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, np.number)):
+            raise TypeError("Structure parameter '{0}' must be a number, got {1!r}".format(
+                name, value))
+        if not np.isfinite(value) or value <= 0:
+            raise ValueError("Structure parameter '{0}' must be positive, got {1}".format(
+                name, value))
+        validated[name] = float(value)
+    return validated
+
+
+def ground_acceleration(wave_amplitude, frequency=1.0):
+    """
+    Ground acceleration in m/s² of harmonic motion with amplitude in mm
+
+    a = (2πf)² * A, with a 1 Hz typical marsquake frequency by default
+    """
+    return (2 * np.pi * frequency)**2 * (np.asarray(wave_amplitude) / 1000)
+
+
+class StructureFleet:
+    def __init__(self, locations, mass=None, height=None, width=None,
+                 strength=None, natural_freq=None):
+        """
+        Initialize a fleet of N habitat-type structures
+
+        Args:
+            locations: (N, 2) grid coordinates
+            mass, height, width, strength, natural_freq: Scalars or length-N
+                arrays (defaults from the config HABITAT_* values)
+        """
+        self.locations = np.atleast_2d(np.asarray(locations, dtype=np.int64))
+        n = len(self.locations)
+
+        values = {'mass': mass, 'height': height, 'width': width,
+                  'strength': strength, 'natural_freq': natural_freq}
+        for name in PARAMETER_FIELDS:
+            value = DEFAULT_PARAMETERS[name] if values[name] is None else values[name]
+            setattr(self, name, np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy())
+
+        for name in STATE_FIELDS:
+            setattr(self, name, np.zeros(n))
+        self.dynamics = None
+
+    def __len__(self):
+        return len(self.locations)
+
+    def reset(self, index=None):
+        """Reset structural health (all structures, or the given rows)"""
+        if index is None:
+            self.dynamics = None
+            index = slice(None)
+        for name in STATE_FIELDS:
+            getattr(self, name)[index] = 0.0
+
+    def amplification_factor(self, index=None):
+        """Dynamic amplification of each structure (capped at 5 for stability)"""
+        index = slice(None) if index is None else index
+        beta = 1.0 / self.natural_freq[index]  # Frequency ratio approximation
+        amp_factor = 1.0 / np.sqrt((1 - beta**2)**2 + (2 * DAMPING_RATIO * beta)**2)
+        return np.minimum(amp_factor, 5.0)
+
+    def calculate_response(self, ground_acceleration, index=None):
+        """
+        Structural response of every structure to ground motion
+
+        Same single-degree-of-freedom model as HabitatModel, evaluated for
+        all rows at once; peak displacement, peak stress and damage are
+        updated in place.
+
+        Args:
+            ground_acceleration: Ground acceleration in m/s², scalar or one
+                value per selected structure
+            index: Optional row selection (default: all)
+
+        Returns:
+            Dictionary of arrays with response parameters
+        """
+        index = slice(None) if index is None else index
+        response = self._elastic_response(ground_acceleration, index)
+
+        self.max_displacement[index] = np.maximum(self.max_displacement[index],
+                                                  np.abs(response['displacement']))
+        self.peak_stress[index] = np.maximum(self.peak_stress[index], response['stress'])
+        self.damage_level[index] = np.minimum(1.0, self.damage_level[index] +
+                                              response.pop('damage_increment'))
+
+        response['damage_level'] = self.damage_level[index]
+        return response
+
+    def accumulate_events(self, ground_acceleration, index=None):
+        """
+        Apply a block of events to every structure in one call
+
+        Equivalent to calling calculate_response once per event in order:
+        peaks take the maximum over the block and damage increments add up
+        (capped at 1).
+
+        Args:
+            ground_acceleration: Ground acceleration in m/s², shape
+                (n_events, n_selected)
+            index: Optional row selection (default: all)
+
+        Returns:
+            Damage level of the selected structures after the block
+        """
+        index = slice(None) if index is None else index
+        response = self._elastic_response(ground_acceleration, index)
+
+        self.max_displacement[index] = np.maximum(self.max_displacement[index],
+                                                  np.abs(response['displacement']).max(axis=0))
+        self.peak_stress[index] = np.maximum(self.peak_stress[index],
+                                             response['stress'].max(axis=0))
+        self.damage_level[index] = np.minimum(1.0, self.damage_level[index] +
+                                              response['damage_increment'].sum(axis=0))
+        return self.damage_level[index]
+
+    def _elastic_response(self, ground_acceleration, index):
+        """
+        Single-degree-of-freedom response (no state update)
+
+        Broadcasts ground acceleration of shape (..., n_selected) against
+        the selected structures.
+        """
+        acceleration = np.asarray(ground_acceleration, dtype=np.float64)
+
+        omega_n = 2 * np.pi * self.natural_freq[index]
+        amp_factor = self.amplification_factor(index)
+
+        # Structural displacement
+        displacement = (acceleration / omega_n**2) * amp_factor
+
+        # Stress = mass * acceleration / square base area
+        force = self.mass[index] * np.abs(acceleration) * amp_factor
+        stress = force / (self.width[index] * self.width[index])
+
+        # Damage grows once stress exceeds 50% of material strength
+        stress_ratio = stress / self.strength[index]
+        increment = np.where(stress_ratio > 0.5, (stress_ratio - 0.5) * 0.1, 0.0)
+
+        return {
+            'displacement': displacement,
+            'stress': stress,
+            'stress_ratio': stress_ratio,
+            'amplification_factor': amp_factor,
+            'damage_increment': increment
+        }
+
+    def evaluate_safety(self, wave_amplitude, index=None):
+        """
+        Evaluate structural safety of every structure
+
+        Args:
+            wave_amplitude: Ground motion amplitude in mm, scalar or one
+                value per selected structure
+            index: Optional row selection (default: all)
+
+        Returns:
+            Dictionary of arrays: status, safety_rating, max_displacement (mm),
+            peak_stress
+        """
+        index = slice(None) if index is None else index
+
+        self.calculate_response(ground_acceleration(wave_amplitude), index)
+
+        damage = self.damage_level[index]
+        return {
+            'status': SAFETY_STATUS[np.digitize(damage, SAFETY_THRESHOLDS)],
+            'safety_rating': 1.0 - damage,
+            'max_displacement': self.max_displacement[index] * 1000,  # Convert to mm
+            'peak_stress': self.peak_stress[index]
+        }
+
+    def start_dynamics(self, dt=config.TIME_STEP, damping_ratio=DAMPING_RATIO):
+        """
+        Attach a Newmark-beta integrator for time-history response
+        
+        After this, step_dynamics() advances every structure by one time
+        step of ground acceleration, e.g. inside the live simulation loop.
+        """
+        self.dynamics = NewmarkIntegrator(self.natural_freq, damping_ratio, dt)
+        return self.dynamics
+
+    def step_dynamics(self, ground_acceleration):
+        """
+        Advance the time-history response of every structure by one step
+
+        Peak displacement and peak stress (mass times absolute acceleration
+        over the base area) are updated in place; damage accrual stays with
+        the event-level calculate_response.
+
+        Args:
+            ground_acceleration: Ground acceleration in m/s², scalar or one
+                value per structure (e.g. sampled from the wave field)
+
+        Returns:
+            Relative displacement of every structure in m
+        """
+        if self.dynamics is None:
+            self.start_dynamics()
+        ground = np.asarray(ground_acceleration, dtype=np.float64)
+        displacement = self.dynamics.step(ground)
+
+        np.maximum(self.max_displacement, np.abs(displacement), out=self.max_displacement)
+        stress = self.mass * np.abs(self.dynamics.acceleration + ground) / self.width**2
+        np.maximum(self.peak_stress, stress, out=self.peak_stress)
+        return displacement
+
+    def time_history_response(self, record, dt=config.TIME_STEP, damping_ratio=DAMPING_RATIO):
+        """
+        Integrate a whole acceleration record for every structure
+
+        Args:
+            record: Ground acceleration in m/s², shape (T,) shared by all
+                structures or (T, N) with one station record per structure
+            dt: Sample spacing in seconds
+            damping_ratio: Scalar or per-structure damping ratio
+
+        Returns:
+            Dictionary of arrays: peak_displacement (m), peak_stress (Pa)
+        """
+        self.start_dynamics(dt, damping_ratio)
+        for ground in np.asarray(record, dtype=np.float64):
+            self.step_dynamics(ground)
+        return {
+            'peak_displacement': self.dynamics.peak_displacement.copy(),
+            'peak_stress': self.mass * self.dynamics.peak_total_acceleration / self.width**2
+        }
+
+    def view(self, index):
+        """HabitatModel backed by one row of this fleet"""
+        from src.structures.habitat_model import HabitatModel
+        return HabitatModel.from_fleet(self, index)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("Testing Structure Fleet...\n")
+
+    # 10,000 candidate placements on a 100x100 grid
+    rows, cols = np.mgrid[0:100, 0:100]
+    fleet = StructureFleet(np.column_stack([rows.ravel(), cols.ravel()]))
+
+    # Ground motion decaying away from an epicenter at the grid center
+    distance = np.hypot(rows.ravel() - 50, cols.ravel() - 50) + 1
+    amplitude = 2000.0 / distance  # mm
+
+    start = time.time()
+    for step in range(10):
+        safety = fleet.evaluate_safety(amplitude)
+    print("Evaluated {0} structures x 10 steps in {1:.1f} ms".format(
+        len(fleet), (time.time() - start) * 1000))
+
+    print("Max displacement: {0:.2f} - {1:.2f} mm".format(
+        safety['max_displacement'].min(), safety['max_displacement'].max()))
+    statuses, counts = np.unique(safety['status'], return_counts=True)
+    for status, count in zip(statuses, counts):
+        print("{0:>9}: {1}".format(status, count))
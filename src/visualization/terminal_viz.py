@@ -115,12 +115,14 @@ class TerminalVisualizer:
 
 
 if __name__ == "__main__":
+    from src.random_streams import make_rng
+
     print("Testing Terminal Visualizer...\n")
     
     viz = TerminalVisualizer()
     
     # Test wave field visualization
-    test_field = np.random.randn(50, 50) * 10
+    test_field = make_rng(42).standard_normal((50, 50)) * 10
     viz.visualize_wave_field(test_field, "Test Wave Field")
     
     # Test progress bar
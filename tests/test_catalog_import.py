@@ -0,0 +1,82 @@
+"""
+Tests for external catalog import and its content-hash cache
+"""
+import os
+import numpy as np
+import pandas as pd
+import config
+from src.data_pipeline import catalog_import
+from src.data_pipeline.catalog_import import import_catalog
+
+CSV = """# external catalog
+Time,Mag,Lat,Lon,Depth,Class
+2030-01-01T00:00:00Z,3.1,10.5,-20.0,12.0,major
+2030-01-01T01:00:00Z,,11.0,-21.0,5.0,minor
+2030-01-01T02:00:00Z,1.2,12.0,-22.0,,bogus
+2030-01-01T03:00:00Z,3.5,13.0,-23.0,30.0,
+"""
+
+
+def write_source(tmp_path, text=CSV, name='catalog.csv'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_import_normalizes_rows(tmp_path):
+    store = import_catalog(write_source(tmp_path), cache_dir=str(tmp_path / 'cache'))
+    catalog = store.load()
+
+    # The row without a magnitude is dropped; a missing depth stays NaN
+    # (values are stored as float32)
+    np.testing.assert_allclose(catalog['magnitude'], [3.1, 1.2, 3.5], rtol=1e-6)
+    np.testing.assert_array_equal(catalog['depth_km'], [12.0, np.nan, 30.0])
+    assert list(catalog['timestamp']) == list(pd.to_datetime(
+        ['2030-01-01 00:00', '2030-01-01 02:00', '2030-01-01 03:00']))
+    assert (catalog['p_wave_velocity'] == config.P_WAVE_VELOCITY).all()
+    # Unknown and missing labels fall back to the magnitude-derived type
+    assert list(catalog['type']) == ['major', 'minor', 'moderate']
+
+
+def test_whitespace_text_catalog(tmp_path):
+    text = "time mag lat lon\n2030-01-01T00:00:00 2.5 1.0 2.0\n"
+    store = import_catalog(write_source(tmp_path, text, 'catalog.txt'),
+                           cache_dir=str(tmp_path / 'cache'))
+    assert len(store) == 1 and store.load()['magnitude'][0] == 2.5
+
+
+def test_cache_is_keyed_by_content_and_options(tmp_path):
+    source = write_source(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+
+    first = import_catalog(source, cache_dir=cache_dir)
+    assert import_catalog(source, cache_dir=cache_dir).path == first.path
+    assert import_catalog(source, cache_dir=cache_dir, chunk_rows=2).path != first.path
+
+    # Same file with a different separator must not reuse the comma parse
+    semicolon = write_source(tmp_path, CSV.replace(',', ';'), 'semicolon.csv')
+    store = import_catalog(semicolon, cache_dir=cache_dir, sep=';')
+    assert store.path != first.path
+    np.testing.assert_allclose(store.load()['magnitude'], [3.1, 1.2, 3.5], rtol=1e-6)
+
+
+def test_unchanged_file_is_not_rehashed(tmp_path, monkeypatch):
+    source = write_source(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    import_catalog(source, cache_dir=cache_dir)
+
+    hashed = []
+    original = catalog_import.file_digest
+    monkeypatch.setattr(catalog_import, 'file_digest',
+                        lambda path: hashed.append(path) or original(path))
+    first = import_catalog(source, cache_dir=cache_dir)
+    assert hashed == []
+
+    # Rewritten content changes the size and mtime, so it is hashed again
+    stat = os.stat(source)
+    write_source(tmp_path, CSV.replace('3.1', '3.4'))
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    second = import_catalog(source, cache_dir=cache_dir)
+    assert hashed == [source]
+    assert second.path != first.path
+    assert np.isclose(second.load()['magnitude'][0], 3.4)
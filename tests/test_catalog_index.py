@@ -0,0 +1,59 @@
+"""
+Tests for CatalogIndex queries against a brute-force scan of the catalog
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_pipeline.catalog_index import CatalogIndex
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return MarsquakeGenerator(seed=9).generate_catalog(20000, days_span=365,
+                                                       start_date='2030-01-01')
+
+
+def brute_force(catalog, start=None, end=None, lat_min=-90, lat_max=90,
+                lon_min=-180, lon_max=180, min_magnitude=None, max_magnitude=None):
+    """Row positions of matching events, in time order"""
+    keep = ((catalog['latitude'] >= lat_min) & (catalog['latitude'] <= lat_max) &
+            (catalog['longitude'] >= lon_min) & (catalog['longitude'] <= lon_max))
+    if start is not None:
+        keep &= catalog['timestamp'] >= pd.Timestamp(start)
+    if end is not None:
+        keep &= catalog['timestamp'] < pd.Timestamp(end)
+    if min_magnitude is not None:
+        keep &= catalog['magnitude'] >= min_magnitude
+    if max_magnitude is not None:
+        keep &= catalog['magnitude'] <= max_magnitude
+
+    rows = np.flatnonzero(keep.values)
+    return rows[np.argsort(catalog['timestamp'].values[rows], kind='stable')]
+
+
+@pytest.mark.parametrize('query', [
+    {},
+    {'start': '2030-03-01', 'end': '2030-06-15'},
+    {'lat_min': -12.5, 'lat_max': 33.0, 'lon_min': 100.0, 'lon_max': 171.3},
+    {'start': '2030-02-10', 'end': '2030-11-01', 'lat_min': -60.0, 'lat_max': -5.0,
+     'lon_min': -179.0, 'lon_max': -90.0, 'min_magnitude': 2.5},
+    {'lat_min': 10.0, 'lat_max': 10.0, 'lon_min': 10.0, 'lon_max': 10.0},
+    {'end': '2029-01-01'},
+    {'min_magnitude': 3.0, 'max_magnitude': 3.5},
+])
+def test_query_matches_brute_force(catalog, query):
+    index = CatalogIndex.from_catalog(catalog)
+    np.testing.assert_array_equal(index.query(**query), brute_force(catalog, **query))
+
+
+def test_magnitude_counts_match_brute_force(catalog):
+    index = CatalogIndex.from_catalog(catalog)
+    window = (catalog['timestamp'] >= pd.Timestamp('2030-04-01')) & \
+        (catalog['timestamp'] < pd.Timestamp('2030-09-01'))
+    magnitude = catalog['magnitude'][window].values
+
+    edges = np.floor(magnitude / index.magnitude_step) * index.magnitude_step
+    expected = {round(float(edge), 6): int(count)
+                for edge, count in zip(*np.unique(edges, return_counts=True))}
+    assert index.magnitude_counts('2030-04-01', '2030-09-01') == expected
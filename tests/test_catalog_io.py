@@ -0,0 +1,85 @@
+"""
+Tests for streamed catalog generation and the on-disk catalog formats
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.data_pipeline.catalog_io import CATALOG_SCHEMA, CatalogStore, save_catalog
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+START = '2030-01-01'
+
+
+def streamed(num_events, chunk_size, seed=6):
+    generator = MarsquakeGenerator(seed=seed)
+    return pd.concat(generator.iter_catalog(num_events, days_span=50, chunk_size=chunk_size,
+                                            start_date=START), ignore_index=True)
+
+
+def test_streamed_times_are_sorted_uniform_order_statistics():
+    catalog = streamed(20000, chunk_size=3000)
+    assert len(catalog) == 20000
+    assert catalog['timestamp'].is_monotonic_increasing
+
+    days = (catalog['timestamp'] - pd.Timestamp(START)).dt.total_seconds().values / 86400
+    assert days.min() >= 0 and days.max() <= 50
+    assert stats.kstest(days / 50, 'uniform').pvalue > 1e-3
+
+
+def test_stream_to_file_writes_every_chunk(tmp_path):
+    expected = streamed(2500, chunk_size=700)
+
+    csv_path = str(tmp_path / 'catalog.csv')
+    assert MarsquakeGenerator(seed=6).stream_to_file(csv_path, 2500, days_span=50,
+                                                     chunk_size=700, start_date=START) == 2500
+    csv = pd.read_csv(csv_path, parse_dates=['timestamp'])
+    np.testing.assert_allclose(csv['magnitude'], expected['magnitude'])
+    assert list(csv['type']) == list(expected['type'])
+
+    columnar_path = str(tmp_path / 'columnar')
+    MarsquakeGenerator(seed=6).stream_to_file(columnar_path, 2500, days_span=50,
+                                              chunk_size=700, start_date=START)
+    loaded = CatalogStore(columnar_path).load()
+    np.testing.assert_array_equal(loaded['timestamp'].values, expected['timestamp'].values)
+    np.testing.assert_array_equal(loaded['latitude'], expected['latitude'])
+
+
+def test_columnar_round_trip(tmp_path):
+    catalog = MarsquakeGenerator(seed=8).generate_catalog(1234, start_date=START)
+    path = str(tmp_path / 'columnar')
+    assert save_catalog(catalog, path, chunk_size=500) == 1234
+
+    loaded = CatalogStore(path).load()
+    assert list(loaded.columns) == list(CATALOG_SCHEMA)
+    for name, dtype in CATALOG_SCHEMA.items():
+        if name == 'type':
+            assert list(loaded[name]) == list(catalog[name])
+        else:
+            np.testing.assert_array_equal(loaded[name].values,
+                                          catalog[name].values.astype(dtype), err_msg=name)
+
+
+def test_columnar_loads_selected_columns_and_rows(tmp_path):
+    catalog = MarsquakeGenerator(seed=8).generate_catalog(1000, start_date=START)
+    path = str(tmp_path / 'columnar')
+    save_catalog(catalog, path)
+
+    store = CatalogStore(path)
+    part = store.load(columns=['magnitude', 'type'], start=100, stop=250)
+    assert list(part.columns) == ['magnitude', 'type']
+    np.testing.assert_array_equal(part['magnitude'],
+                                  catalog['magnitude'].values[100:250].astype(np.float32))
+    assert list(part['type']) == list(catalog['type'][100:250])
+    # Only the requested columns were mapped
+    assert set(store._maps) == {'magnitude', 'type'}
+    with pytest.raises(KeyError):
+        store.column('missing')
+
+
+def test_empty_columnar_catalog(tmp_path):
+    catalog = MarsquakeGenerator(seed=8).generate_catalog(0, start_date=START)
+    path = str(tmp_path / 'empty')
+    save_catalog(catalog, path)
+    store = CatalogStore(path)
+    assert len(store) == 0 and len(store.load()) == 0
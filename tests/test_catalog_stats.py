@@ -0,0 +1,73 @@
+"""
+Tests for running catalog statistics against batch computations
+"""
+import numpy as np
+import pandas as pd
+from src.data_pipeline.catalog_stats import CatalogSummary, RunningStats
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+
+def test_chunked_and_merged_stats_equal_batch():
+    values = np.random.default_rng(1).normal(1e6, 3.0, 10001)
+
+    chunked = RunningStats()
+    for chunk in np.array_split(values, 17):
+        chunked.update(chunk)
+    single = RunningStats()
+    for value in values[:50]:
+        single.update([value])
+
+    left, right = RunningStats(), RunningStats()
+    left.update(values[:3000])
+    right.update(values[3000:])
+    left.merge(right)
+
+    for stats in (chunked, left):
+        assert stats.count == len(values)
+        assert np.isclose(stats.mean, values.mean(), rtol=1e-15)
+        assert np.isclose(stats.variance, values.var(ddof=1), rtol=1e-9)
+        assert (stats.min, stats.max) == (values.min(), values.max())
+    assert np.isclose(single.variance, values[:50].var(ddof=1), rtol=1e-9)
+
+
+def test_nan_values_are_counted_as_missing():
+    stats = RunningStats()
+    stats.update([1.0, np.nan, 3.0])
+    other = RunningStats()
+    other.update([np.nan, np.nan])
+    stats.merge(other)
+    assert stats.to_dict() == {'count': 2, 'missing': 3, 'min': 1.0, 'max': 3.0,
+                               'mean': 2.0, 'std': float(np.sqrt(2.0))}
+
+
+def test_summary_matches_catalog():
+    generator = MarsquakeGenerator(seed=5)
+    catalog = generator.generate_catalog(3000)
+    generator.generate_event(quake_type='major')
+    catalog = generator.catalog
+
+    summary = generator.summary.to_dict()
+    assert summary['total_events'] == 3001
+    assert summary['type_counts'] == catalog['type'].value_counts().to_dict()
+    assert np.isclose(summary['magnitude']['mean'], catalog['magnitude'].mean())
+    assert np.isclose(summary['depth_km']['std'], catalog['depth_km'].std())
+
+
+def test_summary_merge_equals_combined_catalog():
+    first = MarsquakeGenerator(seed=6).generate_catalog(500)
+    second = MarsquakeGenerator(seed=7).generate_catalog(800)
+    left, right, combined = CatalogSummary(), CatalogSummary(), CatalogSummary()
+    left.add_catalog(first)
+    right.add_catalog(second)
+    left.merge(right)
+    combined.add_catalog(pd.concat([first, second], ignore_index=True))
+    assert left.to_dict()['type_counts'] == combined.to_dict()['type_counts']
+    assert np.isclose(left.magnitude.variance, combined.magnitude.variance)
+
+
+def test_streaming_replaces_current_events():
+    generator = MarsquakeGenerator(seed=8)
+    generator.generate_catalog(100)
+    streamed = sum(len(chunk) for chunk in generator.iter_catalog(250, chunk_size=100))
+    assert generator.catalog is None and generator.events == []
+    assert generator.summary.count == streamed == 250
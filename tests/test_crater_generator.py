@@ -0,0 +1,50 @@
+"""
+Tests for the crater field generator against brute-force evaluation
+"""
+import numpy as np
+import config
+from src.data_pipeline.crater_generator import CraterGenerator
+from src.data_pipeline.terrain_generator import TerrainGenerator
+
+
+def test_diameters_within_bounds():
+    craters = CraterGenerator((50, 60), seed=1).sample_craters(
+        5000, min_diameter=20.0, max_diameter=400.0)
+    assert craters['diameter'].min() >= 20.0 and craters['diameter'].max() <= 400.0
+    assert craters['x'].max() < 50 and craters['y'].max() < 60
+
+
+def test_craters_near_matches_brute_force():
+    generator = CraterGenerator((80, 70), seed=2)
+    craters = generator.sample_craters(3000)
+    for x, y, radius in [(10.0, 10.0, 6.0), (79.0, 0.5, 15.0), (40.0, 35.0, 0.0),
+                         (-5.0, 20.0, 12.0)]:
+        distance_sq = (craters['x'] - x)**2 + (craters['y'] - y)**2
+        expected = np.flatnonzero(distance_sq <= radius**2)
+        np.testing.assert_array_equal(np.sort(generator.craters_near(x, y, radius)), expected)
+
+
+def test_stamp_matches_per_crater_sum():
+    generator = CraterGenerator((40, 45), resolution=10, seed=3)
+    craters = generator.sample_craters(60, min_diameter=15.0, max_diameter=600.0)
+    stamped = generator.stamp(np.zeros((40, 45)))
+
+    rows, cols = np.indices((40, 45))
+    expected = np.zeros((40, 45))
+    for x, y, diameter in zip(craters['x'], craters['y'], craters['diameter']):
+        radius = diameter / 2 / generator.resolution
+        r = np.hypot(rows - x, cols - y) / radius
+        reach = r < config.CRATER_EJECTA_EXTENT
+        expected[reach] += generator.crater_profile(r[reach], diameter)
+    np.testing.assert_allclose(stamped, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_crater_fields_draw_new_populations():
+    first = TerrainGenerator(size=32, seed=8)
+    one = first.add_crater_field(20)
+    two = first.add_crater_field(20)
+    assert not np.array_equal(one['x'], two['x'])
+
+    # Only the first field reproduces the seed
+    again = TerrainGenerator(size=32, seed=8).add_crater_field(20)
+    np.testing.assert_array_equal(one['x'], again['x'])
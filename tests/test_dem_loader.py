@@ -0,0 +1,49 @@
+"""
+Tests for windowed DEM ingestion against processing the whole raster
+"""
+import numpy as np
+import pytest
+import config
+from src.data_pipeline.dem_loader import DEMTerrain
+from src.data_pipeline.terrain_generator import TerrainGenerator
+
+
+@pytest.fixture
+def dem(tmp_path):
+    """Non-square raster reaching below the datum"""
+    raster = np.random.default_rng(4).normal(-200.0, 150.0, (70, 53))
+    path = tmp_path / 'dem.npy'
+    np.save(path, raster)
+    return DEMTerrain(str(path)), raster
+
+
+def test_elevation_range_skips_nodata(tmp_path):
+    raster = np.array([[-5.0, 2.0], [np.nan, -9999.0]], dtype=np.float32)
+    path = tmp_path / 'small.npy'
+    np.save(path, raster)
+    dem = DEMTerrain(str(path), nodata=-9999.0)
+    assert dem.elevation_range() == (-5.0, 2.0)
+    np.testing.assert_array_equal(dem.read_window(0, 0, 2, 2), [[-5.0, 2.0], [-5.0, -5.0]])
+
+
+@pytest.mark.parametrize('name', ['rigidity', 'density', 'slope', 'roughness',
+                                  'curvature', 'site_amplification'])
+def test_tiled_layers_match_full_raster(dem, name):
+    dem, raster = dem
+    full = TerrainGenerator.from_array(raster, dem.resolution,
+                                       elevation_range=dem.elevation_range())
+    expected = full.calculate_soil_properties()[name]
+
+    tiled = dem.map_windows(lambda terrain_gen: terrain_gen.properties[name], size=16)
+    assert tiled.shape == (70, 53)
+    np.testing.assert_allclose(tiled, expected, rtol=1e-6, atol=1e-9)
+
+
+def test_soil_properties_within_reference_bounds(dem):
+    # Rigidity spans 0.8 - 1.2 x SOIL_RIGIDITY over the global range, even
+    # for windows lying entirely below the datum
+    dem, _ = dem
+    rigidity = dem.window(10, 5, 20, 30).properties['rigidity']
+    assert rigidity.shape == (20, 30)
+    assert rigidity.min() >= 0.8 * config.SOIL_RIGIDITY * (1 - 1e-12)
+    assert rigidity.max() <= 1.2 * config.SOIL_RIGIDITY * (1 + 1e-12)
@@ -0,0 +1,55 @@
+"""
+Tests for the ETAS aftershock model
+"""
+import numpy as np
+import pytest
+from scipy import stats
+from src.data_pipeline.etas import ETASModel
+from src.random_streams import make_rng
+
+
+def parents(model, rng, count):
+    return {
+        'day_offset': np.zeros(count),
+        'magnitude': model._magnitudes(rng, count),
+        'latitude': rng.uniform(-60, 60, count),
+        'longitude': rng.uniform(-180, 180, count),
+        'depth_km': rng.uniform(10, 50, count)
+    }
+
+
+def test_offspring_count_matches_branching_ratio():
+    model = ETASModel(productivity=0.3, alpha=0.6)
+    rng = make_rng(1)
+    children = model._offspring(rng, parents(model, rng, 400000), 0)
+
+    counts = np.bincount(children['parent'], minlength=400000)
+    # Standard error of the mean count is well below 1%
+    assert np.isclose(counts.mean(), model.branching_ratio(), rtol=0.02)
+
+
+def test_omori_delays_follow_modified_omori_law():
+    model = ETASModel(productivity=0.5, alpha=0.0, omori_c=0.02, omori_p=1.3)
+    rng = make_rng(2)
+    children = model._offspring(rng, parents(model, rng, 50000), 0)
+
+    c, p = model.omori_c, model.omori_p
+    assert stats.kstest(children['day_offset'],
+                        lambda t: 1 - (1 + t / c) ** (1 - p)).pvalue > 1e-3
+
+
+def test_triggered_events_follow_their_parents():
+    columns = ETASModel(background_rate=5).simulate(make_rng(3), days_span=3650)
+    assert np.all(np.diff(columns['day_offset']) >= 0)
+    triggered = np.flatnonzero(columns['parent'] >= 0)
+    assert len(triggered)
+    assert np.all(columns['parent'][triggered] < triggered)
+    assert np.all(columns['day_offset'][columns['parent'][triggered]] <=
+                  columns['day_offset'][triggered])
+
+
+def test_supercritical_parameters_rejected():
+    with pytest.raises(ValueError):
+        ETASModel(productivity=2.0)
+    with pytest.raises(ValueError):
+        ETASModel(productivity=0.3, alpha=1.5, max_magnitude=8.0)
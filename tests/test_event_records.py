@@ -0,0 +1,53 @@
+"""
+Tests for slotted event records and the packed event dtype
+"""
+import numpy as np
+import pytest
+from src.data_pipeline.event_records import (EVENT_DTYPE, EVENT_FIELDS, MarsquakeEvent,
+                                             event_records)
+from src.data_pipeline.magnitude_model import MAGNITUDE_TYPES
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+
+@pytest.fixture
+def catalog():
+    return MarsquakeGenerator(seed=21).generate_catalog(500, start_date='2030-01-01')
+
+
+def test_records_round_trip_catalog(catalog):
+    records = event_records(catalog)
+    assert records.dtype == EVENT_DTYPE and EVENT_DTYPE.itemsize == 41
+    np.testing.assert_array_equal(records['timestamp'], catalog['timestamp'].values)
+    np.testing.assert_array_equal(records['latitude'], catalog['latitude'])
+    np.testing.assert_array_equal(records['magnitude'],
+                                  catalog['magnitude'].astype(np.float32))
+    assert [MAGNITUDE_TYPES[code] for code in records['type']] == list(catalog['type'])
+
+
+def test_event_list_packs_like_dataframe(catalog):
+    events = MarsquakeEvent.from_catalog(catalog)
+    np.testing.assert_array_equal(event_records(events), event_records(catalog))
+    as_dicts = [dict(event) for event in events]
+    np.testing.assert_array_equal(event_records(as_dicts), event_records(catalog))
+
+
+def test_marsquake_event_behaves_like_a_dict(catalog):
+    event = MarsquakeEvent.from_catalog(catalog.iloc[:1])[0]
+    assert not hasattr(event, '__dict__')
+    assert dict(event) == event.to_dict() == catalog.iloc[0].to_dict()
+    assert event['magnitude'] == event.magnitude
+    assert list(event.keys()) == list(EVENT_FIELDS)
+    with pytest.raises(KeyError):
+        event['__class__']
+    with pytest.raises(AttributeError):
+        event.extra = 1
+
+
+def test_generator_records_cover_single_events():
+    generator = MarsquakeGenerator(seed=22)
+    events = [generator.generate_event(quake_type='moderate') for _ in range(5)]
+    records = generator.event_records()
+    assert len(records) == 5
+    np.testing.assert_array_equal(records['magnitude'],
+                                  np.float32([event['magnitude'] for event in events]))
+    assert set(records['type']) == {MAGNITUDE_TYPES.index('moderate')}
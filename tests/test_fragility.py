@@ -0,0 +1,42 @@
+"""
+Tests for Monte Carlo fragility curves
+"""
+import numpy as np
+import config
+from src.structures.fragility import DAMAGE_STATES, default_intensities, fragility_curves
+from src.structures.structure_fleet import SAFETY_THRESHOLDS, StructureFleet
+
+
+def test_curves_independent_of_workers():
+    serial = fragility_curves(3000, workers=1, chunk_samples=700, seed=5)
+    parallel = fragility_curves(3000, workers=2, chunk_samples=700, seed=5)
+    np.testing.assert_array_equal(serial['probability'], parallel['probability'])
+    assert serial['lognormal_fit'] == parallel['lognormal_fit']
+
+
+def test_states_and_fit_keys_are_plain_strings():
+    curves = fragility_curves(200, seed=1)
+    assert curves['states'] == ['MONITOR', 'WARNING', 'CRITICAL']
+    assert all(type(state) is str for state in curves['states'] + DAMAGE_STATES)
+    assert all(type(state) is str for state in curves['lognormal_fit'])
+
+
+def test_exceedance_is_monotonic():
+    probability = fragility_curves(2000, seed=2)['probability']
+    assert (np.diff(probability, axis=0) >= 0).all()  # More shaking, more damage
+    assert (np.diff(probability, axis=1) <= 0).all()  # Worse states are rarer
+    assert probability[0].max() == 0 and probability[-1].min() == 1
+
+
+def test_nominal_habitat_gives_step_curves(monkeypatch):
+    # Without parameter scatter every realization is the nominal habitat,
+    # so each state is exceeded exactly above its deterministic capacity
+    for name in ('FRAGILITY_MASS_COV', 'FRAGILITY_STRENGTH_COV', 'FRAGILITY_FREQUENCY_COV'):
+        monkeypatch.setattr(config, name, 0.0)
+    intensities = default_intensities()
+    curves = fragility_curves(50, intensities=intensities, seed=3)
+
+    damage = np.array([StructureFleet([(0, 0)]).calculate_response(a)['damage_level'][0]
+                       for a in intensities])
+    expected = damage[:, None] >= np.array(SAFETY_THRESHOLDS)[None, :]
+    np.testing.assert_array_equal(curves['probability'], expected)
@@ -0,0 +1,62 @@
+"""
+Tests for great-circle distances, grid georeferencing and catalog screening
+"""
+import numpy as np
+import config
+from src.physics.geodesy import grid_coordinates, haversine_distance
+from src.physics.wave_propagation import peak_amplitude, screen_catalog
+
+
+def test_haversine_known_distances():
+    quarter = np.pi * config.MARS_RADIUS / 2
+    np.testing.assert_allclose(haversine_distance(0, 0, 90, 0), quarter)
+    np.testing.assert_allclose(haversine_distance(0, 0, 0, 90), quarter)
+    np.testing.assert_allclose(haversine_distance(10, 20, -10, -160), 2 * quarter)
+    np.testing.assert_allclose(haversine_distance(0, 179.5, 0, -179.5),
+                               np.radians(1) * config.MARS_RADIUS)
+    assert haversine_distance(33.3, -71.0, 33.3, -71.0) == 0
+
+
+def test_haversine_is_symmetric_and_broadcasts():
+    rng = np.random.default_rng(2)
+    lat = rng.uniform(-90, 90, 200)
+    lon = rng.uniform(-180, 180, 200)
+
+    pairwise = haversine_distance(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    np.testing.assert_allclose(pairwise, pairwise.T, atol=1e-9)
+    np.testing.assert_allclose(pairwise[17], haversine_distance(lat[17], lon[17], lat, lon))
+    assert pairwise.max() <= np.pi * config.MARS_RADIUS
+
+
+def test_grid_cells_are_one_resolution_apart():
+    latitude, longitude = grid_coordinates((20.0, 179.99), (30, 40), resolution=100)
+
+    # Neighbours along a row and a column, including across the antimeridian
+    east = haversine_distance(latitude[:, :-1], longitude[:, :-1],
+                              latitude[:, 1:], longitude[:, 1:]) * 1000
+    south = haversine_distance(latitude[:-1], longitude[:-1],
+                               latitude[1:], longitude[1:]) * 1000
+    np.testing.assert_allclose(east, 100, rtol=1e-6)
+    np.testing.assert_allclose(south, 100, rtol=1e-6)
+    assert longitude.min() >= -180 and longitude.max() < 180
+    assert (latitude[0, 0], longitude[0, 0]) == (20.0, 179.99)
+
+
+def test_screen_catalog_matches_per_event_loop():
+    rng = np.random.default_rng(4)
+    catalog = {'latitude': rng.uniform(-30, 30, 500),
+               'longitude': rng.uniform(-60, 60, 500),
+               'magnitude': rng.uniform(2, 5, 500)}
+    site = (4.5, 135.6)
+
+    amplitudes = [peak_amplitude(m, haversine_distance(lat, lon, *site) * 1000)
+                  for lat, lon, m in zip(catalog['latitude'], catalog['longitude'],
+                                         catalog['magnitude'])]
+    threshold = np.median(amplitudes)
+    expected = sorted((i for i, a in enumerate(amplitudes) if a >= threshold),
+                      key=lambda i: -amplitudes[i])
+
+    indices, distance_km, amplitude = screen_catalog(catalog, *site, min_amplitude=threshold)
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_allclose(amplitude, np.array(amplitudes)[expected])
+    assert np.all(np.diff(amplitude) <= 0)
@@ -0,0 +1,67 @@
+"""
+Tests for standalone habitats and habitats viewing a StructureFleet row
+"""
+import numpy as np
+import pytest
+import config
+from src.structures.habitat_model import HabitatModel
+from src.structures.structure_fleet import DEFAULT_PARAMETERS, StructureFleet
+
+PARAMS = {'mass': 3000.0, 'width': 4.0, 'strength': 150.0, 'natural_freq': 3.5}
+
+
+def test_standalone_habitat_matches_fleet_view():
+    fleet = StructureFleet([(0, 0), (4, 7), (9, 9)], **PARAMS)
+    view = fleet.view(1)
+    standalone = HabitatModel((4, 7), PARAMS)
+
+    for amplitude in (5.0, 40.0, 12.0, 90.0):
+        expected = standalone.evaluate_safety(amplitude)
+        assert view.evaluate_safety(amplitude) == expected
+    assert expected['status'] != 'SAFE'
+    assert view.location == standalone.location == (4, 7)
+    assert view.get_summary() == standalone.get_summary()
+
+    # The view writes through to its row only
+    assert fleet.damage_level[1] == view.damage_level > 0
+    assert fleet.damage_level[0] == fleet.damage_level[2] == 0
+
+
+def test_defaults_and_validated_overrides():
+    habitat = HabitatModel((1, 2))
+    for name, value in DEFAULT_PARAMETERS.items():
+        assert getattr(habitat, name) == value
+    assert habitat.mass == config.HABITAT_MASS
+    assert StructureFleet([(0, 0)]).strength[0] == DEFAULT_PARAMETERS['strength']
+
+    with pytest.raises(ValueError):
+        HabitatModel((0, 0), {'colour': 'red'})
+    with pytest.raises(ValueError):
+        HabitatModel((0, 0), {'mass': 0})
+
+
+def test_habitats_have_no_instance_dict():
+    habitat = HabitatModel((0, 0))
+    assert not hasattr(habitat, '__dict__')
+    with pytest.raises(AttributeError):
+        habitat.colour = 'red'
+
+
+def test_reset_clears_state_and_stress_history():
+    fleet = StructureFleet([(0, 0), (1, 1)], **PARAMS)
+    for habitat in (HabitatModel((0, 0), PARAMS), fleet.view(0)):
+        habitat.evaluate_safety(60.0)
+        assert len(habitat.stress_history) == 1
+        habitat.reset()
+        assert (habitat.damage_level, habitat.max_displacement, habitat.peak_stress) == \
+            (0.0, 0.0, 0.0)
+        assert len(habitat.stress_history) == 0
+        assert habitat.evaluate_safety(0.0)['peak_stress'] == 0.0
+
+
+def test_stress_spill_keeps_every_response(tmp_path):
+    habitat = HabitatModel((0, 0), PARAMS, stress_spill_path=str(tmp_path / 'stress.bin'))
+    stresses = [habitat.calculate_response(a)['stress']
+                for a in np.linspace(0.1, 3.0, config.STRESS_HISTORY_CAPACITY + 10)]
+    np.testing.assert_array_equal(habitat.stress_history.full_history(), stresses)
+    assert habitat.evaluate_safety(0.0)['peak_stress'] == max(stresses)
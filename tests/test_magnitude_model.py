@@ -0,0 +1,39 @@
+"""
+Tests for truncated Gutenberg-Richter sampling and magnitude types
+"""
+import numpy as np
+from scipy import stats
+from src.data_pipeline.magnitude_model import (magnitude_range, magnitude_type_codes,
+                                               sample_gr_magnitudes)
+from src.random_streams import make_rng
+
+
+def test_samples_stay_within_truncation_bounds():
+    magnitude = sample_gr_magnitudes(make_rng(1), 200000, 2.5, 3.5, b_value=1.2)
+    assert magnitude.min() >= 2.5 and magnitude.max() <= 3.5
+    low, high = magnitude_range()
+    default = sample_gr_magnitudes(make_rng(1), 1000)
+    assert default.min() >= low and default.max() <= high
+    assert isinstance(sample_gr_magnitudes(make_rng(1)), float)
+
+
+def test_b_value_recovered_by_maximum_likelihood():
+    # Truncation far above the minimum: the Aki estimator applies
+    magnitude = sample_gr_magnitudes(make_rng(2), 400000, 2.0, 14.0, b_value=0.8)
+    b_estimate = np.log10(np.e) / (magnitude.mean() - 2.0)
+    assert np.isclose(b_estimate, 0.8, rtol=0.01)
+
+
+def test_samples_follow_truncated_cdf():
+    b, low, high = 0.5, 2.0, 5.0
+    magnitude = sample_gr_magnitudes(make_rng(3), 50000, low, high, b_value=b)
+
+    def cdf(m):
+        return (1 - 10.0 ** (-b * (m - low))) / (1 - 10.0 ** (-b * (high - low)))
+
+    assert stats.kstest(magnitude, cdf).pvalue > 1e-3
+
+
+def test_type_codes_at_boundaries_and_nan():
+    codes = magnitude_type_codes([2.0, 2.99, 3.0, 3.99, 4.0, 5.0, np.nan])
+    np.testing.assert_array_equal(codes, [0, 0, 1, 1, 2, 2, -1])
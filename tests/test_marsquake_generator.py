@@ -0,0 +1,52 @@
+"""
+Tests for columnar catalog generation and event appends in MarsquakeGenerator
+"""
+import numpy as np
+import pandas as pd
+from src.data_pipeline.magnitude_model import MAGNITUDE_TYPES, magnitude_type_codes
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+
+
+def test_catalog_is_sorted_and_typed_by_magnitude():
+    catalog = MarsquakeGenerator(seed=1).generate_catalog(5000, days_span=100,
+                                                          start_date='2030-01-01')
+    assert len(catalog) == 5000
+    assert catalog['timestamp'].is_monotonic_increasing
+    assert catalog['timestamp'].min() >= pd.Timestamp('2030-01-01')
+    assert catalog['timestamp'].max() <= pd.Timestamp('2030-04-11')
+    np.testing.assert_array_equal(catalog['type'].cat.codes,
+                                  magnitude_type_codes(catalog['magnitude'].values))
+
+
+def test_generate_event_appends_catalog_rows():
+    generator = MarsquakeGenerator(seed=2)
+    generator.generate_catalog(100, days_span=10)
+    events = [generator.generate_event(quake_type=quake_type)
+              for quake_type in ('minor', 'major', 'moderate')]
+
+    catalog = generator.catalog
+    assert len(catalog) == 103
+    assert list(catalog['type'].cat.categories) == list(MAGNITUDE_TYPES)
+    np.testing.assert_array_equal(catalog['magnitude'].values[-3:],
+                                  [event.magnitude for event in events])
+    assert list(catalog['type'].values[-3:]) == ['minor', 'major', 'moderate']
+    assert generator.summary.count == 103
+
+    # Appends after a read extend the joined catalog
+    generator.generate_event()
+    assert len(generator.catalog) == 104
+
+
+def test_generate_event_marks_etas_rows_as_background():
+    generator = MarsquakeGenerator(seed=3)
+    catalog = generator.generate_etas_catalog(days_span=365)
+    generator.generate_event()
+    assert generator.catalog['parent'].iloc[-1] == -1
+    assert generator.catalog['parent'].dtype == catalog['parent'].dtype
+
+
+def test_generate_event_without_catalog_keeps_records():
+    generator = MarsquakeGenerator(seed=4)
+    event = generator.generate_event(magnitude=3.3, quake_type='moderate')
+    assert generator.catalog is None
+    assert generator.events == [event]
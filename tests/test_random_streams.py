@@ -0,0 +1,29 @@
+"""
+Tests for independent random streams
+"""
+import numpy as np
+from src.ai.risk_predictor import RiskPredictor
+from src.data_pipeline.marsquake_generator import MarsquakeGenerator
+from src.random_streams import make_rng, spawn_rngs
+
+
+def test_components_ignore_global_state():
+    np.random.seed(0)
+    first = MarsquakeGenerator(seed=7).generate_catalog(50, start_date='2030-01-01')
+    np.random.seed(1)
+    np.random.random(1000)
+    second = MarsquakeGenerator(seed=7).generate_catalog(50, start_date='2030-01-01')
+    np.testing.assert_array_equal(first['magnitude'], second['magnitude'])
+
+
+def test_spawned_streams_depend_only_on_seed_and_index():
+    first = [rng.random(5) for rng in spawn_rngs(3, 4)]
+    second = [rng.random(5) for rng in spawn_rngs(3, 4)]
+    np.testing.assert_array_equal(first, second)
+    assert len({tuple(values) for values in first}) == 4
+
+
+def test_make_rng_passes_generators_through():
+    rng = np.random.default_rng(1)
+    assert make_rng(rng) is rng
+    assert RiskPredictor(rng=rng).rng is rng
@@ -0,0 +1,54 @@
+"""
+Tests for the layered regolith model's effective fields
+"""
+import numpy as np
+import config
+from src.physics.regolith_layers import LayeredRegolith
+
+
+def test_reference_column_has_unit_amplification():
+    shape = (2, 3, 4)
+    regolith = LayeredRegolith(np.full(shape, 10.0), np.full(shape, config.SOIL_RIGIDITY),
+                               np.full(shape, config.SOIL_DENSITY),
+                               np.full(shape[1:], config.SOIL_RIGIDITY),
+                               np.full(shape[1:], config.SOIL_DENSITY))
+    fields = regolith.effective_fields()
+    np.testing.assert_allclose(fields['site_amplification'], 1.0, rtol=1e-6)
+    np.testing.assert_allclose(fields['vs_eff'],
+                               np.sqrt(config.SOIL_RIGIDITY / config.SOIL_DENSITY), rtol=1e-6)
+
+
+def test_effective_velocity_matches_depth_integration():
+    rng = np.random.default_rng(5)
+    shape = (3, 4, 5)
+    thickness = rng.uniform(2.0, 15.0, shape)
+    rigidity = rng.uniform(5e7, 5e8, shape)
+    density = rng.uniform(1200.0, 2200.0, shape)
+    halfspace_rigidity = rng.uniform(1e9, 2e9, shape[1:])
+    halfspace_density = rng.uniform(2000.0, 2600.0, shape[1:])
+    regolith = LayeredRegolith(thickness, rigidity, density, halfspace_rigidity,
+                               halfspace_density)
+    depth = 30.0
+    vs_eff = regolith.effective_fields(depth=depth)['vs_eff']
+
+    # Travel time through 0.5 mm slices of each column
+    z = np.arange(0.0, depth, 5e-4) + 2.5e-4
+    for i in range(shape[1]):
+        for j in range(shape[2]):
+            bottoms = np.cumsum(thickness[:, i, j])
+            layer = np.searchsorted(bottoms, z, side='right')
+            velocity = np.append(np.sqrt(rigidity[:, i, j] / density[:, i, j]),
+                                 np.sqrt(halfspace_rigidity[i, j] / halfspace_density[i, j]))
+            travel_time = np.sum(5e-4 / velocity[layer])
+            assert np.isclose(vs_eff[i, j], depth / travel_time, rtol=1e-4)
+
+
+def test_surface_thickness_clamped_outside_reference_range():
+    terrain = np.array([[-500.0, 0.0, 500.0, 1000.0, 2000.0]])
+    properties = {'rigidity': np.full(terrain.shape, config.SOIL_RIGIDITY),
+                  'density': np.full(terrain.shape, config.SOIL_DENSITY)}
+    regolith = LayeredRegolith.from_terrain(terrain, properties, elevation_range=(0.0, 1000.0))
+
+    surface = config.REGOLITH_LAYERS[0][0]
+    np.testing.assert_allclose(regolith.thickness[0, 0] / surface,
+                               [1.5, 1.5, 1.0, 0.5, 0.5], rtol=1e-6)
@@ -0,0 +1,73 @@
+"""
+Tests for the response spectrum engine and its cache
+"""
+import numpy as np
+import pytest
+from scipy import signal
+from src.structures import response_spectrum as spectra
+from src.structures.response_spectrum import clear_spectrum_cache, response_spectrum
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_spectrum_cache()
+    yield
+    clear_spectrum_cache()
+
+
+def ground_record(dt, duration=12.0, seed=3):
+    t = np.arange(0, duration, dt)
+    rng = np.random.default_rng(seed)
+    return t, rng.normal(0, 0.3, len(t)) * np.exp(-((t - 4) / 2.5) ** 2)
+
+
+def exact_sd(record, t, period, zeta):
+    """Peak relative displacement of the linearly interpolated record (lsim)"""
+    omega = 2 * np.pi / period
+    system = signal.lti([-1.0], [1.0, 2 * zeta * omega, omega**2])
+    fine = np.linspace(t[0], t[-1], (len(t) - 1) * 20 + 1)
+    _, displacement, _ = signal.lsim(system, np.interp(fine, t, record), fine)
+    return np.abs(displacement).max()
+
+
+@pytest.mark.parametrize('dt', [0.005, 0.05])
+def test_spectral_displacement_matches_lsim(dt):
+    # dt = 0.05 is too coarse for T = 0.1 s and takes the resampled path
+    t, record = ground_record(dt)
+    periods = np.array([0.1, 0.3, 1.0, 3.0])
+    spectrum = response_spectrum(record, dt, periods, damping_ratio=0.05)
+
+    expected = np.array([exact_sd(record, t, period, 0.05) for period in periods])
+    np.testing.assert_allclose(spectrum['sd'], expected, rtol=0.03)
+    np.testing.assert_allclose(spectrum['psa'], (2 * np.pi / periods)**2 * spectrum['sd'])
+    assert spectrum['pga'] == np.abs(record).max()
+
+
+def test_short_period_psa_approaches_pga():
+    dt = 0.01
+    t = np.arange(0, 10, dt)
+    record = 0.5 * np.sin(2 * np.pi * 0.7 * t)  # Smooth, slow motion
+    spectrum = response_spectrum(record, dt, periods=[0.01, 5.0])
+    assert np.isclose(spectrum['psa'][0], spectrum['pga'], rtol=0.01)
+
+
+def test_cache_reuses_spectra_and_keys_settings():
+    _, record = ground_record(0.01)
+    first = response_spectrum(record, 0.01)
+    assert response_spectrum(record.copy(), 0.01) is first
+    assert not first['psa'].flags.writeable
+    assert response_spectrum(record, 0.01, damping_ratio=0.02) is not first
+    assert response_spectrum(record, 0.02) is not first
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(spectra.config, 'RESPONSE_SPECTRUM_CACHE_SIZE', 2)
+    _, record = ground_record(0.01)
+    periods = [0.5, 1.0]
+    a = response_spectrum(record, 0.01, periods)
+    b = response_spectrum(record[:200], 0.01, periods)
+    assert response_spectrum(record, 0.01, periods) is a
+    response_spectrum(record[:300], 0.01, periods)
+
+    assert response_spectrum(record, 0.01, periods) is a
+    assert response_spectrum(record[:200], 0.01, periods) is not b
@@ -0,0 +1,62 @@
+"""
+Tests for the stress history ring buffer and its spill file
+"""
+import numpy as np
+import pytest
+from src.structures.stress_history import StressHistory
+
+
+@pytest.mark.parametrize('num_samples', [0, 5, 16, 40, 64, 150])
+def test_recent_and_stats_match_full_sample_list(num_samples):
+    samples = np.random.default_rng(num_samples).uniform(0, 1e6, num_samples)
+    history = StressHistory(capacity=64)
+    for value in samples:
+        history.append(value)
+
+    np.testing.assert_array_equal(history.recent(), samples[-64:])
+    np.testing.assert_array_equal(list(history), samples[-64:])
+    assert len(history) == num_samples
+    assert len(history.buffer) <= 64
+    if num_samples:
+        assert history.peak == samples.max()
+        assert np.isclose(history.mean, samples.mean())
+    else:
+        assert history.peak == 0.0
+
+
+def test_spill_file_holds_every_sample(tmp_path):
+    samples = np.random.default_rng(1).uniform(0, 1e6, 1000)
+    history = StressHistory(capacity=32, spill_path=str(tmp_path / 'stress.bin'))
+    for i, value in enumerate(samples):
+        history.append(value)
+        if i in (10, 11, 500):
+            history.flush()
+
+    np.testing.assert_array_equal(history.full_history(), samples)
+    np.testing.assert_array_equal(history.recent(), samples[-32:])
+    # A second read does not write the samples twice
+    np.testing.assert_array_equal(history.full_history(), samples)
+
+
+def test_reset_forgets_samples(tmp_path):
+    history = StressHistory(capacity=8, spill_path=str(tmp_path / 'stress.bin'))
+    for value in range(20):
+        history.append(float(value))
+    history.reset()
+    history.append(7.0)
+    assert len(history) == 1 and history.peak == 7.0
+    np.testing.assert_array_equal(history.full_history(), [7.0])
+
+
+def test_full_history_needs_spill_file():
+    with pytest.raises(ValueError):
+        StressHistory().full_history()
+
+
+def test_nan_samples_keep_buffer_order():
+    history = StressHistory(capacity=4)
+    for value in (1.0, np.nan, 3.0, 2.0, np.nan, 5.0):
+        history.append(value)
+    np.testing.assert_array_equal(history.recent(), [3.0, 2.0, np.nan, 5.0])
+    assert len(history) == 6
+    assert (history.peak, history.mean) == (5.0, 2.75)
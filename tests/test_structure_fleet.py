@@ -0,0 +1,87 @@
+"""
+Tests for the vectorized structure fleet against per-habitat evaluation
+"""
+import numpy as np
+import pytest
+from src.structures.habitat_model import HabitatModel
+from src.structures.structure_fleet import (PARAMETER_FIELDS, StructureFleet,
+                                            validate_parameters)
+
+
+@pytest.fixture
+def parameters():
+    rng = np.random.default_rng(12)
+    n = 40
+    return {
+        'mass': rng.uniform(2000, 8000, n),
+        'height': rng.uniform(2, 6, n),
+        'width': rng.uniform(3, 10, n),
+        'strength': rng.uniform(300, 3000, n),
+        'natural_freq': rng.uniform(2, 8, n)
+    }
+
+
+def standalone_habitats(parameters):
+    n = len(parameters['mass'])
+    return [HabitatModel((i, 0), {name: parameters[name][i] for name in PARAMETER_FIELDS})
+            for i in range(n)]
+
+
+def test_fleet_response_matches_standalone_habitats(parameters):
+    n = len(parameters['mass'])
+    fleet = StructureFleet(np.column_stack([np.arange(n), np.zeros(n)]), **parameters)
+    habitats = standalone_habitats(parameters)
+    amplitude = np.random.default_rng(13).uniform(0, 400, (3, n))
+
+    for step in amplitude:
+        safety = fleet.evaluate_safety(step)
+        expected = [habitat.evaluate_safety(a) for habitat, a in zip(habitats, step)]
+        assert list(safety['status']) == [e['status'] for e in expected]
+        np.testing.assert_allclose(safety['safety_rating'],
+                                   [e['safety_rating'] for e in expected], rtol=1e-12)
+        np.testing.assert_allclose(safety['max_displacement'],
+                                   [e['max_displacement'] for e in expected], rtol=1e-12)
+    assert len(set(safety['status'])) > 1
+
+
+def test_accumulate_events_matches_sequential_responses(parameters):
+    n = len(parameters['mass'])
+    locations = np.column_stack([np.arange(n), np.zeros(n)])
+    block = StructureFleet(locations, **parameters)
+    sequential = StructureFleet(locations, **parameters)
+    acceleration = np.random.default_rng(14).uniform(-3, 3, (25, n))
+
+    block.accumulate_events(acceleration[:10])
+    block.accumulate_events(acceleration[10:])
+    for event in acceleration:
+        sequential.calculate_response(event)
+
+    for name in ('damage_level', 'max_displacement', 'peak_stress'):
+        np.testing.assert_allclose(getattr(block, name), getattr(sequential, name),
+                                   rtol=1e-12, err_msg=name)
+    assert 0 < block.damage_level.max() <= 1.0
+
+
+def test_row_selection_only_updates_selected_rows(parameters):
+    n = len(parameters['mass'])
+    fleet = StructureFleet(np.zeros((n, 2)), **parameters)
+    index = np.array([3, 7, 11])
+    fleet.calculate_response(np.full(3, 5.0), index)
+    untouched = np.setdiff1d(np.arange(n), index)
+    assert (fleet.peak_stress[index] > 0).all()
+    assert (fleet.peak_stress[untouched] == 0).all()
+
+
+def test_validate_parameters():
+    assert validate_parameters({'mass': 10, 'width': np.float32(2.5)}) == \
+        {'mass': 10.0, 'width': 2.5}
+    with pytest.raises(ValueError):
+        validate_parameters({'weight': 10})
+    with pytest.raises(ValueError):
+        validate_parameters({'strength': -1.0})
+    with pytest.raises(ValueError):
+        validate_parameters({'height': np.nan})
+    with pytest.raises(TypeError):
+        validate_parameters({'mass': '5000'})
+    with pytest.raises(TypeError):
+        validate_parameters({'mass': True})
@@ -0,0 +1,66 @@
+"""
+Tests for terrain generation, derived layers and batch terrain queries
+"""
+import numpy as np
+from src.data_pipeline.terrain_generator import TerrainGenerator, compute_derived_layers
+
+
+def test_height_map_independent_of_workers():
+    serial = TerrainGenerator(size=96, seed=5).generate_height_map(workers=1, band_rows=16)
+    parallel = TerrainGenerator(size=96, seed=5).generate_height_map(workers=3, band_rows=16)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_height_map_independent_of_band_rows():
+    small = TerrainGenerator(size=(40, 56), seed=5).generate_height_map(band_rows=7)
+    large = TerrainGenerator(size=(40, 56), seed=5).generate_height_map(band_rows=64)
+    assert small.shape == (40, 56)
+    np.testing.assert_array_equal(small, large)
+    assert small.min() == 0.0 and small.max() == 1000.0
+
+
+def test_derived_layers_of_a_plane():
+    rows, cols = np.indices((30, 40))
+    plane = 3.0 * rows - 4.0 * cols
+    layers = compute_derived_layers(plane, resolution=10)
+
+    np.testing.assert_allclose(layers['slope'], 5.0)
+    np.testing.assert_allclose(layers['slope_deg'], np.degrees(np.arctan(0.5)))
+    np.testing.assert_allclose(layers['aspect'], np.degrees(np.arctan2(-4.0, 3.0)) % 360)
+    np.testing.assert_allclose(layers['curvature'][1:-1, 1:-1], 0.0, atol=1e-12)
+
+
+def test_roughness_matches_windowed_std():
+    terrain = np.random.default_rng(2).normal(500.0, 30.0, (25, 31))
+    window = 5
+    roughness = compute_derived_layers(terrain, window=window)['roughness']
+
+    half = window // 2
+    for i, j in [(0, 0), (12, 15), (24, 30), (1, 29), (20, 2)]:
+        # Windows are truncated at the grid edges
+        block = terrain[max(i - half, 0):i + half + 1, max(j - half, 0):j + half + 1]
+        assert np.isclose(roughness[i, j], block.std(), rtol=1e-9)
+
+
+def test_terrain_at_many_matches_single_queries():
+    terrain_gen = TerrainGenerator(size=(24, 32), seed=3)
+    terrain_gen.generate_height_map()
+    terrain_gen.calculate_soil_properties()
+
+    xs = np.array([0, 5.7, 23.9, -3, 40])
+    ys = np.array([0, 12.2, 31.5, 7, -1])
+    batch = terrain_gen.get_terrain_at_many(xs, ys)
+    for k, (x, y) in enumerate(zip(xs, ys)):
+        single = terrain_gen.get_terrain_at(x, y)
+        for name, value in single.items():
+            assert batch[name][k] == value, name
+
+
+def test_interpolated_aspect_wraps_around_north():
+    terrain_gen = TerrainGenerator.from_array(np.zeros((2, 2)))
+    terrain_gen.properties = {'aspect': np.array([[359.0, 1.0], [359.0, 1.0]]),
+                              'slope': np.array([[0.0, 2.0], [0.0, 2.0]])}
+
+    result = terrain_gen.get_terrain_at_many([0.5], [0.5], interpolate=True)
+    assert np.isclose((result['aspect'][0] + 180) % 360 - 180, 0.0, atol=1e-9)
+    assert np.isclose(result['slope'][0], 1.0)